@@ -1,16 +1,19 @@
 from django.urls import path
 
 from badgerdoc.views import tag
-from badgerdoc.views.agent_log import AgentLogView
+from badgerdoc.views.agent_log import AgentLogView, bulk_create_agent_logs
 from badgerdoc.views.document import (
     DocumentView,
+    bulk_create_documents,
     create_document,
+    export_document_tree,
     get_document_chunk,
     get_document_dzi,
     get_document_dzi_content,
     get_document_dzi_tile,
     get_document_rendition_page,
     get_document_renditions,
+    get_renditions_by_page,
     list_documents,
 )
 from badgerdoc.views.extraction import (
@@ -22,6 +25,7 @@ from badgerdoc.views.extraction import (
 from badgerdoc.views.extraction_document import ExtractionDocumentView
 from badgerdoc.views.extraction_page import (
     ExtractionPageView,
+    bulk_create_extraction_pages,
     get_latest_extraction_page,
     get_latest_extraction_pages,
     list_extraction_pages,
@@ -47,6 +51,11 @@ from badgerdoc.views.workflow import (
 
 urlpatterns = [
     path("document/", create_document, name="document-upload"),
+    path(
+        "document/bulk/",
+        bulk_create_documents,
+        name="document-bulk-create",
+    ),
     path(
         "document/<int:document_id>/chunk/page/<int:page_num>/extraction/<int:extraction_id>/xpath/<path:xpath>",
         get_document_chunk,
@@ -57,6 +66,11 @@ urlpatterns = [
         DocumentView.as_view(),
         name="document-get-or-update",
     ),
+    path(
+        "document/<int:document_id>/tree/",
+        export_document_tree,
+        name="document-tree-export",
+    ),
     path(
         "document/<int:document_id>/renditions/",
         get_document_renditions,
@@ -83,6 +97,11 @@ urlpatterns = [
         name="document-dzi-tile",
     ),
     path("documents/", list_documents, name="document-list"),
+    path(
+        "documents/renditions/",
+        get_renditions_by_page,
+        name="document-renditions-by-page",
+    ),
     path(
         "document/<int:document_id>/extraction-page/latest/",
         get_latest_extraction_pages,
@@ -113,6 +132,11 @@ urlpatterns = [
         ExtractionPageView.as_view(),
         name="extraction-page-create",
     ),
+    path(
+        "extraction-page/bulk/",
+        bulk_create_extraction_pages,
+        name="extraction-page-bulk-create",
+    ),
     path(
         "extraction-pages/", list_extraction_pages, name="extraction-page-list"
     ),
@@ -157,5 +181,10 @@ urlpatterns = [
     ),
     path("user/me", get_current_user_info, name="get-current-user-info"),
     path("agent-log/", AgentLogView.as_view(), name="agent-log"),
+    path(
+        "agent-log/bulk/",
+        bulk_create_agent_logs,
+        name="agent-log-bulk-create",
+    ),
     path("tags", tag.list_tags, name="list-tags"),
 ]
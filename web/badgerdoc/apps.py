@@ -30,4 +30,9 @@ class BadgerdocConfig(AppConfig):
         ########################################################################
         # Import signal handlers
         ########################################################################
-        from badgerdoc.signals import trigger_automatic  # noqa: F401
+        from badgerdoc.signals import (  # noqa: F401
+            current_extraction_page,
+            document_path,
+            trigger_automatic,
+            workflow_registry,
+        )
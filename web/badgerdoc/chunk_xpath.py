@@ -109,17 +109,14 @@ def create_chunk_document(
 ) -> document.Document:
     coordinates_str = f"{x1} {y1} {x2} {y2}"
     chunk_name = f"{document_obj.name or document_obj.id}_chunk_p{page_num}_{x1}_{y1}_{x2}_{y2}"
-    chunk_doc = document.Document.objects.create(
+    # Created with its file in one save, its on_create event is the only
+    # one routed to workflows (see event_rules)
+    return document.Document.objects.create(
         name=chunk_name,
         extension="png",
         uploaded_by=user,
         parent_document=document_obj,
         tags=["chunk"],
         metadata={"page": page_num, "position_in_parent": coordinates_str},
+        file=ContentFile(png_bytes, name=f"{chunk_name}.png"),
     )
-    chunk_doc.file.save(
-        f"{chunk_name}.png",
-        ContentFile(png_bytes),
-        save=True,
-    )
-    return chunk_doc
@@ -0,0 +1,77 @@
+import logging
+from dataclasses import dataclass
+
+from badgerdoc.models import document
+
+logger = logging.getLogger(__name__)
+
+# Emitted on a document once the renditions of all its pages exist
+RENDITIONS_READY = "on_renditions_ready"
+
+
+@dataclass(frozen=True)
+class EventRule:
+    """Routing of the save events of derived documents tagged ``tag``.
+
+    Derived documents are the ones with a parent, created by converters
+    and chunking: renditions, their previews, DZI descriptors and tiles.
+    """
+
+    tag: str
+    # Event types still emitted for the document itself, the rest are
+    # dropped before the workflow registries are matched
+    emit: frozenset[str] = frozenset()
+    # Event emitted on the parent once documents with the tag exist for
+    # all of its pages
+    aggregate: str | None = None
+
+
+# The first rule with a tag of the document applies
+EVENT_RULES: tuple[EventRule, ...] = (
+    # DZI descriptors and tiles, hundreds per page
+    EventRule(tag="dzi"),
+    EventRule(tag="rendition_preview"),
+    # Every rendition starts its own DZI conversion on create
+    EventRule(
+        tag="rendition",
+        emit=frozenset({"on_create"}),
+        aggregate=RENDITIONS_READY,
+    ),
+    # Chunks are created with their file, later saves are not routed
+    EventRule(tag="chunk", emit=frozenset({"on_create"})),
+)
+
+
+def find_rule(doc: document.Document) -> EventRule | None:
+    """Rule routing the events of a document, None for source documents."""
+    if doc.parent_document_id is None or not isinstance(doc.tags, list):
+        return None
+    for rule in EVENT_RULES:
+        if rule.tag in doc.tags:
+            return rule
+    return None
+
+
+def count_derived(parent_id: int, tag: str) -> int:
+    return document.Document.objects.filter(
+        parent_document=parent_id, tags__contains=[tag]
+    ).count()
+
+
+def is_aggregate_complete(parent: document.Document, rule: EventRule) -> bool:
+    """Whether the last page of the parent has just got its document.
+
+    Documents without ``total_pages`` metadata, e.g. PNG uploads, have a
+    single page. Only the exact count completes, so documents added after
+    completion do not emit the event again.
+    """
+    total_pages = (parent.metadata or {}).get("total_pages") or 1
+    derived = count_derived(parent.pk, rule.tag)
+    logger.debug(
+        "Document %s has %d of %d '%s' documents",
+        parent.pk,
+        derived,
+        total_pages,
+        rule.tag,
+    )
+    return derived == total_pages
@@ -290,13 +290,7 @@ def validate_extraction_page_exists(
 def validate_document_page_exists(
     doc: document.Document, page_number: int
 ) -> None:
-    has_page = document.Document.objects.filter(
-        parent_document=doc,
-        tags__contains=["rendition"],
-        metadata__page=page_number,
-    ).exists()
-
-    if not has_page:
+    if document.find_rendition(doc.id, page_number) is None:
         raise ValueError(f"Page {page_number} not found in document {doc.id}")
 
 
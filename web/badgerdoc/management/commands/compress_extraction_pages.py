@@ -0,0 +1,92 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from badgerdoc.models import extraction_page
+from badgerdoc.models._compression import compress_text, decompress_text
+
+
+class Command(BaseCommand):
+    help = (
+        "Compress the content of stored extraction pages, or decompress it "
+        "with --decompress. Reports the sizes before and after and the "
+        "decompression time per page; with --dry-run nothing is written, "
+        "which benchmarks compression on the stored pages."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--decompress",
+            action="store_true",
+            help="Store compressed pages as plain text again",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the savings, do not update pages",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        decompress = options["decompress"]
+        dry_run = options["dry_run"]
+
+        pages = extraction_page.ExtractionPage.objects.order_by("id")
+        if decompress:
+            pages = pages.filter(content_compressed__isnull=False)
+        else:
+            pages = pages.filter(content_compressed__isnull=True).exclude(
+                content=""
+            )
+
+        count = plain_bytes = compressed_bytes = 0
+        decompression_seconds = 0.0
+        last_id = 0
+        while True:
+            batch = list(pages.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            for page in batch:
+                compressed = compress_text(page.content)
+                started = time.perf_counter()
+                decompress_text(compressed)
+                decompression_seconds += time.perf_counter() - started
+
+                count += 1
+                plain_bytes += len(page.content.encode("utf-8"))
+                compressed_bytes += len(compressed)
+
+                if decompress:
+                    page.content_compressed = None
+                else:
+                    page.content_compressed = compressed
+                    page.content = ""
+
+            if not dry_run:
+                # bulk_update leaves updated_at as is, the page content
+                # itself does not change
+                with transaction.atomic():
+                    extraction_page.ExtractionPage.objects.bulk_update(
+                        batch, ["content", "content_compressed"]
+                    )
+            self.stdout.write(f"Processed {count} pages")
+
+        if not count:
+            self.stdout.write("No pages to process")
+            return
+
+        self.stdout.write(
+            f"Pages: {count}\n"
+            f"Plain: {plain_bytes} bytes\n"
+            f"Compressed: {compressed_bytes} bytes "
+            f"({plain_bytes / max(compressed_bytes, 1):.1f}x smaller)\n"
+            f"Decompression: "
+            f"{decompression_seconds / count * 1_000_000:.0f} us per page"
+        )
+        if not dry_run:
+            action = "Decompressed" if decompress else "Compressed"
+            self.stdout.write(self.style.SUCCESS(f"{action} {count} pages"))
@@ -0,0 +1,49 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from badgerdoc import workflow_outbox
+from badgerdoc.models.workflow_trigger_outbox import WorkflowTriggerOutbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Start the lifecycle workflows recorded in the trigger outbox. "
+        "Runs until stopped, sweeping the outbox every "
+        "BADGERDOC_WORKFLOW_TRIGGER_SWEEP_INTERVAL seconds; with --once "
+        "the pending triggers are started and the command exits. Needed "
+        "when BADGERDOC_WORKFLOW_TRIGGER_DISPATCHER is 'command'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Start the pending triggers and exit",
+        )
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="Make the triggers given up after failed starts pending again",
+        )
+
+    def handle(self, *args, **options):
+        if options["retry_failed"]:
+            retried = WorkflowTriggerOutbox.objects.filter(
+                dispatched_at__isnull=False, workflow_id=""
+            ).update(dispatched_at=None, attempts=0)
+            self.stdout.write(f"Retrying {retried} failed triggers")
+
+        while True:
+            workflow_outbox.dispatch_all()
+            if options["once"]:
+                pending = WorkflowTriggerOutbox.objects.filter(
+                    dispatched_at__isnull=True
+                ).count()
+                self.stdout.write(f"Pending triggers: {pending}")
+                return
+            time.sleep(settings.BADGERDOC_WORKFLOW_TRIGGER_SWEEP_INTERVAL)
+            # Between sweeps only, the connection may have timed out
+            close_old_connections()
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-18 06:29
+
+import django.db.models.fields.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("badgerdoc", "0032_agentlog_path_alter_agentlog_log"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(
+                models.F("parent_document"),
+                django.db.models.fields.json.KeyTransform("page", "metadata"),
+                name="idx_document_parent_page",
+            ),
+        ),
+    ]
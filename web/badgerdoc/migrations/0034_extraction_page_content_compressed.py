@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:03
+
+from django.db import migrations, models
+
+import badgerdoc.models._compression
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("badgerdoc", "0033_document_parent_page_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="extractionpage",
+            name="content_compressed",
+            field=models.BinaryField(
+                blank=True,
+                help_text="Compressed content, replaces content when set",
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="extractionpage",
+            name="content",
+            field=badgerdoc.models._compression.CompressibleTextField(
+                compressed_field="content_compressed",
+                default="",
+                help_text="Extracted content stored as text",
+            ),
+        ),
+    ]
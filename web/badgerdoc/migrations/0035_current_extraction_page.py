@@ -0,0 +1,102 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_current_pages(apps, schema_editor):
+    ExtractionPage = apps.get_model("badgerdoc", "ExtractionPage")
+    CurrentExtractionPage = apps.get_model(
+        "badgerdoc", "CurrentExtractionPage"
+    )
+
+    latest = (
+        ExtractionPage.objects.annotate(
+            version_rank=Window(
+                RowNumber(),
+                partition_by=[F("extraction__document_id"), F("page_number")],
+                order_by=[F("created_at").desc(), F("id").desc()],
+            )
+        )
+        .filter(version_rank=1)
+        .values_list("extraction__document_id", "page_number", "id")
+    )
+    batch = []
+    for document_id, page_number, page_id in latest.iterator(
+        chunk_size=BACKFILL_BATCH_SIZE
+    ):
+        batch.append(
+            CurrentExtractionPage(
+                document_id=document_id,
+                page_number=page_number,
+                extraction_page_id=page_id,
+            )
+        )
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            CurrentExtractionPage.objects.bulk_create(batch)
+            batch = []
+    CurrentExtractionPage.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("badgerdoc", "0034_extraction_page_content_compressed"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CurrentExtractionPage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("page_number", models.PositiveIntegerField()),
+            ],
+            options={
+                "db_table": "current_extraction_page",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="extractionpage",
+            index=models.Index(
+                fields=["extraction", "page_number", "-created_at"],
+                name="idx_extraction_page_latest",
+            ),
+        ),
+        migrations.AddField(
+            model_name="currentextractionpage",
+            name="document",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="current_pages",
+                to="badgerdoc.document",
+            ),
+        ),
+        migrations.AddField(
+            model_name="currentextractionpage",
+            name="extraction_page",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="current_for",
+                to="badgerdoc.extractionpage",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="currentextractionpage",
+            unique_together={("document", "page_number")},
+        ),
+        migrations.RunPython(
+            backfill_current_pages, migrations.RunPython.noop
+        ),
+    ]
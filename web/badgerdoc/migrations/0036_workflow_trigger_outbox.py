@@ -0,0 +1,50 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("badgerdoc", "0035_current_extraction_page"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorkflowTriggerOutbox",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("workflow_type", models.CharField(max_length=255)),
+                ("task_queue", models.CharField(max_length=255)),
+                ("coalesce_key", models.CharField(max_length=255)),
+                ("payload", models.JSONField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("dispatched_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "workflow_id",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("error", models.TextField(blank=True, default="")),
+            ],
+            options={
+                "db_table": "workflow_trigger_outbox",
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("dispatched_at__isnull", True)),
+                        fields=["id"],
+                        name="idx_trigger_outbox_pending",
+                    )
+                ],
+            },
+        ),
+    ]
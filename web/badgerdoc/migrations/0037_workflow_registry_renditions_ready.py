@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("badgerdoc", "0036_workflow_trigger_outbox"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="workflowregistry",
+            name="event_type",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("on_create", "On Create"),
+                    ("on_update", "On Update"),
+                    ("on_renditions_ready", "On Renditions Ready"),
+                ],
+                help_text="Type of event that triggers this workflow",
+                max_length=50,
+                null=True,
+            ),
+        ),
+    ]
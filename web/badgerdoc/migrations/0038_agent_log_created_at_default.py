@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("badgerdoc", "0037_workflow_registry_renditions_ready"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="agentlog",
+            name="created_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
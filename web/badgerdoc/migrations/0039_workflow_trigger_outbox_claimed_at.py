@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("badgerdoc", "0038_agent_log_created_at_default"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="workflowtriggeroutbox",
+            name="claimed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
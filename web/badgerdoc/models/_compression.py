@@ -0,0 +1,106 @@
+import zlib
+
+from django.conf import settings
+from django.db import models
+
+# The first byte of a compressed value names its format, so values written
+# with an older dictionary stay readable once a newer one is introduced.
+FORMAT_ZLIB_HOCR_V1 = 1
+
+# Preset dictionary of the markup repeated on every hOCR page. zlib can
+# reference it from the first byte of a page, which matters most for the
+# small block level pages. The most frequent fragments come last, as the
+# closest part of the dictionary is the cheapest to reference.
+# Never change it in place: add a new format with a new dictionary.
+HOCR_DICTIONARY_V1 = (
+    b'<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN" '
+    b'"http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">\n'
+    b'<?xml version="1.0" encoding="UTF-8"?>\n'
+    b'<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en" lang="en">\n'
+    b" <head>\n  <title></title>\n"
+    b'  <meta http-equiv="Content-Type" content="text/html;charset=utf-8" />\n'
+    b'  <meta name="ocr-system" content="tesseract" />\n'
+    b'  <meta name="ocr-langs" content="en" />\n'
+    b'  <meta name="ocr-capabilities" content="ocr_photo ocr_page ocr_carea '
+    b'ocr_par ocr_line ocrx_word ocrp_dir ocrp_lang ocrp_wconf" />\n'
+    b" </head>\n <body>\n"
+    b'  <div class="ocr_page" id="page_1" title="image ; bbox 0 0 ; '
+    b'ppageno 0; scan_res 144 144">\n'
+    b"<table><thead><tr><th></th></tr></thead><tbody><tr><td></td></tr>"
+    b"</tbody></table><h1></h1><sub></sub><sup></sup>&amp;&lt;&gt;&quot;"
+    b'<span class="ocr_header" id="line_1_1" title="bbox '
+    b'<span class="ocr_caption" id="line_1_1" title="bbox '
+    b'<span class="ocr_textfloat" id="line_1_1" title="bbox '
+    b'; baseline 0 0; x_size 20; x_descenders 5; x_ascenders 5">\n'
+    b'   <div class="ocr_carea" id="block_1_1" title="bbox '
+    b'    <p class="ocr_par" id="par_1_1" lang="eng" title="bbox '
+    b'" xml:lang="eng">\n'
+    b'     <span class="ocr_line" id="line_1_1" title="bbox '
+    b"     </span>\n    </p>\n   </div>\n"
+    b'      <span class="ocrx_word" id="word_1_1" title="bbox '
+    b'; x_wconf 95">'
+    b'</span>\n      <span class="ocrx_word" id="word_1_'
+)
+
+_DICTIONARIES = {FORMAT_ZLIB_HOCR_V1: HOCR_DICTIONARY_V1}
+
+
+def compress_text(text: str) -> bytes:
+    compressor = zlib.compressobj(
+        settings.BADGERDOC_EXTRACTION_PAGE_COMPRESSION_LEVEL,
+        zdict=HOCR_DICTIONARY_V1,
+    )
+    return (
+        bytes([FORMAT_ZLIB_HOCR_V1])
+        + compressor.compress(text.encode("utf-8"))
+        + compressor.flush()
+    )
+
+
+def decompress_text(value: bytes | memoryview) -> str:
+    value = bytes(value)
+    if not value or value[0] not in _DICTIONARIES:
+        raise ValueError(
+            f"Unknown compression format {value[:1].hex() or 'empty'}"
+        )
+    decompressor = zlib.decompressobj(zdict=_DICTIONARIES[value[0]])
+    return (decompressor.decompress(value[1:]) + decompressor.flush()).decode(
+        "utf-8"
+    )
+
+
+def compression_enabled() -> bool:
+    return settings.BADGERDOC_EXTRACTION_PAGE_COMPRESSION == "zlib"
+
+
+class CompressibleTextField(models.TextField):
+    """Text column moved to a binary column when compression is enabled.
+
+    On save the text goes compressed to ``compressed_field`` and this
+    column is left empty; with compression disabled the text is stored
+    as is and ``compressed_field`` is cleared. The model decompresses
+    the value when it is loaded, see ``ExtractionPage.from_db``.
+    """
+
+    def __init__(self, *args, compressed_field: str, **kwargs):
+        self.compressed_field = compressed_field
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["compressed_field"] = self.compressed_field
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = super().pre_save(model_instance, add)
+        # Fields are saved in declaration order, the compressed field comes
+        # after this one and picks up the value set here
+        if value and compression_enabled():
+            setattr(
+                model_instance,
+                self.compressed_field,
+                compress_text(self.to_python(value)),
+            )
+            return ""
+        setattr(model_instance, self.compressed_field, None)
+        return value
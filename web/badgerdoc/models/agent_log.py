@@ -1,20 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+
 from django.apps import apps
-from django.db import models
+from django.conf import settings
+from django.db import connection, models
+from django.utils import timezone
 
+# Paths of deeper hierarchies stop at this many ancestors
+MAX_DOCUMENT_DEPTH = 64
+DOCUMENT_PATH_CACHE_SIZE = 10_000
 
-def build_document_path(document_id: int) -> str:
-    # NOTE: executes one query per level — may be slow for deep document hierarchies.
+_path_cache: OrderedDict[int, tuple[float, str]] = OrderedDict()
+_path_cache_lock = threading.Lock()
+
+
+def _query_document_path(document_id: int) -> str:
     document_model = apps.get_model("badgerdoc", "Document")
-    parts: list[str] = []
-    current_id: int | None = document_id
-    while current_id is not None:
-        node_id, parent_id = document_model.objects.values_list(
-            "id", "parent_document_id"
-        ).get(pk=current_id)
-        parts.append(str(node_id))
-        current_id = parent_id
-    parts.reverse()
-    return "/".join(parts) + "/"
+    table = connection.ops.quote_name(document_model._meta.db_table)
+    # Walks from the document up to its root in a single query
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH RECURSIVE ancestors (id, parent_document_id, depth) AS (
+                SELECT id, parent_document_id, 0
+                FROM {table}
+                WHERE id = %s
+                UNION ALL
+                SELECT parent.id, parent.parent_document_id, ancestors.depth + 1
+                FROM {table} parent
+                JOIN ancestors ON parent.id = ancestors.parent_document_id
+                WHERE ancestors.depth < %s
+            )
+            SELECT id FROM ancestors ORDER BY depth DESC
+            """,
+            [document_id, MAX_DOCUMENT_DEPTH],
+        )
+        rows = cursor.fetchall()
+    if not rows:
+        raise document_model.DoesNotExist(
+            f"Document {document_id} does not exist"
+        )
+    return "/".join(str(row[0]) for row in rows) + "/"
+
+
+def build_document_path(document_id: int) -> str:
+    """Path of the document ids from the root down to ``document_id``.
+
+    Paths are cached in the process for BADGERDOC_DOCUMENT_PATH_CACHE_TTL
+    seconds. A document moved to another parent gets a new path in this
+    process at once and in the others once their entry expires; the logs
+    written before keep the old path either way.
+    """
+    now = time.monotonic()
+    with _path_cache_lock:
+        cached = _path_cache.get(document_id)
+        if cached is not None and cached[0] > now:
+            _path_cache.move_to_end(document_id)
+            return cached[1]
+
+    path = _query_document_path(document_id)
+    with _path_cache_lock:
+        _path_cache[document_id] = (
+            now + settings.BADGERDOC_DOCUMENT_PATH_CACHE_TTL,
+            path,
+        )
+        _path_cache.move_to_end(document_id)
+        while len(_path_cache) > DOCUMENT_PATH_CACHE_SIZE:
+            _path_cache.popitem(last=False)
+    return path
+
+
+def clear_document_path_cache() -> None:
+    with _path_cache_lock:
+        _path_cache.clear()
 
 
 class AgentLog(models.Model):
@@ -57,7 +116,8 @@ class AgentLog(models.Model):
         default="",
         db_index=True,
     )
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set by the bulk endpoint to the time the worker logged the line
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         db_table = "badgerdoc_agent_log"
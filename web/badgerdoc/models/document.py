@@ -4,6 +4,8 @@ from uuid import uuid4
 
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import F
+from django.db.models.fields.json import KeyTransform
 
 from badgerdoc.models import _validation
 from badgerdoc.models.base import TimestampedModel
@@ -13,6 +15,14 @@ def document_upload_path(_instance, filename):
     return f"documents/{uuid4().hex}/{filename}"
 
 
+def _delete_storage_directory(storage, path: str) -> None:
+    directories, files = storage.listdir(path)
+    for file_name in files:
+        storage.delete(f"{path}/{file_name}")
+    for directory in directories:
+        _delete_storage_directory(storage, f"{path}/{directory}")
+
+
 @dataclass
 class Page:
     page_num: int
@@ -53,6 +63,14 @@ class Document(TimestampedModel):
     class Meta:
         db_table = "document"
         ordering = ["-updated_at"]
+        indexes = [
+            # Serves page lookups among children, e.g. find_rendition
+            models.Index(
+                F("parent_document"),
+                KeyTransform("page", "metadata"),
+                name="idx_document_parent_page",
+            ),
+        ]
         permissions = [
             (
                 "view_other_users_document",
@@ -64,18 +82,42 @@ class Document(TimestampedModel):
             ),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Compared on save to tell moves of the document, see
+        # signals.document_path
+        instance._loaded_parent_document_id = instance.__dict__.get(
+            "parent_document_id", models.DEFERRED
+        )
+        return instance
+
     def save(self, *args, **kwargs):
         if not self.name and self.file:
             filename = os.path.basename(self.file.name)
             name_without_ext = os.path.splitext(filename)[0]
             self.name = name_without_ext
         super().save(*args, **kwargs)
+        self._loaded_parent_document_id = self.parent_document_id
+
+    def parent_document_changed(self) -> bool:
+        """Whether the parent saved last differs from the one loaded.
+
+        Called in post_save handlers. Instances that were not loaded from
+        the database, or had the parent deferred, count as changed.
+        """
+        loaded = getattr(self, "_loaded_parent_document_id", models.DEFERRED)
+        return loaded is models.DEFERRED or loaded != self.parent_document_id
 
     def delete(self, *args, **kwargs):
         children = self.child_documents.all()
         for child in children:
             child.delete()
 
+        tiles_prefix = (self.metadata or {}).get("tiles_prefix")
+        if tiles_prefix:
+            _delete_storage_directory(self.file.storage, tiles_prefix)
+
         if self.file:
             parent_uses_same_file = (
                 self.parent_document_id is not None
@@ -96,3 +138,45 @@ class Document(TimestampedModel):
             doc_name = f"Document {self.id}"
 
         return f"[{self.id}] {doc_name}"
+
+
+def find_rendition(document_id: int, page: int) -> Document | None:
+    """Rendition of a page, looked up through idx_document_parent_page."""
+    return (
+        Document.objects.select_related("uploaded_by")
+        .filter(
+            parent_document=document_id,
+            metadata__page=page,
+            tags__contains=["rendition"],
+        )
+        .first()
+    )
+
+
+def find_renditions_by_page(
+    document_ids: list[int],
+) -> dict[int, dict[int, Document]]:
+    """Renditions of all pages of the documents, by document and page.
+
+    Where a page has several renditions the most recently updated one is
+    kept, as find_rendition does.
+    """
+    renditions: dict[int, dict[int, Document]] = {
+        document_id: {} for document_id in document_ids
+    }
+    queryset = (
+        Document.objects.select_related("uploaded_by")
+        .filter(
+            parent_document__in=document_ids,
+            metadata__has_key="page",
+            tags__contains=["rendition"],
+        )
+        .order_by("-updated_at")
+    )
+    for rendition in queryset.iterator(chunk_size=1000):
+        page = rendition.metadata["page"]
+        if isinstance(page, int):
+            renditions[rendition.parent_document_id].setdefault(
+                page, rendition
+            )
+    return renditions
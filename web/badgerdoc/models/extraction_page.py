@@ -1,5 +1,14 @@
+from collections.abc import Iterable
+from typing import Any
+
 from django.db import models
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 
+from badgerdoc.models._compression import (
+    CompressibleTextField,
+    decompress_text,
+)
 from badgerdoc.models.base import TimestampedModel
 
 
@@ -8,14 +17,116 @@ class ExtractionPage(TimestampedModel):
         "Extraction", on_delete=models.CASCADE, related_name="pages"
     )
     page_number = models.PositiveIntegerField()
-    content = models.TextField(
-        default="", help_text="Extracted content stored as text"
+    content = CompressibleTextField(
+        default="",
+        help_text="Extracted content stored as text",
+        compressed_field="content_compressed",
+    )
+    content_compressed = models.BinaryField(
+        null=True,
+        blank=True,
+        help_text="Compressed content, replaces content when set",
     )
 
     class Meta:
         db_table = "extraction_page"
         ordering = ["extraction", "page_number"]
         unique_together = ["extraction", "page_number"]
+        indexes = [
+            # Serves the latest page per page number, see latest_per_page
+            models.Index(
+                fields=["extraction", "page_number", "-created_at"],
+                name="idx_extraction_page_latest",
+            ),
+        ]
 
     def __str__(self):
         return f"Page {self.page_number} - Extraction {self.extraction.id}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Querysets deferring content_compressed see the empty content of
+        # compressed rows, defer or load both fields together
+        compressed = instance.__dict__.get("content_compressed")
+        if compressed is not None:
+            instance.content = decompress_text(compressed)
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "content" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "content_compressed"}
+        super().save(*args, **kwargs)
+
+
+class CurrentExtractionPage(models.Model):
+    """Latest extraction page of every page number of a document.
+
+    Maintained on page writes by refresh_current_pages, so reading the
+    current version of the pages of a document does not rank all of
+    their extractions.
+    """
+
+    document = models.ForeignKey(
+        "Document", on_delete=models.CASCADE, related_name="current_pages"
+    )
+    page_number = models.PositiveIntegerField()
+    extraction_page = models.ForeignKey(
+        ExtractionPage, on_delete=models.CASCADE, related_name="current_for"
+    )
+
+    class Meta:
+        db_table = "current_extraction_page"
+        unique_together = ["document", "page_number"]
+
+    def __str__(self):
+        return f"Page {self.page_number} - Document {self.document_id}"
+
+
+def latest_per_page(queryset: Any) -> Any:
+    """Latest page of every page number among ``queryset``.
+
+    Pages are ranked by creation time within their page number, ties go
+    to the page created last.
+    """
+    return queryset.annotate(
+        version_rank=Window(
+            RowNumber(),
+            partition_by=[F("page_number")],
+            order_by=[F("created_at").desc(), F("id").desc()],
+        )
+    ).filter(version_rank=1)
+
+
+def refresh_current_pages(
+    document_id: int, page_numbers: Iterable[int]
+) -> None:
+    """Point the current pages of a document at their latest version."""
+    page_numbers = set(page_numbers)
+    latest = latest_per_page(
+        ExtractionPage.objects.filter(
+            extraction__document_id=document_id,
+            page_number__in=page_numbers,
+        )
+    ).values_list("page_number", "id")
+    current = [
+        CurrentExtractionPage(
+            document_id=document_id,
+            page_number=page_number,
+            extraction_page_id=page_id,
+        )
+        for page_number, page_id in latest
+    ]
+
+    CurrentExtractionPage.objects.filter(
+        document_id=document_id,
+        page_number__in=page_numbers - {item.page_number for item in current},
+    ).delete()
+    if current:
+        CurrentExtractionPage.objects.bulk_create(
+            current,
+            update_conflicts=True,
+            unique_fields=["document", "page_number"],
+            update_fields=["extraction_page"],
+        )
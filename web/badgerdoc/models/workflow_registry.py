@@ -1,3 +1,8 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
 from django.contrib.auth import models as auth_models
 from django.db import models
 
@@ -15,6 +20,7 @@ class WorkflowRegistry(base.TimestampedModel):
     EVENT_TYPE_CHOICES = [
         ("on_create", "On Create"),
         ("on_update", "On Update"),
+        ("on_renditions_ready", "On Renditions Ready"),
     ]
 
     TRIGGER_CHOICES = [
@@ -220,3 +226,188 @@ def get_registries(
         queryset = queryset.filter(support_prompts=support_prompts)
 
     return list(queryset)
+
+
+def _json_list(value) -> frozenset[str] | None:
+    """Values of a JSON array field, None when the field accepts anything."""
+    if value is None or value == []:
+        return None
+    if not isinstance(value, list):
+        return frozenset()
+    return frozenset(item for item in value if isinstance(item, str))
+
+
+@dataclass(frozen=True)
+class _CompiledRegistry:
+    registry: WorkflowRegistry
+    document_types: frozenset[str] | None
+    entity_tags: frozenset[str] | None
+    extraction_scope: frozenset[str] | None
+
+    def matches(
+        self,
+        document_types: list[str] | None,
+        entity_tags: list[str] | None,
+        extraction_scope: list[str] | None,
+    ) -> bool:
+        if document_types and self.document_types is not None:
+            if self.document_types.isdisjoint(document_types):
+                return False
+        if entity_tags is not None and self.entity_tags is not None:
+            if self.entity_tags.isdisjoint(entity_tags):
+                return False
+        if extraction_scope:
+            if self.extraction_scope is None or (
+                self.extraction_scope.isdisjoint(extraction_scope)
+            ):
+                return False
+        return True
+
+
+class _RegistryMatcher:
+    """Active registries indexed by (event_entity, event_type, trigger).
+
+    Built from one query and kept for at most
+    BADGERDOC_WORKFLOW_REGISTRY_CACHE_TTL seconds. Registry writes in this
+    process clear it at once; writes in other processes are told by the
+    version of the registry table, checked at most every
+    BADGERDOC_WORKFLOW_REGISTRY_CHECK_INTERVAL seconds.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version = 0
+        # (version, table version, expires at, table version checked at)
+        self._built: tuple[int, tuple, float, float] | None = None
+        self._index: dict[tuple, list[_CompiledRegistry]] = {}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version += 1
+
+    @staticmethod
+    def _table_version() -> tuple:
+        # Shared by all processes: saves bump updated_at, deletes the count.
+        # One aggregate over the registry table instead of loading it.
+        version = WorkflowRegistry.objects.aggregate(
+            updated_at=models.Max("updated_at"), count=models.Count("id")
+        )
+        return (version["updated_at"], version["count"])
+
+    def _get_index(self) -> dict[tuple, list[_CompiledRegistry]]:
+        now = time.monotonic()
+        with self._lock:
+            built = self._built
+            if built is not None:
+                version, built_table_version, expires_at, checked_at = built
+                if version != self._version or expires_at <= now:
+                    built = None
+                elif (
+                    now - checked_at
+                    < settings.BADGERDOC_WORKFLOW_REGISTRY_CHECK_INTERVAL
+                ):
+                    return self._index
+            version = self._version
+
+        table_version = self._table_version()
+        if built is not None and built_table_version == table_version:
+            with self._lock:
+                if self._built == built:
+                    self._built = (*built[:3], now)
+            return self._index
+
+        index: dict[tuple, list[_CompiledRegistry]] = {}
+        # Default ordering (newest first) is kept within each key
+        for registry in WorkflowRegistry.objects.filter(is_active=True):
+            key = (
+                registry.event_entity,
+                registry.event_type,
+                registry.trigger,
+            )
+            index.setdefault(key, []).append(
+                _CompiledRegistry(
+                    registry=registry,
+                    document_types=_json_list(registry.document_types),
+                    entity_tags=_json_list(registry.entity_tags),
+                    extraction_scope=_json_list(registry.extraction_scope),
+                )
+            )
+
+        with self._lock:
+            # A registry written while building makes this index stale
+            if version == self._version:
+                self._index = index
+                self._built = (
+                    version,
+                    table_version,
+                    now + settings.BADGERDOC_WORKFLOW_REGISTRY_CACHE_TTL,
+                    now,
+                )
+        return index
+
+    def match(
+        self,
+        event_entity: str | None,
+        event_type: str | None,
+        trigger: str | None,
+        document_types: list[str] | None,
+        entity_tags: list[str] | None,
+        extraction_scope: list[str] | None,
+    ) -> list[WorkflowRegistry]:
+        index = self._get_index()
+        if None not in (event_entity, event_type, trigger):
+            candidates = index.get((event_entity, event_type, trigger), [])
+        else:
+            candidates = [
+                compiled
+                for key, entries in index.items()
+                if all(
+                    wanted is None or wanted == value
+                    for wanted, value in zip(
+                        (event_entity, event_type, trigger), key
+                    )
+                )
+                for compiled in entries
+            ]
+            candidates.sort(
+                key=lambda compiled: compiled.registry.created_at,
+                reverse=True,
+            )
+        return [
+            compiled.registry
+            for compiled in candidates
+            if compiled.matches(document_types, entity_tags, extraction_scope)
+        ]
+
+
+_matcher = _RegistryMatcher()
+
+
+def match_registries(
+    event_entity: str | None = None,
+    event_type: str | None = None,
+    trigger: str | None = None,
+    document_types: list[str] | None = None,
+    entity_tags: list[str] | None = None,
+    extraction_scope: list[str] | None = None,
+) -> list[WorkflowRegistry]:
+    """Active registries matching an event, mostly without a query.
+
+    Same matching rules as ``get_registries`` with ``is_active=True``, over
+    an in-process index of the active registries. Only the version of the
+    registry table is read, at most every
+    BADGERDOC_WORKFLOW_REGISTRY_CHECK_INTERVAL seconds. The returned
+    instances are shared between requests and must not be modified.
+    """
+    return _matcher.match(
+        event_entity,
+        event_type,
+        trigger,
+        document_types,
+        entity_tags,
+        extraction_scope,
+    )
+
+
+def clear_registry_matcher() -> None:
+    _matcher.clear()
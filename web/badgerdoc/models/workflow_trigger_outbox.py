@@ -0,0 +1,41 @@
+from django.db import models
+
+
+class WorkflowTriggerOutbox(models.Model):
+    """Lifecycle workflow start, recorded with the change that caused it.
+
+    Rows are written in the transaction saving the document, extraction or
+    task, so a trigger exists exactly when its change was committed. They
+    are started by ``badgerdoc.workflow_outbox`` after the commit.
+    """
+
+    workflow_type = models.CharField(max_length=255)
+    task_queue = models.CharField(max_length=255)
+    # Pending rows sharing a key are started as one workflow
+    coalesce_key = models.CharField(max_length=255)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Set while a dispatcher starts the row, rows claimed longer than
+    # BADGERDOC_WORKFLOW_TRIGGER_LEASE seconds ago are claimed again
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    workflow_id = models.CharField(max_length=255, blank=True, default="")
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+
+    class Meta:
+        db_table = "workflow_trigger_outbox"
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(dispatched_at__isnull=True),
+                name="idx_trigger_outbox_pending",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        state = self.workflow_id or (
+            "pending" if not self.dispatched_at else "failed"
+        )
+        return f"{self.coalesce_key} -> {self.workflow_type} ({state})"
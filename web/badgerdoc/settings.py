@@ -267,6 +267,65 @@ BADGERDOC_LIFECYCLE_EXTRACTION_QUEUE = os.getenv(
 
 BADGERDOC_MAX_FILE_SIZE = int(os.getenv("BADGERDOC_MAX_FILE_SIZE", "0"))
 
+# How files are handed out without proxying them through Django:
+# "accel" - X-Accel-Redirect to the nginx "/_storage/" location
+# "presigned" - HTTP redirect to the object storage URL
+BADGERDOC_STORAGE_REDIRECT = os.getenv("BADGERDOC_STORAGE_REDIRECT", "accel")
+
+# Threads reading and validating hOCR of bulk extraction page requests
+BADGERDOC_HOCR_VALIDATION_WORKERS = int(
+    os.getenv("BADGERDOC_HOCR_VALIDATION_WORKERS", "4")
+)
+
+# How new extraction page content is stored: "none" - plain text,
+# "zlib" - compressed with a preset hOCR dictionary. Pages are read in
+# either format, existing pages are converted by the
+# compress_extraction_pages command
+BADGERDOC_EXTRACTION_PAGE_COMPRESSION = os.getenv(
+    "BADGERDOC_EXTRACTION_PAGE_COMPRESSION", "none"
+)
+BADGERDOC_EXTRACTION_PAGE_COMPRESSION_LEVEL = int(
+    os.getenv("BADGERDOC_EXTRACTION_PAGE_COMPRESSION_LEVEL", "6")
+)
+
+# Seconds a web process keeps the ancestor path of a document used by
+# agent logs, 0 disables the cache
+BADGERDOC_DOCUMENT_PATH_CACHE_TTL = float(
+    os.getenv("BADGERDOC_DOCUMENT_PATH_CACHE_TTL", "300")
+)
+
+# Lifecycle workflow starts are recorded in an outbox table with the saved
+# row and started after commit, in batches. Dispatcher: "thread" - a thread
+# in each web process, "command" - only the dispatch_workflow_triggers
+# management command
+BADGERDOC_WORKFLOW_TRIGGER_DISPATCHER = os.getenv(
+    "BADGERDOC_WORKFLOW_TRIGGER_DISPATCHER", "thread"
+)
+BADGERDOC_WORKFLOW_TRIGGER_BATCH_SIZE = int(
+    os.getenv("BADGERDOC_WORKFLOW_TRIGGER_BATCH_SIZE", "100")
+)
+# Seconds between two sweeps of the outbox for triggers not started yet
+BADGERDOC_WORKFLOW_TRIGGER_SWEEP_INTERVAL = float(
+    os.getenv("BADGERDOC_WORKFLOW_TRIGGER_SWEEP_INTERVAL", "10")
+)
+# Seconds a dispatcher has to start the triggers it claimed before other
+# dispatchers may claim them, longer than BADGERDOC_TEMPORAL_CALL_TIMEOUT
+BADGERDOC_WORKFLOW_TRIGGER_LEASE = float(
+    os.getenv("BADGERDOC_WORKFLOW_TRIGGER_LEASE", "120")
+)
+
+# Seconds a web process keeps its index of active workflow registries used
+# to match save events at most; registry writes in the process clear it at
+# once, the TTL covers writes that bypass save() and delete()
+BADGERDOC_WORKFLOW_REGISTRY_CACHE_TTL = float(
+    os.getenv("BADGERDOC_WORKFLOW_REGISTRY_CACHE_TTL", "60")
+)
+# Seconds between two reads of the version of the registry table, which
+# tells registry saves and deletes in other processes
+BADGERDOC_WORKFLOW_REGISTRY_CHECK_INTERVAL = float(
+    os.getenv("BADGERDOC_WORKFLOW_REGISTRY_CHECK_INTERVAL", "2")
+)
+
 TEMPORAL_ADDRESS = os.getenv("TEMPORAL_ADDRESS", "")
 TEMPORAL_NAMESPACE = os.getenv("TEMPORAL_NAMESPACE", "")
 
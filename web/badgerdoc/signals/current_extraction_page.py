@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from badgerdoc.models import extraction, extraction_page
+
+
+def _refresh(instance: extraction_page.ExtractionPage) -> None:
+    try:
+        document_id = instance.extraction.document_id
+    except extraction.Extraction.DoesNotExist:
+        return
+    extraction_page.refresh_current_pages(document_id, [instance.page_number])
+
+
+@receiver(post_save, sender=extraction_page.ExtractionPage)
+def handle_extraction_page_save(
+    sender, instance: extraction_page.ExtractionPage, **kwargs
+):  # pylint: disable=unused-argument
+    _refresh(instance)
+
+
+@receiver(post_delete, sender=extraction_page.ExtractionPage)
+def handle_extraction_page_delete(
+    sender, instance: extraction_page.ExtractionPage, **kwargs
+):  # pylint: disable=unused-argument
+    _refresh(instance)
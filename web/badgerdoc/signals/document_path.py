@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from badgerdoc.models import agent_log, document
+
+
+@receiver(post_save, sender=document.Document)
+def handle_document_parent_change(
+    sender,
+    instance: document.Document,
+    created: bool,
+    update_fields=None,
+    **kwargs,
+):  # pylint: disable=unused-argument
+    # Moving a document changes the paths of all of its descendants
+    if created or (
+        update_fields is not None and "parent_document" not in update_fields
+    ):
+        return
+    if not instance.parent_document_changed():
+        return
+    agent_log.clear_document_path_cache()
@@ -1,10 +1,13 @@
 import logging
 import os
+from functools import partial
 
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
-from badgerdoc.models import document, extraction, task
+from badgerdoc import event_rules
+from badgerdoc.models import document, extraction, task, workflow_registry
 from badgerdoc.signals import workflow
 
 logger = logging.getLogger(__name__)
@@ -36,11 +39,61 @@ def _trigger_document_workflow(
         logging.info("No workflows found to be triggered")
 
 
+def _trigger_aggregate_workflow(
+    parent_id: int, rule: event_rules.EventRule, aggregate: str
+) -> None:
+    # The parent and its derived documents are not read when no registry
+    # listens
+    if not workflow_registry.match_registries(
+        event_entity="document", event_type=aggregate, trigger="automatic"
+    ):
+        return
+    parent = document.Document.objects.filter(pk=parent_id).first()
+    if parent is None or not event_rules.is_aggregate_complete(parent, rule):
+        return
+    params = workflow.WorkflowParameters(
+        event_entity="document",
+        event_type=aggregate,
+        document_id=parent.pk,
+    )
+    supported_workflows = workflow.get_supported_workflows_by_document(
+        params, parent
+    )
+    _trigger_document_workflow(
+        parent,
+        "document",
+        aggregate,
+        supported_workflows,
+    )
+
+
 @receiver(post_save, sender=document.Document)
 def handle_document_save(
     sender, instance: document.Document, created: bool, **kwargs
 ):  # pylint: disable=unused-argument
 
+    rule = event_rules.find_rule(instance)
+    if rule is not None:
+        if created and rule.aggregate:
+            # Counted after commit, so concurrently uploaded pages see
+            # each other and the last one emits the aggregate event
+            transaction.on_commit(
+                partial(
+                    _trigger_aggregate_workflow,
+                    instance.parent_document_id,
+                    rule,
+                    rule.aggregate,
+                ),
+                robust=True,
+            )
+        if ("on_create" if created else "on_update") not in rule.emit:
+            logger.debug(
+                "Event of derived document %s suppressed by the '%s' rule",
+                instance.pk,
+                rule.tag,
+            )
+            return
+
     if created:
         logger.info(
             "Document uploaded: %s by %s",
@@ -1,10 +1,9 @@
 import logging
 from dataclasses import asdict, dataclass
-from uuid import uuid4
 
 from django.forms.models import model_to_dict
 
-from badgerdoc import temporal_client
+from badgerdoc import workflow_outbox
 from badgerdoc.models import document, extraction, task, workflow_registry
 
 logger = logging.getLogger(__name__)
@@ -36,8 +35,6 @@ def trigger(
             )
             return
 
-        workflow_id = f"badgerdoc-lifecycle-{event.event_entity}-{event.event_type}-{entity_id}-{uuid4().hex[:5]}"
-
         event_dict = asdict(event)
         event_dict["supported_workflows"] = [
             {
@@ -48,19 +45,20 @@ def trigger(
             for wf in event.supported_workflows
         ]
 
-        temporal_client.start_workflow(
+        # Started after commit by the outbox dispatcher, the request does
+        # not wait for Temporal
+        workflow_outbox.enqueue(
             workflow_type=workflow_type,
             task_queue=task_queue,
-            workflow_id=workflow_id,
-            args=[event_dict],
+            coalesce_key=f"{event.event_entity}-{event.event_type}-{entity_id}",
+            payload=event_dict,
         )
 
         logger.info(
-            "Lifecycle workflow triggered successfully for %s %s %s. Workflow ID: %s",
+            "Lifecycle workflow trigger recorded for %s %s %s",
             event.event_entity,
             entity_id,
             event.event_type,
-            workflow_id,
         )
 
     except Exception:
@@ -103,7 +101,7 @@ def get_supported_workflows(
         "automatic",
     )
 
-    registries = workflow_registry.get_registries(
+    registries = workflow_registry.match_registries(
         event_entity=params.event_entity,
         event_type=params.event_type,
         document_types=document_types,
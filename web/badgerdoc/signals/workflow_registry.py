@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from badgerdoc.models import workflow_registry
+
+
+@receiver(post_save, sender=workflow_registry.WorkflowRegistry)
+@receiver(post_delete, sender=workflow_registry.WorkflowRegistry)
+def handle_registry_change(
+    sender, instance: workflow_registry.WorkflowRegistry, **kwargs
+):  # pylint: disable=unused-argument
+    # Cleared again on commit, as the matcher may be rebuilt from the
+    # data committed before this change in the meantime
+    workflow_registry.clear_registry_matcher()
+    transaction.on_commit(workflow_registry.clear_registry_matcher)
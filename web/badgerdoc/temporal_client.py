@@ -1,13 +1,23 @@
 import asyncio
+import concurrent.futures
 import logging
 import os
+import threading
 from enum import StrEnum
-from typing import Any
+from typing import Any, Coroutine, TypeVar
 
 from temporalio.client import Client, WorkflowExecutionStatus
+from temporalio.common import WorkflowIDConflictPolicy, WorkflowIDReusePolicy
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Seconds a request thread waits for a Temporal call to complete
+TEMPORAL_CALL_TIMEOUT = float(
+    os.getenv("BADGERDOC_TEMPORAL_CALL_TIMEOUT", "30")
+)
+
 
 class TemporalWorkflowStatus(StrEnum):
     IN_PROGRESS = "In Progress"
@@ -16,11 +26,59 @@ class TemporalWorkflowStatus(StrEnum):
     NOT_FOUND = "Not Found"
 
 
-async def get_temporal_client() -> Client:
+class _TemporalLoop:
+    """Event loop thread owning the Temporal client of the process.
+
+    The client is connected once, on first use, and shared by every
+    request thread: they submit coroutines with ``submit`` and wait on the
+    returned futures. A process forked after the thread was started (e.g.
+    gunicorn with --preload) starts its own thread and client.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pid: int | None = None
+        self._client: Client | None = None
+        self._client_lock: asyncio.Lock | None = None
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                self._pid = os.getpid()
+                self._client = None
+                self._client_lock = None
+                threading.Thread(
+                    target=self._loop.run_forever,
+                    name="temporal-client",
+                    daemon=True,
+                ).start()
+            return self._loop
+
+    def submit(
+        self, coro: Coroutine[Any, Any, T]
+    ) -> concurrent.futures.Future[T]:
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+
+    async def client(self) -> Client:
+        # Only awaited on the loop thread, so the asyncio lock is enough
+        if self._client_lock is None:
+            self._client_lock = asyncio.Lock()
+        async with self._client_lock:
+            if self._client is None:
+                self._client = await _connect()
+        return self._client
+
+
+_temporal_loop = _TemporalLoop()
+
+
+async def _connect() -> Client:
     try:
         target_host = os.getenv("TEMPORAL_ADDRESS", "")
         temporal_namespace = os.getenv("TEMPORAL_NAMESPACE", "default")
-        logger.debug(
+        logger.info(
             "Connecting to Temporal server at %s, namespace: %s",
             target_host,
             temporal_namespace,
@@ -36,11 +94,45 @@ async def get_temporal_client() -> Client:
         raise
 
 
+def submit(coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+    """Run a coroutine on the Temporal client loop, from any thread.
+
+    Coroutines using the client must run there, see
+    ``get_temporal_client``.
+    """
+    return _temporal_loop.submit(coro)
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    future = submit(coro)
+    try:
+        return future.result(timeout=TEMPORAL_CALL_TIMEOUT)
+    except concurrent.futures.TimeoutError:
+        # Nobody waits for the result any more, stop the call on the loop
+        future.cancel()
+        raise
+
+
+async def get_temporal_client() -> Client:
+    """Shared client of the process, connected on first use.
+
+    Must be awaited on the Temporal client loop, i.e. in a coroutine
+    passed to ``submit`` or ``run``.
+    """
+    return await _temporal_loop.client()
+
+
 async def a_start_workflow(
     workflow_type: str,
     task_queue: str,
     workflow_id: str,
     args: list[Any],
+    id_reuse_policy: WorkflowIDReusePolicy = (
+        WorkflowIDReusePolicy.ALLOW_DUPLICATE
+    ),
+    id_conflict_policy: WorkflowIDConflictPolicy = (
+        WorkflowIDConflictPolicy.UNSPECIFIED
+    ),
 ) -> str:
     client = await get_temporal_client()
     handle = await client.start_workflow(
@@ -48,6 +140,8 @@ async def a_start_workflow(
         task_queue=task_queue,
         id=workflow_id,
         args=args,
+        id_reuse_policy=id_reuse_policy,
+        id_conflict_policy=id_conflict_policy,
     )
     return handle.id
 
@@ -58,15 +152,7 @@ def start_workflow(
     workflow_id: str,
     args: list[Any],
 ) -> str:
-    try:
-        loop = asyncio.get_event_loop()
-        return loop.run_until_complete(
-            a_start_workflow(workflow_type, task_queue, workflow_id, args)
-        )
-    except RuntimeError:
-        return asyncio.run(
-            a_start_workflow(workflow_type, task_queue, workflow_id, args)
-        )
+    return run(a_start_workflow(workflow_type, task_queue, workflow_id, args))
 
 
 async def a_get_workflow_status(workflow_id: str) -> TemporalWorkflowStatus:
@@ -90,8 +176,4 @@ async def a_get_workflow_status(workflow_id: str) -> TemporalWorkflowStatus:
 def get_workflow_status(
     workflow_id: str,
 ) -> TemporalWorkflowStatus:
-    try:
-        loop = asyncio.get_event_loop()
-        return loop.run_until_complete(a_get_workflow_status(workflow_id))
-    except RuntimeError:
-        return asyncio.run(a_get_workflow_status(workflow_id))
+    return run(a_get_workflow_status(workflow_id))
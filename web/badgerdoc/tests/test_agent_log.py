@@ -0,0 +1,209 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from badgerdoc.models import agent_log, document
+from badgerdoc.tests.settings import mock_db_and_file_storage
+
+
+@mock_db_and_file_storage
+class DocumentPathTestCase(TestCase):
+    def setUp(self):
+        trigger_workflow_patch = patch(
+            "badgerdoc.signals.trigger_automatic.workflow.trigger"
+        )
+        trigger_workflow_patch.start()
+        self.addCleanup(trigger_workflow_patch.stop)
+        agent_log.clear_document_path_cache()
+        self.addCleanup(agent_log.clear_document_path_cache)
+
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.root = document.Document.objects.create(
+            file="root.pdf", uploaded_by=self.owner
+        )
+        self.child = document.Document.objects.create(
+            file="child.png", uploaded_by=self.owner, parent_document=self.root
+        )
+        self.grandchild = document.Document.objects.create(
+            file="grandchild.png",
+            uploaded_by=self.owner,
+            parent_document=self.child,
+        )
+
+    def test_path_is_resolved_in_one_query_and_cached(self):
+        with self.assertNumQueries(1):
+            path = agent_log.build_document_path(self.grandchild.id)
+        self.assertEqual(
+            path, f"{self.root.id}/{self.child.id}/{self.grandchild.id}/"
+        )
+
+        with self.assertNumQueries(0):
+            agent_log.build_document_path(self.grandchild.id)
+
+    @override_settings(BADGERDOC_DOCUMENT_PATH_CACHE_TTL=0)
+    def test_expired_paths_are_resolved_again(self):
+        agent_log.build_document_path(self.child.id)
+
+        with self.assertNumQueries(1):
+            agent_log.build_document_path(self.child.id)
+
+    def test_moving_a_document_clears_cached_paths(self):
+        other_root = document.Document.objects.create(
+            file="other.pdf", uploaded_by=self.owner
+        )
+        agent_log.build_document_path(self.grandchild.id)
+
+        self.child.parent_document = other_root
+        self.child.save()
+
+        self.assertEqual(
+            agent_log.build_document_path(self.grandchild.id),
+            f"{other_root.id}/{self.child.id}/{self.grandchild.id}/",
+        )
+
+    def test_saving_without_a_move_keeps_cached_paths(self):
+        agent_log.build_document_path(self.grandchild.id)
+
+        child = document.Document.objects.get(pk=self.child.pk)
+        child.metadata = {"total_pages": 1}
+        child.save()
+        self.child.save()
+
+        with self.assertNumQueries(0):
+            agent_log.build_document_path(self.grandchild.id)
+
+    def test_agent_log_stores_document_path(self):
+        log = agent_log.AgentLog.objects.create(
+            document=self.grandchild,
+            source=agent_log.AgentLog.Source.TEMPORAL,
+            log={"message": "done"},
+        )
+
+        self.assertEqual(
+            log.path, f"{self.root.id}/{self.child.id}/{self.grandchild.id}/"
+        )
+
+    def test_missing_document_raises(self):
+        with self.assertRaises(document.Document.DoesNotExist):
+            agent_log.build_document_path(self.grandchild.id + 100)
+
+
+@mock_db_and_file_storage
+class BulkAgentLogTestCase(TestCase):
+    def setUp(self):
+        trigger_workflow_patch = patch(
+            "badgerdoc.signals.trigger_automatic.workflow.trigger"
+        )
+        trigger_workflow_patch.start()
+        self.addCleanup(trigger_workflow_patch.stop)
+
+        self.client = APIClient()
+        self.worker = User.objects.create_user(
+            username="worker",
+            email="worker@test.com",
+            password="pass",
+            is_staff=True,
+        )
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.root = document.Document.objects.create(
+            file="root.pdf", uploaded_by=self.owner
+        )
+        self.child = document.Document.objects.create(
+            file="child.png", uploaded_by=self.owner, parent_document=self.root
+        )
+
+    def _entry(self, document_id: int, message: str) -> dict:
+        return {
+            "document": document_id,
+            "task": None,
+            "level": "INFO",
+            "source": "Temporal",
+            "log": {"message": message},
+        }
+
+    def test_bulk_create_stores_logs_in_order(self):
+        self.client.force_authenticate(user=self.worker)
+
+        resp = self.client.post(
+            "/badgerdoc/agent-log/bulk/",
+            {
+                "logs": [
+                    self._entry(self.root.id, "first"),
+                    self._entry(self.child.id, "second"),
+                    self._entry(self.child.id, "third"),
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data, {"created": 3})
+        logs = list(agent_log.AgentLog.objects.order_by("id"))
+        self.assertEqual(
+            [(log.log["message"], log.path) for log in logs],
+            [
+                ("first", f"{self.root.id}/"),
+                ("second", f"{self.root.id}/{self.child.id}/"),
+                ("third", f"{self.root.id}/{self.child.id}/"),
+            ],
+        )
+
+    def test_bulk_create_keeps_the_time_lines_were_logged(self):
+        self.client.force_authenticate(user=self.worker)
+        logged_at = timezone.now() - timedelta(minutes=5)
+
+        resp = self.client.post(
+            "/badgerdoc/agent-log/bulk/",
+            {
+                "logs": [
+                    {
+                        **self._entry(self.root.id, "logged"),
+                        "created_at": logged_at.isoformat(),
+                    },
+                    self._entry(self.root.id, "unstamped"),
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        logged, unstamped = agent_log.AgentLog.objects.order_by("id")
+        self.assertEqual(logged.created_at, logged_at)
+        self.assertGreater(unstamped.created_at, logged_at)
+
+    def test_bulk_create_rejects_unknown_documents(self):
+        self.client.force_authenticate(user=self.worker)
+
+        resp = self.client.post(
+            "/badgerdoc/agent-log/bulk/",
+            {
+                "logs": [
+                    self._entry(self.root.id, "first"),
+                    self._entry(self.child.id + 100, "second"),
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(agent_log.AgentLog.objects.exists())
+
+    def test_bulk_create_requires_write_permission(self):
+        self.client.force_authenticate(user=self.owner)
+
+        resp = self.client.post(
+            "/badgerdoc/agent-log/bulk/",
+            {"logs": [self._entry(self.root.id, "first")]},
+            format="json",
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
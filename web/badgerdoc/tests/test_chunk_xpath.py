@@ -117,10 +117,12 @@ class FindExistingChunkTestCase(TestCase):
             "badgerdoc.signals.trigger_automatic.workflow.trigger"
         )
         self.mock_trigger_workflow = self.trigger_workflow_patch.start()
-        patch(
+        supported_workflows_patch = patch(
             "badgerdoc.signals.workflow.get_supported_workflows",
             return_value=[],
-        ).start()
+        )
+        supported_workflows_patch.start()
+        self.addCleanup(supported_workflows_patch.stop)
 
         self.owner = User.objects.create_user(
             username="owner", email="owner@test.com", password="testpass123"
@@ -174,10 +176,12 @@ class CreateChunkDocumentTestCase(TestCase):
             "badgerdoc.signals.trigger_automatic.workflow.trigger"
         )
         self.mock_trigger_workflow = self.trigger_workflow_patch.start()
-        patch(
+        supported_workflows_patch = patch(
             "badgerdoc.signals.workflow.get_supported_workflows",
             return_value=[],
-        ).start()
+        )
+        supported_workflows_patch.start()
+        self.addCleanup(supported_workflows_patch.stop)
 
         self.owner = User.objects.create_user(
             username="owner", email="owner@test.com", password="testpass123"
@@ -242,10 +246,12 @@ class CropRenditionTestCase(TestCase):
             "badgerdoc.signals.trigger_automatic.workflow.trigger"
         )
         self.mock_trigger_workflow = self.trigger_workflow_patch.start()
-        patch(
+        supported_workflows_patch = patch(
             "badgerdoc.signals.workflow.get_supported_workflows",
             return_value=[],
-        ).start()
+        )
+        supported_workflows_patch.start()
+        self.addCleanup(supported_workflows_patch.stop)
 
         self.owner = User.objects.create_user(
             username="owner", email="owner@test.com", password="testpass123"
@@ -3,7 +3,9 @@ from io import BytesIO
 from unittest.mock import patch
 
 from django.contrib.auth.models import Permission, User
-from django.test import TestCase, override_settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings, skipUnlessDBFeature
 from PIL import Image
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -47,10 +49,12 @@ class DocumentParentDocumentTestCase(TestCase):
             "badgerdoc.signals.trigger_automatic.workflow.trigger"
         )
         self.mock_trigger_workflow = self.trigger_workflow_patch.start()
-        patch(
+        supported_workflows_patch = patch(
             "badgerdoc.signals.workflow.get_supported_workflows",
             return_value=["workflow name"],
-        ).start()
+        )
+        supported_workflows_patch.start()
+        self.addCleanup(supported_workflows_patch.stop)
 
         workflow_registry.WorkflowRegistry.objects.create(
             created_by=self.owner,
@@ -604,3 +608,362 @@ class DocumentParentDocumentTestCase(TestCase):
         self.assertIsNotNone(rendition)
         self.assertEqual(rendition.metadata["page"], 1)
         self.assertIn("size", rendition.metadata)
+
+    def test_bulk_create_documents(self):
+        self.client.force_authenticate(user=self.owner)
+        parent = document.Document.objects.create(
+            uploaded_by=self.owner, extension="png"
+        )
+        self.mock_trigger_workflow.reset_mock()
+
+        response = self.client.post(
+            "/badgerdoc/document/bulk/",
+            {
+                "parent_document_id": parent.id,
+                "documents": [
+                    {
+                        "file": f"derived/{parent.id}/run/0/0_0.png",
+                        "extension": "png",
+                        "metadata": {"page": 1},
+                        "tags": ["dzi", "0/0_0.png"],
+                    },
+                    {
+                        "name": "1_0_0.png",
+                        "file": f"derived/{parent.id}/run/1/0_0.png",
+                        "extension": "png",
+                        "tags": ["dzi", "1/0_0.png"],
+                    },
+                ],
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["results"]), 2)
+        children = document.Document.objects.filter(
+            parent_document=parent
+        ).order_by("id")
+        self.assertEqual(
+            [child.file.name for child in children],
+            [
+                f"derived/{parent.id}/run/0/0_0.png",
+                f"derived/{parent.id}/run/1/0_0.png",
+            ],
+        )
+        self.assertEqual(
+            [child.name for child in children], ["0_0", "1_0_0.png"]
+        )
+        self.assertEqual(children[0].metadata, {"page": 1})
+        self.assertTrue(all(c.uploaded_by == self.owner for c in children))
+        self.mock_trigger_workflow.assert_not_called()
+
+    def test_bulk_create_documents_rejects_foreign_storage_keys(self):
+        self.client.force_authenticate(user=self.owner)
+        parent = document.Document.objects.create(uploaded_by=self.owner)
+
+        for key in (
+            "documents/abc/file.pdf",
+            f"derived/{parent.id + 1}/tile.png",
+            f"derived/{parent.id}/../{parent.id + 1}/tile.png",
+        ):
+            response = self.client.post(
+                "/badgerdoc/document/bulk/",
+                {
+                    "parent_document_id": parent.id,
+                    "documents": [{"file": key}],
+                },
+                format="json",
+            )
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST, key
+            )
+
+        self.assertFalse(
+            document.Document.objects.filter(parent_document=parent).exists()
+        )
+
+    def test_bulk_create_documents_requires_owned_parent(self):
+        self.client.force_authenticate(user=self.other_user)
+        parent = document.Document.objects.create(uploaded_by=self.owner)
+
+        response = self.client.post(
+            "/badgerdoc/document/bulk/",
+            {
+                "parent_document_id": parent.id,
+                "documents": [{"file": f"derived/{parent.id}/tile.png"}],
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_dzi_tile_in_manifest_layout_redirects_without_queries(self):
+        self.client.force_authenticate(user=self.owner)
+        run_id = "a" * 32
+        url = (
+            f"/badgerdoc/document/1/dzi/page/1/name/12-{run_id}_files"
+            "/3/1_2.png"
+        )
+
+        with self.settings(BADGERDOC_STORAGE_REDIRECT="presigned"):
+            with self.assertNumQueries(0):
+                response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(
+            response["Location"],
+            default_storage.url(f"derived/12/{run_id}/3/1_2.png"),
+        )
+
+        with self.settings(BADGERDOC_STORAGE_REDIRECT="accel"):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            "/_storage/"
+            + default_storage.url(f"derived/12/{run_id}/3/1_2.png").lstrip(
+                "/"
+            ),
+        )
+
+    def test_dzi_tile_in_manifest_layout_rejects_invalid_position(self):
+        self.client.force_authenticate(user=self.owner)
+
+        response = self.client.get(
+            f"/badgerdoc/document/1/dzi/page/1/name/12-{'a' * 32}_files"
+            "/3/..%2F..%2Fsecret.png"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_delete_dzi_manifest_removes_tiles(self):
+        prefix = "derived/7/" + "b" * 32
+        for key in (f"{prefix}/0/0_0.png", f"{prefix}/1/0_0.png"):
+            default_storage.save(key, ContentFile(b"tile"))
+        manifest = document.Document.objects.create(
+            uploaded_by=self.owner,
+            tags=["dzi", "xml"],
+            metadata={"page": 1, "tiles_prefix": prefix},
+        )
+
+        manifest.delete()
+
+        self.assertFalse(default_storage.exists(f"{prefix}/0/0_0.png"))
+        self.assertFalse(default_storage.exists(f"{prefix}/1/0_0.png"))
+
+    def test_list_documents_cursor_pagination_walks_ties_by_id(self):
+        self.client.force_authenticate(user=self.owner)
+        docs = [
+            document.Document.objects.create(
+                file=f"c{i}.pdf", uploaded_by=self.owner, extension="pdf"
+            )
+            for i in range(5)
+        ]
+        document.Document.objects.filter(id__in=[d.id for d in docs]).update(
+            updated_at=docs[0].updated_at
+        )
+
+        seen = []
+        url = "/badgerdoc/documents/?cursor=&page_size=2"
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            self.assertIsNone(resp.data["count"])
+            seen.extend(item["id"] for item in resp.data["results"])
+            url = (
+                f"/badgerdoc/documents/{resp.data['next']}"
+                if resp.data["next"]
+                else None
+            )
+
+        self.assertEqual(seen, sorted((d.id for d in docs), reverse=True))
+
+    def test_list_documents_rejects_invalid_cursor(self):
+        self.client.force_authenticate(user=self.owner)
+
+        resp = self.client.get("/badgerdoc/documents/", {"cursor": "bogus"})
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_documents_without_count(self):
+        self.client.force_authenticate(user=self.owner)
+        for i in range(3):
+            document.Document.objects.create(
+                file=f"n{i}.pdf", uploaded_by=self.owner, extension="pdf"
+            )
+
+        first = self.client.get(
+            "/badgerdoc/documents/", {"count": "false", "page_size": 2}
+        )
+        second = self.client.get(
+            "/badgerdoc/documents/",
+            {"count": "false", "page_size": 2, "page": 2},
+        )
+
+        self.assertIsNone(first.data["count"])
+        self.assertEqual(len(first.data["results"]), 2)
+        self.assertIsNotNone(first.data["next"])
+        self.assertEqual(len(second.data["results"]), 1)
+        self.assertIsNone(second.data["next"])
+        self.assertIsNotNone(second.data["previous"])
+
+    def test_export_document_tree_streams_descendants(self):
+        self.client.force_authenticate(user=self.owner)
+        root = document.Document.objects.create(
+            file="root.pdf", uploaded_by=self.owner, extension="pdf"
+        )
+        page = document.Document.objects.create(
+            uploaded_by=self.owner,
+            parent_document=root,
+            metadata={"page": 1},
+        )
+        tile = document.Document.objects.create(
+            uploaded_by=self.owner,
+            parent_document=page,
+            metadata={"page": 1, "level": 0},
+        )
+        document.Document.objects.create(
+            uploaded_by=self.other_user,
+            parent_document=page,
+            metadata={"page": 1},
+        )
+
+        response = self.client.get(f"/badgerdoc/document/{root.id}/tree/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual([line["id"] for line in lines], [page.id, tile.id])
+        self.assertEqual(lines[1]["parent_document_id"], page.id)
+
+        response = self.client.get(
+            f"/badgerdoc/document/{root.id}/tree/", {"depth": 1}
+        )
+        lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], [page.id])
+
+        response = self.client.get(
+            f"/badgerdoc/document/{root.id}/tree/",
+            {"metadata": json.dumps({"level": 0})},
+        )
+        lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], [tile.id])
+
+    def test_export_document_tree_of_other_users_document(self):
+        self.client.force_authenticate(user=self.other_user)
+        root = document.Document.objects.create(
+            file="root.pdf", uploaded_by=self.owner, extension="pdf"
+        )
+
+        response = self.client.get(f"/badgerdoc/document/{root.id}/tree/")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_renditions_by_page_validates_document_ids(self):
+        self.client.force_authenticate(user=self.owner)
+
+        for value in ("", "1,abc", ",".join(str(i) for i in range(101))):
+            resp = self.client.get(
+                "/badgerdoc/documents/renditions/", {"document_ids": value}
+            )
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_renditions_by_page_of_other_users_document(self):
+        self.client.force_authenticate(user=self.other_user)
+        doc = document.Document.objects.create(
+            file="root.pdf", uploaded_by=self.owner, extension="pdf"
+        )
+
+        resp = self.client.get(
+            "/badgerdoc/documents/renditions/", {"document_ids": str(doc.id)}
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@mock_db_and_file_storage
+@skipUnlessDBFeature("supports_json_field_contains")
+class RenditionLookupTestCase(TestCase):
+    def setUp(self):
+        for patcher in (
+            patch("badgerdoc.signals.trigger_automatic.workflow.trigger"),
+            patch(
+                "badgerdoc.signals.workflow.get_supported_workflows",
+                return_value=[],
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.client = APIClient()
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="testpass123"
+        )
+        self.parent = document.Document.objects.create(
+            file="parent.pdf", uploaded_by=self.owner, extension="pdf"
+        )
+        self.other_parent = document.Document.objects.create(
+            file="other.pdf", uploaded_by=self.owner, extension="pdf"
+        )
+        self.page_1 = self._child(self.parent, ["rendition"], 1)
+        # Not renditions, or pages not stored as numbers
+        self._child(self.parent, ["rendition_preview"], 2)
+        self._child(self.parent, ["dzi", "xml"], 2)
+        self._child(self.parent, ["rendition"], "3")
+        self.other_page_1 = self._child(self.other_parent, ["rendition"], 1)
+
+    def _child(
+        self, parent: document.Document, tags: list[str], page: int | str
+    ) -> document.Document:
+        return document.Document.objects.create(
+            file=f"{parent.pk}_{tags[0]}_{page}.png",
+            uploaded_by=self.owner,
+            parent_document=parent,
+            extension="png",
+            tags=tags,
+            metadata={"page": page},
+        )
+
+    def test_find_rendition(self):
+        self.assertEqual(
+            document.find_rendition(self.parent.pk, 1), self.page_1
+        )
+        self.assertEqual(
+            document.find_rendition(self.other_parent.pk, 1),
+            self.other_page_1,
+        )
+        # Other tags, a page stored as a string and a missing page
+        for page in (2, 3, 4):
+            self.assertIsNone(document.find_rendition(self.parent.pk, page))
+
+    def test_find_renditions_by_page_keeps_latest_rendition(self):
+        newer = self._child(self.parent, ["rendition"], 1)
+
+        renditions = document.find_renditions_by_page(
+            [self.parent.pk, self.other_parent.pk, self.other_page_1.pk]
+        )
+
+        self.assertEqual(
+            renditions,
+            {
+                self.parent.pk: {1: newer},
+                self.other_parent.pk: {1: self.other_page_1},
+                self.other_page_1.pk: {},
+            },
+        )
+
+    def test_rendition_page_endpoint(self):
+        self.client.force_authenticate(user=self.owner)
+        url = f"/badgerdoc/document/{self.parent.pk}/rendition-page"
+
+        resp = self.client.get(f"{url}/1/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["id"], self.page_1.pk)
+
+        for page in (2, 3, 4):
+            resp = self.client.get(f"{url}/{page}/")
+            self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND, page)
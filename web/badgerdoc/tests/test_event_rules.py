@@ -0,0 +1,136 @@
+import os
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from badgerdoc import chunk_xpath, event_rules, workflow_outbox
+from badgerdoc.models import document, workflow_registry
+from badgerdoc.models.workflow_trigger_outbox import WorkflowTriggerOutbox
+from badgerdoc.tests.settings import mock_db_and_file_storage
+
+
+def _count_derived(parent_id: int, tag: str) -> int:
+    # tags__contains is not supported by SQLite
+    return sum(
+        tag in (tags or [])
+        for tags in document.Document.objects.filter(
+            parent_document=parent_id
+        ).values_list("tags", flat=True)
+    )
+
+
+@mock_db_and_file_storage
+class DerivedDocumentEventTestCase(TestCase):
+    def setUp(self):
+        workflow_registry.clear_registry_matcher()
+        self.addCleanup(workflow_registry.clear_registry_matcher)
+        for patcher in (
+            patch.dict(
+                os.environ,
+                {
+                    "BADGERDOC_LIFECYCLE_WORKFLOW_TYPE": "TestWorkflow",
+                    "BADGERDOC_LIFECYCLE_QUEUE": "test-queue",
+                },
+            ),
+            patch.object(workflow_outbox._dispatcher, "wake"),
+            patch.object(
+                event_rules, "count_derived", side_effect=_count_derived
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        for name, event_type in (
+            ("Convert", "on_create"),
+            ("Dzi", "on_create"),
+            ("RenditionUpdate", "on_update"),
+            ("RenditionsReady", event_rules.RENDITIONS_READY),
+        ):
+            workflow_registry.WorkflowRegistry.objects.create(
+                created_by=self.owner,
+                name=name,
+                event_entity="document",
+                event_type=event_type,
+                entity_tags=[] if name == "Convert" else ["rendition"],
+                temporal_workflow_type=name,
+                temporal_queue="queue",
+                trigger="automatic",
+            )
+        workflow_registry.WorkflowRegistry.objects.filter(
+            name="RenditionsReady"
+        ).update(entity_tags=[])
+
+        self.parent = document.Document.objects.create(
+            name="source",
+            extension="pdf",
+            uploaded_by=self.owner,
+            metadata={"total_pages": 2},
+        )
+
+    def _child(self, tags: list[str], page: int = 1) -> document.Document:
+        return document.Document.objects.create(
+            name=f"{tags[0]}_{page}",
+            extension="png",
+            uploaded_by=self.owner,
+            parent_document=self.parent,
+            tags=tags,
+            metadata={"page": page},
+        )
+
+    def _triggers(self) -> list[tuple[str, int]]:
+        return [
+            (row.payload["event_type"], row.payload["document_id"])
+            for row in WorkflowTriggerOutbox.objects.order_by("id")
+        ]
+
+    def test_tiles_and_previews_emit_no_events(self):
+        WorkflowTriggerOutbox.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tile = self._child(["dzi", "0/0_0.png"])
+            tile.save()
+            self._child(["dzi", "xml"])
+            self._child(["rendition_preview"])
+
+        self.assertEqual(self._triggers(), [])
+
+    def test_renditions_emit_create_and_one_aggregate_event(self):
+        self.assertEqual(self._triggers(), [("on_create", self.parent.pk)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self._child(["rendition"], page=1)
+            first.save()
+        self.assertEqual(self._triggers()[1:], [("on_create", first.pk)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second = self._child(["rendition"], page=2)
+            self._child(["rendition_preview"], page=2)
+        self.assertEqual(
+            self._triggers()[2:],
+            [
+                ("on_create", second.pk),
+                (event_rules.RENDITIONS_READY, self.parent.pk),
+            ],
+        )
+
+    def test_chunks_emit_create_with_their_file(self):
+        WorkflowTriggerOutbox.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            chunk = chunk_xpath.create_chunk_document(
+                self.parent, self.owner, 1, 5, 10, 50, 60, b"png"
+            )
+
+        self.assertEqual(self._triggers(), [("on_create", chunk.pk)])
+        self.assertTrue(chunk.file.name.endswith("_chunk_p1_5_10_50_60.png"))
+
+    def test_find_rule(self):
+        self.assertIsNone(event_rules.find_rule(self.parent))
+        self.assertEqual(
+            event_rules.find_rule(self._child(["dzi", "xml"])).tag, "dzi"
+        )
+        self.assertIsNone(event_rules.find_rule(self._child(["custom"])))
@@ -44,10 +44,12 @@ class ExtractionDocumentAPITestCase(TestCase):
             "badgerdoc.signals.trigger_automatic.workflow.trigger"
         )
         self.mock_trigger_workflow = self.trigger_workflow_patch.start()
-        patch(
+        supported_workflows_patch = patch(
             "badgerdoc.signals.workflow.get_supported_workflows",
             return_value=["workflow name"],
-        ).start()
+        )
+        supported_workflows_patch.start()
+        self.addCleanup(supported_workflows_patch.stop)
 
         file_content = b"test document content"
         file = SimpleUploadedFile(
@@ -1,8 +1,13 @@
 from datetime import timedelta
+from unittest import mock
 from unittest.mock import patch
 
 from django.contrib.auth.models import Permission, User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -156,10 +161,12 @@ class ExtractionPageAPITestCase(TestCase):
             "badgerdoc.signals.trigger_automatic.workflow.trigger"
         )
         self.mock_trigger_workflow = self.trigger_workflow_patch.start()
-        patch(
+        supported_workflows_patch = patch(
             "badgerdoc.signals.workflow.get_supported_workflows",
             return_value=["workflow name"],
-        ).start()
+        )
+        supported_workflows_patch.start()
+        self.addCleanup(supported_workflows_patch.stop)
 
         self.document = document.Document.objects.create(
             file="test_document.pdf", uploaded_by=self.owner
@@ -254,6 +261,78 @@ class ExtractionPageAPITestCase(TestCase):
         )
         self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_create_extraction_page_from_storage_key(self):
+        self.client.force_authenticate(user=self.owner)
+        extraction_obj = self._create_extraction(
+            status=extraction.ExtractionStatus.IN_PROGRESS
+        )
+        key = default_storage.save(
+            f"data/workflows/documents/{self.document.id}/ocr/OCR/run-1/"
+            "1.html",
+            ContentFile(sample_correct_hocr.encode()),
+        )
+
+        resp = self.client.post(
+            self._url_create_page(),
+            {
+                "extraction_id": extraction_obj.id,
+                "page_number": 1,
+                "storage_key": key,
+            },
+            format="json",
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("content", resp.data)
+        self.assertEqual(
+            extraction_page.ExtractionPage.objects.get(
+                extraction=extraction_obj, page_number=1
+            ).content,
+            sample_correct_hocr,
+        )
+
+    def test_create_extraction_page_rejects_invalid_storage_key(self):
+        self.client.force_authenticate(user=self.owner)
+        extraction_obj = self._create_extraction(
+            status=extraction.ExtractionStatus.IN_PROGRESS
+        )
+
+        prefix = f"data/workflows/documents/{self.document.id}/"
+        other_document = document.Document.objects.create(
+            file="other.pdf", uploaded_by=self.other_user
+        )
+        foreign_key = default_storage.save(
+            f"data/workflows/documents/{other_document.id}/ocr/OCR/run-1/"
+            "1.html",
+            ContentFile(sample_correct_hocr.encode()),
+        )
+
+        for payload in (
+            {"storage_key": "media/documents/1.html"},
+            {"storage_key": "data/workflows/ocr/OCR/run-1/1.html"},
+            {"storage_key": foreign_key},
+            {"storage_key": f"{prefix}../{other_document.id}/1.html"},
+            {"storage_key": f"{prefix}missing.html"},
+            {"storage_key": f"{prefix}1.html", "content": sample_html},
+        ):
+            resp = self.client.post(
+                self._url_create_page(),
+                {
+                    "extraction_id": extraction_obj.id,
+                    "page_number": 1,
+                    **payload,
+                },
+                format="json",
+            )
+            self.assertEqual(
+                resp.status_code, status.HTTP_400_BAD_REQUEST, payload
+            )
+        self.assertFalse(
+            extraction_page.ExtractionPage.objects.filter(
+                extraction=extraction_obj
+            ).exists()
+        )
+
     def test_create_extraction_page_missing_fields(self):
         self.client.force_authenticate(user=self.owner)
         extraction_obj = self._create_extraction(
@@ -359,6 +438,147 @@ class ExtractionPageAPITestCase(TestCase):
         )
         self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_bulk_create_extraction_pages_from_content_and_storage(self):
+        self.client.force_authenticate(user=self.owner)
+        extraction_obj = self._create_extraction(
+            status=extraction.ExtractionStatus.IN_PROGRESS
+        )
+        key = default_storage.save(
+            f"data/workflows/documents/{self.document.id}/ocr/OCR/run-1/"
+            "2.html",
+            ContentFile(sample_html.encode()),
+        )
+
+        resp = self.client.post(
+            "/badgerdoc/extraction-page/bulk/",
+            {
+                "extraction_id": extraction_obj.id,
+                "pages": [
+                    {"page_number": 1, "content": sample_correct_hocr},
+                    {"page_number": 2, "storage_key": key},
+                ],
+            },
+            format="json",
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [page["page_number"] for page in resp.data["results"]], [1, 2]
+        )
+        self.assertEqual(
+            extraction_page.ExtractionPage.objects.get(
+                extraction=extraction_obj, page_number=2
+            ).content,
+            sample_html,
+        )
+        self.assertEqual(
+            extraction_page.CurrentExtractionPage.objects.filter(
+                document=self.document
+            ).count(),
+            2,
+        )
+
+    def test_bulk_create_extraction_pages_is_all_or_nothing(self):
+        self.client.force_authenticate(user=self.owner)
+        extraction_obj = self._create_extraction(
+            status=extraction.ExtractionStatus.IN_PROGRESS
+        )
+
+        resp = self.client.post(
+            "/badgerdoc/extraction-page/bulk/",
+            {
+                "extraction_id": extraction_obj.id,
+                "pages": [
+                    {"page_number": 1, "content": sample_correct_hocr},
+                    {"page_number": 2, "content": sample_incorrect_hocr},
+                ],
+            },
+            format="json",
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(
+            extraction_page.ExtractionPage.objects.filter(
+                extraction=extraction_obj
+            ).exists()
+        )
+
+    def test_bulk_create_extraction_pages_returns_existing_pages(self):
+        self.client.force_authenticate(user=self.owner)
+        extraction_obj = self._create_extraction(
+            status=extraction.ExtractionStatus.IN_PROGRESS
+        )
+        existing = self._create_page(extraction_obj, page_number=1)
+
+        resp = self.client.post(
+            "/badgerdoc/extraction-page/bulk/",
+            {
+                "extraction_id": extraction_obj.id,
+                "pages": [
+                    {"page_number": 1, "content": sample_correct_hocr},
+                    {"page_number": 2, "content": sample_correct_hocr},
+                ],
+            },
+            format="json",
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [page["page_number"] for page in resp.data["results"]], [1, 2]
+        )
+        self.assertEqual(resp.data["results"][0]["id"], existing.id)
+        existing.refresh_from_db()
+        self.assertNotEqual(existing.content, sample_correct_hocr)
+
+    def test_bulk_create_extraction_pages_rejects_invalid_pages(self):
+        self.client.force_authenticate(user=self.owner)
+        extraction_obj = self._create_extraction(
+            status=extraction.ExtractionStatus.IN_PROGRESS
+        )
+        other_document = document.Document.objects.create(
+            file="other.pdf", uploaded_by=self.other_user
+        )
+        foreign_key = default_storage.save(
+            f"data/workflows/documents/{other_document.id}/ocr/OCR/run-1/"
+            "2.html",
+            ContentFile(sample_correct_hocr.encode()),
+        )
+        prefix = f"data/workflows/documents/{self.document.id}/"
+
+        for pages in (
+            [
+                {"page_number": 2, "content": sample_correct_hocr},
+                {"page_number": 2, "content": sample_correct_hocr},
+            ],
+            [{"page_number": 2, "storage_key": "documents/secret.pdf"}],
+            [{"page_number": 2, "storage_key": foreign_key}],
+            [{"page_number": 2, "storage_key": f"{prefix}missing"}],
+            [{"page_number": 2}],
+        ):
+            resp = self.client.post(
+                "/badgerdoc/extraction-page/bulk/",
+                {"extraction_id": extraction_obj.id, "pages": pages},
+                format="json",
+            )
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_extraction_pages_not_creator_forbidden(self):
+        self.client.force_authenticate(user=self.other_user)
+        extraction_obj = self._create_extraction(
+            status=extraction.ExtractionStatus.IN_PROGRESS
+        )
+
+        resp = self.client.post(
+            "/badgerdoc/extraction-page/bulk/",
+            {
+                "extraction_id": extraction_obj.id,
+                "pages": [{"page_number": 1, "content": sample_correct_hocr}],
+            },
+            format="json",
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
     def test_patch_extraction_page_successful_update(self):
         self.client.force_authenticate(user=self.owner)
         extraction_obj = self._create_extraction(
@@ -534,6 +754,47 @@ class ExtractionPageAPITestCase(TestCase):
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertEqual(resp.data["count"], 2)
 
+    def test_list_extraction_pages_projection(self):
+        self.client.force_authenticate(user=self.owner)
+        extraction_obj = self._create_extraction(
+            status=extraction.ExtractionStatus.IN_PROGRESS
+        )
+        self._create_page(extraction_obj, page_number=1)
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(
+                self._url_list_pages(), {"exclude": "content"}
+            )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(resp.data["results"][0]),
+            {"id", "extraction_id", "page_number", "created_at", "updated_at"},
+        )
+        page_query = next(
+            query["sql"]
+            for query in queries.captured_queries
+            if 'FROM "extraction_page"' in query["sql"]
+            and "COUNT(" not in query["sql"]
+        )
+        self.assertNotIn('"extraction_page"."content', page_query)
+
+        resp = self.client.get(
+            self._url_list_pages(), {"fields": "page_number,id"}
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            resp.data["results"], [{"id": mock.ANY, "page_number": 1}]
+        )
+
+        for params in (
+            {"fields": "id,unknown"},
+            {"fields": "id", "exclude": "content"},
+        ):
+            resp = self.client.get(self._url_list_pages(), params)
+            self.assertEqual(
+                resp.status_code, status.HTTP_400_BAD_REQUEST, params
+            )
+
     def test_get_latest_extraction_pages(self):
         self.client.force_authenticate(user=self.owner)
 
@@ -567,6 +828,15 @@ class ExtractionPageAPITestCase(TestCase):
             resp.data["results"][0]["id"], latest_page_extraction_2.id
         )
 
+        resp = self.client.get(
+            self._url_latest(self.document.id), {"exclude": "content"}
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            resp.data["results"][0]["id"], latest_page_extraction_2.id
+        )
+        self.assertNotIn("content", resp.data["results"][0])
+
     def test_get_latest_extraction_page_by_number(self):
         self.client.force_authenticate(user=self.owner)
 
@@ -631,10 +901,12 @@ class LatestExtractionPagesTestCase(TestCase):
             "badgerdoc.signals.trigger_automatic.workflow.trigger"
         )
         self.mock_trigger_workflow = self.trigger_workflow_patch.start()
-        patch(
+        supported_workflows_patch = patch(
             "badgerdoc.signals.workflow.get_supported_workflows",
             return_value=["workflow name"],
-        ).start()
+        )
+        supported_workflows_patch.start()
+        self.addCleanup(supported_workflows_patch.stop)
 
         self.document = document.Document.objects.create(
             file="test_document.pdf", uploaded_by=self.owner
@@ -865,7 +1137,7 @@ class LatestExtractionPagesTestCase(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
-    def test_multiple_pages_same_timestamp_returns_both(self):
+    def test_multiple_pages_same_timestamp_returns_last_created(self):
         self.client.force_authenticate(user=self.owner)
 
         extraction_a = extraction.Extraction.objects.create(
@@ -897,13 +1169,60 @@ class LatestExtractionPagesTestCase(TestCase):
         page_b1.created_at = same_time
         page_b1.save()
 
+        url = f"/badgerdoc/document/{self.document.id}/extraction-page/latest/"
+        for user in (self.owner, self.admin_user):
+            self.client.force_authenticate(user=user)
+            response = self.client.get(url)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["count"], 1)
+            self.assertEqual(response.data["results"][0]["id"], page_b1.id)
+
+    def test_current_pages_follow_page_writes(self):
+        extraction_a, extraction_b = (
+            extraction.Extraction.objects.create(
+                document=self.document,
+                created_by=self.owner,
+                status=extraction.ExtractionStatus.COMPLETED,
+            )
+            for _ in range(2)
+        )
+        page_a1 = extraction_page.ExtractionPage.objects.create(
+            extraction=extraction_a, page_number=1, content=sample_html
+        )
+        page_b1 = extraction_page.ExtractionPage.objects.create(
+            extraction=extraction_b, page_number=1, content=sample_html
+        )
+
+        def current_page_ids():
+            return dict(
+                extraction_page.CurrentExtractionPage.objects.filter(
+                    document=self.document
+                ).values_list("page_number", "extraction_page_id")
+            )
+
+        self.assertEqual(current_page_ids(), {1: page_b1.id})
+
+        page_a1.created_at = self.base_time + timedelta(hours=1)
+        page_a1.save()
+        self.assertEqual(current_page_ids(), {1: page_a1.id})
+
+        self.client.force_authenticate(user=self.admin_user)
         url = f"/badgerdoc/document/{self.document.id}/extraction-page/latest/"
         response = self.client.get(url)
+        self.assertEqual(
+            [page["id"] for page in response.data["results"]], [page_a1.id]
+        )
+        response = self.client.get(f"{url}1/")
+        self.assertEqual(response.data["id"], page_a1.id)
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data["count"], 2)
-        returned_ids = {page["id"] for page in response.data["results"]}
-        self.assertEqual(returned_ids, {page_a1.id, page_b1.id})
+        extraction_a.delete()
+        self.assertEqual(current_page_ids(), {1: page_b1.id})
+        page_b1.delete()
+        self.assertEqual(current_page_ids(), {})
+
+        response = self.client.get(f"{url}1/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_latest_page_across_many_extractions(self):
         self.client.force_authenticate(user=self.owner)
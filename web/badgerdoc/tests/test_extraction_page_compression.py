@@ -0,0 +1,134 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from badgerdoc.models import document, extraction, extraction_page
+from badgerdoc.models._compression import compress_text, decompress_text
+from badgerdoc.tests.settings import mock_db_and_file_storage
+from badgerdoc.tests.test_extraction_page import sample_correct_hocr
+
+
+@mock_db_and_file_storage
+class ExtractionPageCompressionTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        trigger_workflow_patch = patch(
+            "badgerdoc.signals.trigger_automatic.workflow.trigger"
+        )
+        trigger_workflow_patch.start()
+        self.addCleanup(trigger_workflow_patch.stop)
+
+        self.document = document.Document.objects.create(
+            file="test_document.pdf", uploaded_by=self.owner
+        )
+        self.extraction = extraction.Extraction.objects.create(
+            document=self.document,
+            created_by=self.owner,
+            status=extraction.ExtractionStatus.IN_PROGRESS,
+        )
+
+    def _stored_row(self, page_id: int) -> dict:
+        return extraction_page.ExtractionPage.objects.values(
+            "content", "content_compressed"
+        ).get(id=page_id)
+
+    def test_compress_text_round_trip(self):
+        compressed = compress_text(sample_correct_hocr)
+
+        self.assertLess(len(compressed), len(sample_correct_hocr) / 3)
+        self.assertEqual(decompress_text(compressed), sample_correct_hocr)
+        self.assertEqual(
+            decompress_text(memoryview(compressed)), sample_correct_hocr
+        )
+        with self.assertRaises(ValueError):
+            decompress_text(b"\x00" + compressed[1:])
+
+    @override_settings(BADGERDOC_EXTRACTION_PAGE_COMPRESSION="zlib")
+    def test_pages_are_stored_compressed_and_read_transparently(self):
+        self.client.force_authenticate(user=self.owner)
+
+        resp = self.client.post(
+            "/badgerdoc/extraction-page/",
+            {
+                "extraction_id": self.extraction.id,
+                "page_number": 1,
+                "content": sample_correct_hocr,
+            },
+            format="json",
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        # The API trims the surrounding whitespace of the content
+        expected = sample_correct_hocr.strip()
+        row = self._stored_row(resp.data["id"])
+        self.assertEqual(row["content"], "")
+        self.assertEqual(decompress_text(row["content_compressed"]), expected)
+
+        resp = self.client.get(
+            "/badgerdoc/extraction-pages/",
+            {"extraction_id": self.extraction.id},
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["results"][0]["content"], expected)
+
+    def test_compressed_pages_are_read_with_compression_disabled(self):
+        with override_settings(BADGERDOC_EXTRACTION_PAGE_COMPRESSION="zlib"):
+            page = extraction_page.ExtractionPage.objects.create(
+                extraction=self.extraction,
+                page_number=1,
+                content=sample_correct_hocr,
+            )
+
+        page = extraction_page.ExtractionPage.objects.get(id=page.id)
+        self.assertEqual(page.content, sample_correct_hocr)
+
+        page.content = "<p>updated</p>"
+        page.save(update_fields=["content"])
+
+        self.assertEqual(
+            self._stored_row(page.id),
+            {"content": "<p>updated</p>", "content_compressed": None},
+        )
+
+    def test_command_compresses_and_decompresses_pages(self):
+        pages = [
+            extraction_page.ExtractionPage.objects.create(
+                extraction=self.extraction,
+                page_number=number,
+                content=sample_correct_hocr,
+            )
+            for number in (1, 2, 3)
+        ]
+        extraction_page.ExtractionPage.objects.create(
+            extraction=self.extraction, page_number=4, content=""
+        )
+
+        out = StringIO()
+        call_command("compress_extraction_pages", "--dry-run", stdout=out)
+        self.assertIn("Pages: 3", out.getvalue())
+        self.assertIsNone(self._stored_row(pages[0].id)["content_compressed"])
+
+        call_command("compress_extraction_pages", batch_size=2, stdout=out)
+        for page in pages:
+            row = self._stored_row(page.id)
+            self.assertEqual(row["content"], "")
+            self.assertIsNotNone(row["content_compressed"])
+            self.assertEqual(
+                extraction_page.ExtractionPage.objects.get(id=page.id).content,
+                sample_correct_hocr,
+            )
+
+        call_command("compress_extraction_pages", "--decompress", stdout=out)
+        for page in pages:
+            self.assertEqual(
+                self._stored_row(page.id),
+                {"content": sample_correct_hocr, "content_compressed": None},
+            )
@@ -0,0 +1,101 @@
+import asyncio
+import concurrent.futures
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from django.test import SimpleTestCase
+from temporalio.client import WorkflowExecutionStatus
+
+from badgerdoc import temporal_client
+
+
+class TemporalClientTestCase(SimpleTestCase):
+    def setUp(self):
+        temporal_loop = temporal_client._TemporalLoop()
+        loop_patch = patch.object(
+            temporal_client, "_temporal_loop", temporal_loop
+        )
+        loop_patch.start()
+        self.addCleanup(loop_patch.stop)
+        self.addCleanup(self._stop_loop, temporal_loop)
+
+        self.client = MagicMock()
+        self.client.start_workflow = AsyncMock(
+            side_effect=lambda **kwargs: MagicMock(id=kwargs["id"])
+        )
+        connect_patch = patch.object(
+            temporal_client.Client,
+            "connect",
+            AsyncMock(return_value=self.client),
+        )
+        self.connect = connect_patch.start()
+        self.addCleanup(connect_patch.stop)
+
+    def _stop_loop(self, temporal_loop: temporal_client._TemporalLoop):
+        if temporal_loop._loop is not None:
+            temporal_loop._loop.call_soon_threadsafe(temporal_loop._loop.stop)
+
+    def test_one_client_is_shared_by_all_threads(self):
+        def start(number: int) -> str:
+            return temporal_client.start_workflow(
+                workflow_type="Workflow",
+                task_queue="queue",
+                workflow_id=f"workflow-{number}",
+                args=[{}],
+            )
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            workflow_ids = list(executor.map(start, range(8)))
+
+        self.assertEqual(
+            workflow_ids, [f"workflow-{number}" for number in range(8)]
+        )
+        self.connect.assert_awaited_once()
+        self.assertEqual(self.client.start_workflow.await_count, 8)
+
+    def test_calls_run_on_the_client_loop_thread(self):
+        async def current_thread() -> str:
+            return threading.current_thread().name
+
+        self.assertEqual(
+            temporal_client.submit(current_thread()).result(timeout=5),
+            "temporal-client",
+        )
+
+    def test_run_cancels_the_call_on_timeout(self):
+        started = threading.Event()
+        cancelled = threading.Event()
+
+        async def hang() -> None:
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with patch.object(temporal_client, "TEMPORAL_CALL_TIMEOUT", 0.1):
+            with self.assertRaises(concurrent.futures.TimeoutError):
+                temporal_client.run(hang())
+
+        self.assertTrue(started.wait(timeout=5))
+        self.assertTrue(cancelled.wait(timeout=5))
+
+    def test_get_workflow_status(self):
+        handle = MagicMock()
+        handle.describe = AsyncMock(
+            return_value=MagicMock(status=WorkflowExecutionStatus.COMPLETED)
+        )
+        self.client.get_workflow_handle.return_value = handle
+
+        self.assertEqual(
+            temporal_client.get_workflow_status("workflow-1"),
+            temporal_client.TemporalWorkflowStatus.FINISHED,
+        )
+
+        handle.describe.side_effect = RuntimeError("not found")
+        self.assertEqual(
+            temporal_client.get_workflow_status("workflow-1"),
+            temporal_client.TemporalWorkflowStatus.NOT_FOUND,
+        )
@@ -0,0 +1,188 @@
+import concurrent.futures
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import AsyncMock, patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from temporalio.common import WorkflowIDConflictPolicy, WorkflowIDReusePolicy
+
+from badgerdoc import temporal_client, workflow_outbox
+from badgerdoc.models import document
+from badgerdoc.models.workflow_trigger_outbox import WorkflowTriggerOutbox
+from badgerdoc.signals import workflow
+
+
+class WorkflowOutboxTestCase(TestCase):
+    def setUp(self):
+        self.started: list[dict] = []
+
+        async def start_workflow(**kwargs) -> str:
+            if kwargs["task_queue"] == "broken":
+                raise RuntimeError("Temporal unavailable")
+            self.started.append(kwargs)
+            return kwargs["workflow_id"]
+
+        start_patch = patch.object(
+            temporal_client,
+            "a_start_workflow",
+            AsyncMock(side_effect=start_workflow),
+        )
+        start_patch.start()
+        self.addCleanup(start_patch.stop)
+
+    def _enqueue(self, key: str, payload: dict, queue: str = "lifecycle"):
+        workflow_outbox.enqueue(
+            workflow_type="BadgerdocLifecycleWorkflow",
+            task_queue=queue,
+            coalesce_key=key,
+            payload=payload,
+        )
+
+    def test_trigger_is_recorded_and_started_after_commit(self):
+        event = workflow.BadgerdocEvent(
+            event_entity="document",
+            event_type="on_create",
+            document_type="pdf",
+            document_id=7,
+            supported_workflows=[],
+        )
+
+        with (
+            patch.object(workflow_outbox._dispatcher, "wake") as wake,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            workflow.trigger(event, "BadgerdocLifecycleWorkflow", "lifecycle")
+            wake.assert_not_called()
+
+        wake.assert_called_once()
+        row = WorkflowTriggerOutbox.objects.get()
+        self.assertEqual(row.coalesce_key, "document-on_create-7")
+        self.assertEqual(row.payload["document_id"], 7)
+        self.assertIsNone(row.dispatched_at)
+        self.assertEqual(self.started, [])
+
+    def test_dispatch_coalesces_pending_duplicates(self):
+        self._enqueue("extraction-on_update-1", {"version": 1})
+        self._enqueue("document-on_create-2", {"version": 1})
+        self._enqueue("extraction-on_update-1", {"version": 2})
+
+        self.assertEqual(workflow_outbox.dispatch_pending(), 3)
+
+        self.assertEqual(
+            [
+                (item["args"], item["workflow_id"].rsplit("-", 1)[0])
+                for item in self.started
+            ],
+            [
+                (
+                    [{"version": 2}],
+                    "badgerdoc-lifecycle-extraction-on_update-1",
+                ),
+                ([{"version": 1}], "badgerdoc-lifecycle-document-on_create-2"),
+            ],
+        )
+        rows = list(WorkflowTriggerOutbox.objects.order_by("id"))
+        self.assertTrue(all(row.dispatched_at for row in rows))
+        self.assertEqual(rows[0].workflow_id, rows[2].workflow_id)
+        self.assertEqual(workflow_outbox.dispatch_pending(), 0)
+
+    def test_failed_starts_are_retried_then_given_up(self):
+        self._enqueue("document-on_create-1", {}, queue="broken")
+        self._enqueue("document-on_create-2", {})
+
+        self.assertEqual(workflow_outbox.dispatch_pending(), 1)
+        failed = WorkflowTriggerOutbox.objects.get(task_queue="broken")
+        self.assertIsNone(failed.dispatched_at)
+        self.assertEqual(failed.attempts, 1)
+        self.assertIn("Temporal unavailable", failed.error)
+
+        for _ in range(workflow_outbox.MAX_ATTEMPTS - 1):
+            workflow_outbox.dispatch_pending()
+        failed.refresh_from_db()
+        self.assertIsNotNone(failed.dispatched_at)
+        self.assertEqual(failed.workflow_id, "")
+
+        out = StringIO()
+        call_command(
+            "dispatch_workflow_triggers",
+            "--once",
+            "--retry-failed",
+            stdout=out,
+        )
+        self.assertIn("Retrying 1 failed triggers", out.getvalue())
+        self.assertIn("Pending triggers: 1", out.getvalue())
+
+    def test_timed_out_starts_count_as_failed_attempts(self):
+        self._enqueue("document-on_create-1", {})
+
+        with patch.object(
+            temporal_client,
+            "run",
+            side_effect=concurrent.futures.TimeoutError(),
+        ):
+            self.assertEqual(workflow_outbox.dispatch_pending(), 0)
+
+        row = WorkflowTriggerOutbox.objects.get()
+        self.assertIsNone(row.dispatched_at)
+        self.assertIsNone(row.claimed_at)
+        self.assertEqual(row.attempts, 1)
+        self.assertIn("TimeoutError", row.error)
+
+    def test_claimed_rows_are_skipped_until_the_lease_ends(self):
+        self._enqueue("document-on_create-1", {})
+        WorkflowTriggerOutbox.objects.update(claimed_at=timezone.now())
+
+        self.assertEqual(workflow_outbox.dispatch_pending(), 0)
+        self.assertEqual(self.started, [])
+
+        WorkflowTriggerOutbox.objects.update(
+            claimed_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(workflow_outbox.dispatch_pending(), 1)
+        self.assertIsNone(WorkflowTriggerOutbox.objects.get().claimed_at)
+
+    def test_workflow_ids_are_derived_from_content(self):
+        owner = User.objects.create_user(username="owner", password="pass")
+        doc = document.Document.objects.create(
+            name="doc", file="documents/a/doc.pdf", uploaded_by=owner
+        )
+        WorkflowTriggerOutbox.objects.all().delete()
+        registry = {"id": 1, "updated_at": "2026-01-01T00:00:00"}
+
+        def dispatch(**payload) -> str:
+            self._enqueue(
+                f"document-on_update-{doc.pk}",
+                {
+                    "event_entity": "document",
+                    "event_type": "on_update",
+                    "document_id": doc.pk,
+                    "supported_workflows": [registry],
+                    **payload,
+                },
+            )
+            workflow_outbox.dispatch_pending()
+            return WorkflowTriggerOutbox.objects.last().workflow_id
+
+        first = dispatch()
+        self.assertEqual(dispatch(), first)
+        self.assertEqual(
+            self.started[0]["id_conflict_policy"],
+            WorkflowIDConflictPolicy.USE_EXISTING,
+        )
+        self.assertEqual(
+            self.started[0]["id_reuse_policy"],
+            WorkflowIDReusePolicy.ALLOW_DUPLICATE,
+        )
+        # Temporal joins the running workflow or starts a new run
+        self.assertEqual(len(self.started), 2)
+
+        doc.file = "documents/b/doc.pdf"
+        doc.save()
+        WorkflowTriggerOutbox.objects.filter(dispatched_at=None).delete()
+        replaced_file = dispatch()
+        registry["updated_at"] = "2026-02-01T00:00:00"
+        changed_registry = dispatch()
+        self.assertEqual(len({first, replaced_file, changed_registry}), 3)
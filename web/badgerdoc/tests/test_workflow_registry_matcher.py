@@ -0,0 +1,114 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from badgerdoc.models import workflow_registry
+
+
+class RegistryMatcherTestCase(TestCase):
+    def setUp(self):
+        workflow_registry.clear_registry_matcher()
+        self.addCleanup(workflow_registry.clear_registry_matcher)
+
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.pdf_only = self._registry("PdfOnly", document_types=["pdf"])
+        self.tagged = self._registry("Tagged", entity_tags=["ocr"])
+        self.page_scope = self._registry(
+            "PageScope", extraction_scope=["page"]
+        )
+        self._registry("Inactive", is_active=False)
+        self._registry("Manual", trigger="manual")
+        self._registry("OnUpdate", event_type="on_update")
+
+    def _registry(
+        self, name: str, **fields
+    ) -> workflow_registry.WorkflowRegistry:
+        return workflow_registry.WorkflowRegistry.objects.create(
+            **{
+                "created_by": self.owner,
+                "name": name,
+                "event_entity": "document",
+                "event_type": "on_create",
+                "temporal_workflow_type": name,
+                "temporal_queue": "queue",
+                "trigger": "automatic",
+                **fields,
+            }
+        )
+
+    def _match(self, **kwargs) -> list[str]:
+        registries = workflow_registry.match_registries(
+            event_entity="document",
+            event_type="on_create",
+            trigger="automatic",
+            **kwargs,
+        )
+        return [registry.name for registry in registries]
+
+    def test_matches_document_types_tags_and_scope(self):
+        self.assertEqual(
+            self._match(document_types=["pdf"], entity_tags=[]),
+            ["PageScope", "PdfOnly"],
+        )
+        self.assertEqual(
+            self._match(document_types=["png"], entity_tags=["ocr", "x"]),
+            ["PageScope", "Tagged"],
+        )
+        self.assertEqual(
+            self._match(entity_tags=None),
+            ["PageScope", "Tagged", "PdfOnly"],
+        )
+        self.assertEqual(
+            self._match(document_types=["pdf"], extraction_scope=["page"]),
+            ["PageScope"],
+        )
+        self.assertEqual(
+            [
+                registry.name
+                for registry in workflow_registry.match_registries(
+                    event_type="on_update"
+                )
+            ],
+            ["OnUpdate"],
+        )
+
+    def test_index_is_reused_until_a_registry_changes(self):
+        self._match(document_types=["pdf"])
+
+        with self.assertNumQueries(0):
+            self._match(document_types=["png"], entity_tags=["ocr"])
+
+        self.pdf_only.document_types = ["png"]
+        self.pdf_only.save()
+
+        self.assertIn("PdfOnly", self._match(document_types=["png"]))
+
+    @override_settings(BADGERDOC_WORKFLOW_REGISTRY_CHECK_INTERVAL=0)
+    def test_changes_in_other_processes_rebuild_the_index(self):
+        self._match()
+
+        # Only the version of the registry table is read
+        with self.assertNumQueries(1):
+            self._match()
+
+        # Other processes do not run the signal handlers of this one
+        with patch.object(
+            workflow_registry, "clear_registry_matcher"
+        ) as clear:
+            self.tagged.delete()
+            self.pdf_only.is_active = False
+            self.pdf_only.save()
+        clear.assert_called()
+
+        with self.assertNumQueries(2):
+            self.assertEqual(self._match(entity_tags=None), ["PageScope"])
+
+    @override_settings(BADGERDOC_WORKFLOW_REGISTRY_CACHE_TTL=0)
+    def test_index_expires(self):
+        self._match()
+
+        with self.assertNumQueries(2):
+            self._match()
@@ -1,18 +1,78 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Any
 from urllib.parse import urlencode
 
 from django.core.paginator import Paginator
+from django.db.models import Q
 from rest_framework import serializers
 from rest_framework.request import Request
 
 
-def badgerdoc_form_pagination(request: Request, queryset: Any) -> Any:
-    page = request.GET.get("page", 1)
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+@dataclass
+class UncountedPage:
+    """Page of a listing requested with ``count=false``.
+
+    Mirrors the parts of Django's ``Page`` used by the views, without the
+    ``COUNT(*)`` query: one extra row is fetched to tell if a next page
+    exists.
+    """
+
+    object_list: list[Any]
+    number: int
+    _has_next: bool
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self.number > 1
+
+    def next_page_number(self) -> int:
+        return self.number + 1
+
+    def previous_page_number(self) -> int:
+        return self.number - 1
+
+
+def _page_size(request: Request) -> int:
     try:
         page_size = int(request.GET.get("page_size", 20))
     except (ValueError, TypeError):
         page_size = 20
-    page_size = min(page_size, 100)
+    return max(min(page_size, 100), 1)
+
+
+def _count_requested(request: Request) -> bool:
+    return request.GET.get("count", "true").lower() not in ("false", "0")
+
+
+def badgerdoc_form_pagination(request: Request, queryset: Any) -> Any:
+    page = request.GET.get("page", 1)
+    page_size = _page_size(request)
+
+    if not _count_requested(request):
+        try:
+            number = max(int(page), 1)
+        except (ValueError, TypeError):
+            number = 1
+        offset = (number - 1) * page_size
+        rows = list(queryset[offset : offset + page_size + 1])
+        return UncountedPage(
+            rows[:page_size], number, _has_next=len(rows) > page_size
+        )
 
     paginator = Paginator(queryset, page_size)
     page_obj = paginator.get_page(page)
@@ -20,6 +80,65 @@ def badgerdoc_form_pagination(request: Request, queryset: Any) -> Any:
     return page_obj
 
 
+def badgerdoc_page_count(page_obj: Any) -> int | None:
+    """Total number of items, None for pages requested without count."""
+    if isinstance(page_obj, UncountedPage):
+        return None
+    return page_obj.paginator.count
+
+
+def badgerdoc_cursor_requested(request: Request) -> bool:
+    return "cursor" in request.GET
+
+
+def _encode_cursor(position: datetime, pk: int) -> str:
+    raw = json.dumps([position.isoformat(), pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        position, pk = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(position), int(pk)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def badgerdoc_cursor_pagination(
+    request: Request, queryset: Any, field: str = "updated_at"
+) -> tuple[list[Any], str | None]:
+    """Keyset pagination over ``(field, id)`` in descending order.
+
+    The ``cursor`` query parameter holds the position of the last item of
+    the previous page (empty for the first page), so every page is an
+    index range scan instead of an ever growing OFFSET, and no count is
+    run. Returns the items of the page and the URL of the next one.
+    """
+    page_size = _page_size(request)
+    cursor = request.GET.get("cursor", "")
+
+    queryset = queryset.order_by(f"-{field}", "-id")
+    if cursor:
+        position, pk = _decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(**{f"{field}__lt": position})
+            | Q(**{field: position, "id__lt": pk})
+        )
+
+    rows = list(queryset[: page_size + 1])
+    items = rows[:page_size]
+
+    next_url = None
+    if len(rows) > page_size:
+        last = items[-1]
+        params = request.GET.copy()
+        params.pop("page", None)
+        params["cursor"] = _encode_cursor(getattr(last, field), last.pk)
+        next_url = f"?{urlencode(params)}"
+
+    return items, next_url
+
+
 def badgerdoc_paginate(
     request: Request, page_obj: Any
 ) -> tuple[str | None, str | None]:
@@ -52,7 +171,7 @@ def build_paginated_serializer(
     paginated_ref = f"Paginated{ref_base}"
 
     class PaginatedSerializer(serializers.Serializer):
-        count = serializers.IntegerField()
+        count = serializers.IntegerField(allow_null=True)
         next = serializers.CharField(allow_null=True, required=False)
         previous = serializers.CharField(allow_null=True, required=False)
         results = item_serializer(many=True)
@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.exceptions import FieldDoesNotExist
+from drf_yasg import openapi
+from rest_framework import serializers
+from rest_framework.request import Request
+
+from badgerdoc.models._compression import CompressibleTextField
+
+FIELDS_PARAMETER = openapi.Parameter(
+    "fields",
+    openapi.IN_QUERY,
+    description=(
+        "Comma-separated fields to return, such as 'id,page_number'. "
+        "Fields left out are not read from the database."
+    ),
+    type=openapi.TYPE_STRING,
+    required=False,
+)
+EXCLUDE_PARAMETER = openapi.Parameter(
+    "exclude",
+    openapi.IN_QUERY,
+    description=(
+        "Comma-separated fields to leave out, such as 'content'. "
+        "Cannot be combined with 'fields'."
+    ),
+    type=openapi.TYPE_STRING,
+    required=False,
+)
+
+
+class InvalidProjection(ValueError):
+    """Raised for unknown fields in the ``fields`` or ``exclude`` parameters."""
+
+
+@dataclass
+class Projection:
+    """Serializer fields requested by the ``fields`` / ``exclude`` parameters."""
+
+    fields: list[str]
+    omitted: list[str]
+
+
+def _split(value: str) -> list[str]:
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def badgerdoc_projection(
+    request: Request, serializer_class: type[serializers.Serializer]
+) -> Projection | None:
+    """Fields selected for the response, None when all were requested."""
+    requested = _split(request.GET.get("fields", ""))
+    excluded = _split(request.GET.get("exclude", ""))
+    if not requested and not excluded:
+        return None
+    if requested and excluded:
+        raise InvalidProjection("Use either 'fields' or 'exclude', not both")
+
+    available = list(serializer_class().fields)
+    unknown = [name for name in requested + excluded if name not in available]
+    if unknown:
+        raise InvalidProjection(
+            f"Unknown fields {unknown}, available fields are {available}"
+        )
+
+    if requested:
+        fields = [name for name in available if name in requested]
+    else:
+        fields = [name for name in available if name not in excluded]
+    return Projection(
+        fields=fields,
+        omitted=[name for name in available if name not in fields],
+    )
+
+
+def badgerdoc_project_queryset(
+    queryset: Any,
+    serializer_class: type[serializers.Serializer],
+    projection: Projection | None,
+) -> Any:
+    """Defer the model columns behind the omitted serializer fields."""
+    if projection is None:
+        return queryset
+
+    model = queryset.model
+    serializer_fields = serializer_class().fields
+    deferred = []
+    for name in projection.omitted:
+        source = serializer_fields[name].source
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            continue
+        # Relations may be traversed by select_related, keep them loaded
+        if model_field.primary_key or model_field.is_relation:
+            continue
+        deferred.append(source)
+        # A compressed value is useless without the column it replaces
+        if isinstance(model_field, CompressibleTextField):
+            deferred.append(model_field.compressed_field)
+
+    return queryset.defer(*deferred) if deferred else queryset
+
+
+def badgerdoc_projected_data(
+    serializer_class: type[serializers.Serializer],
+    instances: Any,
+    projection: Projection | None,
+) -> list[dict[str, Any]]:
+    serializer = serializer_class(instances, many=True)
+    if projection is not None:
+        for name in projection.omitted:
+            serializer.child.fields.pop(name)
+    return serializer.data
@@ -1,11 +1,14 @@
 import logging
+from typing import Any
 
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import serializers, status
+from rest_framework.decorators import api_view, permission_classes
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
@@ -13,10 +16,12 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from badgerdoc import permissions
-from badgerdoc.models import agent_log, document
+from badgerdoc.models import agent_log, document, task
 
 logger = logging.getLogger(__name__)
 
+BULK_CREATE_MAX_LOGS = 500
+
 
 class AgentLogPagination(PageNumberPagination):
     page_size = 20
@@ -63,6 +68,76 @@ class AgentLogSerializer(serializers.ModelSerializer):
         read_only_fields = ("id", "created_at")
 
 
+class BulkAgentLogItemSerializer(serializers.Serializer):
+    document = serializers.IntegerField()
+    task = serializers.IntegerField(required=False, allow_null=True)
+    level = serializers.ChoiceField(
+        choices=agent_log.AgentLog.Level.choices,
+        default=agent_log.AgentLog.Level.INFO,
+    )
+    source = serializers.ChoiceField(choices=agent_log.AgentLog.Source.choices)
+    log = LogPayloadSerializer()
+    # Time the line was logged at, defaults to the time it is stored
+    created_at = serializers.DateTimeField(required=False)
+
+
+class BulkAgentLogCreateSerializer(serializers.Serializer):
+    logs = BulkAgentLogItemSerializer(
+        many=True, allow_empty=False, max_length=BULK_CREATE_MAX_LOGS
+    )
+
+    def validate_logs(
+        self, value: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        # One query per model for the whole batch, instead of one per entry
+        document_ids = {item["document"] for item in value}
+        found = set(
+            document.Document.objects.filter(id__in=document_ids).values_list(
+                "id", flat=True
+            )
+        )
+        if document_ids - found:
+            raise serializers.ValidationError(
+                f"Documents not found: {sorted(document_ids - found)}"
+            )
+
+        task_ids = {item["task"] for item in value if item.get("task")}
+        found = set(
+            task.Task.objects.filter(id__in=task_ids).values_list(
+                "id", flat=True
+            )
+        )
+        if task_ids - found:
+            raise serializers.ValidationError(
+                f"Tasks not found: {sorted(task_ids - found)}"
+            )
+        return value
+
+    def create(self, validated_data: dict[str, Any]) -> list[Any]:
+        items = validated_data["logs"]
+        # bulk_create skips AgentLog.save, so the paths are set here
+        paths = {
+            document_id: agent_log.build_document_path(document_id)
+            for document_id in {item["document"] for item in items}
+        }
+        now = timezone.now()
+        with transaction.atomic():
+            return agent_log.AgentLog.objects.bulk_create(
+                [
+                    agent_log.AgentLog(
+                        document_id=item["document"],
+                        task_id=item.get("task"),
+                        level=item["level"],
+                        source=item["source"],
+                        log=item["log"],
+                        path=paths[item["document"]],
+                        created_at=item.get("created_at") or now,
+                    )
+                    for item in items
+                ]
+            )
+
+
 class AgentLogView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -193,3 +268,51 @@ class AgentLogView(APIView):
                 {"error": "Failed to create agent log."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+@swagger_auto_schema(
+    method="post",
+    operation_summary="Bulk Create Agent Logs",
+    operation_description=(
+        "Write a batch of log entries in one transaction, up to "
+        f"{BULK_CREATE_MAX_LOGS}. Entries are stored in the order given. "
+        "Requires staff or `can_write_log` permission."
+    ),
+    tags=["Agent"],
+    request_body=BulkAgentLogCreateSerializer,
+    responses={
+        201: openapi.Response(
+            description="Log entries created successfully",
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "created": openapi.Schema(type=openapi.TYPE_INTEGER),
+                },
+            ),
+        ),
+        400: "Bad Request - Invalid data",
+        403: "Forbidden - Insufficient permissions",
+        500: "Internal Server Error",
+    },
+)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def bulk_create_agent_logs(request: Request) -> Response:
+    if not permissions.can_write_log(request.user):
+        return Response(
+            {"error": "You do not have permission to write logs."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    try:
+        serializer = BulkAgentLogCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        logs = serializer.save()
+        return Response({"created": len(logs)}, status=status.HTTP_201_CREATED)
+    except serializers.ValidationError:
+        raise
+    except Exception:
+        logger.exception("Failed to create agent logs")
+        return Response(
+            {"error": "Failed to create agent logs."},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
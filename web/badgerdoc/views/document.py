@@ -1,13 +1,22 @@
 import json
 import logging
+import os
+import re
 import urllib.error
 import urllib.parse
 import urllib.request
 from typing import Any
 
 import django_filters
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
 from django.db.models import Q
-from django.http import HttpResponse
+from django.http import (
+    HttpResponse,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from PIL import Image
@@ -16,6 +25,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.utils import encoders
 from rest_framework.views import APIView
 
 from badgerdoc import chunk_xpath, permissions
@@ -24,6 +34,29 @@ from badgerdoc.views import _pagination
 
 logger = logging.getLogger(__name__)
 
+# Workers write derived files (e.g. DZI tiles) straight to object storage
+# under "<prefix>/<parent_document_id>/" and register them in bulk.
+BULK_STORAGE_PREFIX = "derived"
+BULK_CREATE_MAX_DOCUMENTS = 1000
+
+RENDITIONS_BY_PAGE_MAX_DOCUMENTS = 100
+
+# Bounds the tree export, parent links are not guaranteed to be acyclic
+TREE_EXPORT_MAX_DEPTH = 16
+TREE_EXPORT_CHUNK_SIZE = 500
+
+# DZI written in "manifest" layout keeps its tiles under
+# "derived/<rendition_id>/<run_id>/" without a document per tile. Its DZI
+# name is "<rendition_id>-<run_id>", so tile URLs map to storage keys.
+MANIFEST_TILES_PREFIX_RE = re.compile(
+    rf"^{BULK_STORAGE_PREFIX}/(?P<rendition_id>\d+)/(?P<run_id>[0-9a-f]{{32}})$"
+)
+MANIFEST_DZI_NAME_RE = re.compile(
+    r"^(?P<rendition_id>\d+)-(?P<run_id>[0-9a-f]{32})$"
+)
+DZI_TILE_POSITION_RE = re.compile(r"^\d+_\d+$")
+STORAGE_ACCEL_REDIRECT_PREFIX = "/_storage/"
+
 
 class DocumentFilter(django_filters.FilterSet):
     uploaded_by = django_filters.NumberFilter(field_name="uploaded_by")
@@ -176,6 +209,78 @@ PaginatedDocumentSerializer = _pagination.build_paginated_serializer(
 )
 
 
+def _name_from_storage_key(key: str) -> str:
+    return os.path.splitext(os.path.basename(key))[0]
+
+
+class BulkDocumentItemSerializer(serializers.Serializer):
+    name = serializers.CharField(
+        max_length=1024, required=False, allow_blank=True
+    )
+    file = serializers.CharField(
+        max_length=document.Document._meta.get_field("file").max_length,
+        help_text="Object storage key of an already uploaded file",
+    )
+    extension = serializers.CharField(
+        required=False, allow_blank=True, max_length=8
+    )
+    metadata = serializers.JSONField(required=False, allow_null=True)
+    tags = serializers.ListField(
+        child=serializers.CharField(), required=False, allow_null=True
+    )
+
+
+class BulkDocumentCreateSerializer(serializers.Serializer):
+    parent_document_id = serializers.PrimaryKeyRelatedField(
+        queryset=document.Document.objects.all()
+    )
+    documents = BulkDocumentItemSerializer(
+        many=True, allow_empty=False, max_length=BULK_CREATE_MAX_DOCUMENTS
+    )
+
+    def validate_parent_document_id(
+        self, value: document.Document
+    ) -> document.Document:
+        request = self.context.get("request")
+        if request and value.uploaded_by != request.user:
+            raise serializers.ValidationError(
+                "You can only set a parent document that you own."
+            )
+        return value
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        prefix = f"{BULK_STORAGE_PREFIX}/{attrs['parent_document_id'].id}/"
+        for item in attrs["documents"]:
+            key = item["file"]
+            if not key.startswith(prefix) or ".." in key.split("/"):
+                raise serializers.ValidationError(
+                    {"documents": f"File {key} must be stored under {prefix}"}
+                )
+        return attrs
+
+    def create(self, validated_data: dict[str, Any]) -> list[Any]:
+        parent = validated_data["parent_document_id"]
+        user = self.context["request"].user
+        # bulk_create does not send post_save, so registering derived files
+        # does not trigger document workflows.
+        with transaction.atomic():
+            return document.Document.objects.bulk_create(
+                [
+                    document.Document(
+                        name=item.get("name")
+                        or _name_from_storage_key(item["file"]),
+                        file=item["file"],
+                        extension=item.get("extension"),
+                        metadata=item.get("metadata"),
+                        tags=item.get("tags"),
+                        parent_document=parent,
+                        uploaded_by=user,
+                    )
+                    for item in validated_data["documents"]
+                ]
+            )
+
+
 def get_document_queryset(user: Any) -> Any:
     queryset = document.Document.objects.select_related("uploaded_by").all()
 
@@ -256,6 +361,27 @@ def get_document_queryset(user: Any) -> Any:
             type=openapi.TYPE_INTEGER,
             required=False,
         ),
+        openapi.Parameter(
+            "count",
+            openapi.IN_QUERY,
+            description=(
+                "Set to false to skip counting the documents; 'count' is "
+                "then null and 'next' is set while more pages exist"
+            ),
+            type=openapi.TYPE_BOOLEAN,
+            required=False,
+        ),
+        openapi.Parameter(
+            "cursor",
+            openapi.IN_QUERY,
+            description=(
+                "Keyset pagination on (updated_at, id): pass an empty "
+                "cursor for the first page, then follow 'next'. "
+                "Ignores 'page' and does not count the documents"
+            ),
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
         openapi.Parameter(
             "metadata",
             openapi.IN_QUERY,
@@ -288,6 +414,20 @@ def list_documents(request: Request) -> Response:
         filterset = DocumentFilter(request.GET, queryset=queryset)
         queryset = filterset.qs
 
+        if _pagination.badgerdoc_cursor_requested(request):
+            items, next_url = _pagination.badgerdoc_cursor_pagination(
+                request, queryset
+            )
+            return Response(
+                {
+                    "count": None,
+                    "next": next_url,
+                    "previous": None,
+                    "results": DocumentSerializer(items, many=True).data,
+                },
+                status=status.HTTP_200_OK,
+            )
+
         page_obj = _pagination.badgerdoc_form_pagination(request, queryset)
 
         serializer = DocumentSerializer(page_obj, many=True)
@@ -298,7 +438,7 @@ def list_documents(request: Request) -> Response:
 
         return Response(
             {
-                "count": page_obj.paginator.count,
+                "count": _pagination.badgerdoc_page_count(page_obj),
                 "next": next_url,
                 "previous": previous_url,
                 "results": serializer.data,
@@ -306,6 +446,8 @@ def list_documents(request: Request) -> Response:
             status=status.HTTP_200_OK,
         )
 
+    except _pagination.InvalidCursor as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         logger.exception("Failed to list documents")
         return Response(
@@ -409,6 +551,160 @@ def create_document(request: Request) -> Response:
         )
 
 
+@swagger_auto_schema(
+    method="post",
+    operation_description=(
+        "Register files already written to object storage as child documents "
+        f"of one parent, in a single request (up to {BULK_CREATE_MAX_DOCUMENTS}). "
+        f"Storage keys must start with '{BULK_STORAGE_PREFIX}/<parent_document_id>/'. "
+        "Document workflows are not triggered for these documents."
+    ),
+    operation_summary="Bulk Register Documents",
+    tags=["Document"],
+    request_body=BulkDocumentCreateSerializer,
+    responses={
+        201: openapi.Response(
+            description="Documents registered successfully",
+            schema=serializers.ListSerializer(child=DocumentSerializer()),
+        ),
+        400: "Bad Request - Invalid data",
+        401: "Unauthorized - Authentication required",
+        500: "Internal Server Error - Failed to register documents",
+    },
+)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def bulk_create_documents(request: Request) -> Response:
+    try:
+        serializer = BulkDocumentCreateSerializer(
+            data=request.data, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+        documents = serializer.save()
+
+        return Response(
+            {"results": DocumentSerializer(documents, many=True).data},
+            status=status.HTTP_201_CREATED,
+        )
+    except serializers.ValidationError:
+        raise
+    except Exception as e:
+        logger.exception("Failed to register documents")
+        return Response(
+            {"error": f"Failed to register documents: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+def _iter_document_tree(
+    user: Any, document_id: int, params: Any, depth: int
+) -> Any:
+    """Yield NDJSON lines of the descendants of a document, level by level.
+
+    Every level is selected with a subquery on the previous one, so the
+    ids of large levels (e.g. DZI tiles) are never loaded into Python.
+    """
+    visible = get_document_queryset(user)
+    level = visible.filter(parent_document=document_id)
+    for _ in range(depth):
+        if not level.exists():
+            break
+        matching = DocumentFilter(params, queryset=level).qs.order_by("id")
+        for item in matching.iterator(chunk_size=TREE_EXPORT_CHUNK_SIZE):
+            data = DocumentSerializer(item).data
+            yield json.dumps(data, cls=encoders.JSONEncoder) + "\n"
+        level = visible.filter(parent_document__in=level.values("id"))
+
+
+@swagger_auto_schema(
+    method="get",
+    operation_description=(
+        "Stream every descendant of a document as newline-delimited JSON, "
+        "one document per line, parents before their children. "
+        "Replaces walking the paginated document list level by level."
+    ),
+    operation_summary="Export Document Tree",
+    tags=["Document"],
+    manual_parameters=[
+        openapi.Parameter(
+            "document_id",
+            openapi.IN_PATH,
+            description="ID of the root document",
+            type=openapi.TYPE_INTEGER,
+            required=True,
+        ),
+        openapi.Parameter(
+            "depth",
+            openapi.IN_QUERY,
+            description=(
+                "Number of levels to export, 1 for direct children only "
+                f"(default and max: {TREE_EXPORT_MAX_DEPTH})"
+            ),
+            type=openapi.TYPE_INTEGER,
+            required=False,
+        ),
+        openapi.Parameter(
+            "tags",
+            openapi.IN_QUERY,
+            description=(
+                "Only export documents with at least one of the tags "
+                "(comma-separated list); the tree is still walked fully"
+            ),
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+        openapi.Parameter(
+            "metadata",
+            openapi.IN_QUERY,
+            description=(
+                "Only export documents matching the metadata filter, "
+                "same notation as the document list"
+            ),
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+    ],
+    responses={
+        200: openapi.Response(
+            description="Newline-delimited JSON of documents",
+            schema=DocumentSerializer(),
+        ),
+        400: "Bad Request - Invalid depth",
+        404: "Not Found - Document does not exist",
+        401: "Unauthorized - Authentication required",
+    },
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def export_document_tree(request: Request, document_id: int) -> Any:
+    if not get_document_queryset(request.user).filter(id=document_id).exists():
+        return Response(
+            {"error": f"Document with id {document_id} not found."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    try:
+        depth = int(request.GET.get("depth", TREE_EXPORT_MAX_DEPTH))
+    except (TypeError, ValueError):
+        depth = 0
+    if not 1 <= depth <= TREE_EXPORT_MAX_DEPTH:
+        return Response(
+            {
+                "error": (
+                    f"depth must be between 1 and {TREE_EXPORT_MAX_DEPTH}"
+                )
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    params = request.GET.copy()
+    params.pop("parent_document_id", None)
+    return StreamingHttpResponse(
+        _iter_document_tree(request.user, document_id, params, depth),
+        content_type="application/x-ndjson",
+    )
+
+
 @swagger_auto_schema(
     method="get",
     operation_description="Get document renditions by parent document ID. Returns child documents with 'rendition' tag.",
@@ -527,16 +823,112 @@ def get_document_rendition_page(
         )
 
 
+@swagger_auto_schema(
+    method="get",
+    operation_description=(
+        "Get the renditions of all pages of several documents in one call. "
+        "Results are keyed by document ID, then by page number."
+    ),
+    operation_summary="Get Renditions By Page",
+    tags=["Document"],
+    manual_parameters=[
+        openapi.Parameter(
+            "document_ids",
+            openapi.IN_QUERY,
+            description=(
+                "Comma-separated list of parent document IDs "
+                f"(max: {RENDITIONS_BY_PAGE_MAX_DOCUMENTS})"
+            ),
+            type=openapi.TYPE_STRING,
+            required=True,
+        ),
+    ],
+    responses={
+        200: openapi.Response(
+            description=(
+                '{"results": {"<document_id>": {"<page>": <document>}}}'
+            ),
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "results": openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        additional_properties=openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            additional_properties=openapi.Schema(
+                                type=openapi.TYPE_OBJECT
+                            ),
+                        ),
+                    )
+                },
+            ),
+        ),
+        400: "Bad Request - Invalid or too many document IDs",
+        404: "Not Found - Document does not exist",
+        401: "Unauthorized - Authentication required",
+    },
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def get_renditions_by_page(request: Request) -> Response:
+    try:
+        document_ids = sorted(
+            {
+                int(value)
+                for value in request.GET.get("document_ids", "").split(",")
+                if value.strip()
+            }
+        )
+    except ValueError:
+        return Response(
+            {"error": "document_ids must be a comma-separated list of IDs"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if not 1 <= len(document_ids) <= RENDITIONS_BY_PAGE_MAX_DOCUMENTS:
+        return Response(
+            {
+                "error": (
+                    "document_ids must list between 1 and "
+                    f"{RENDITIONS_BY_PAGE_MAX_DOCUMENTS} documents"
+                )
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        visible_ids = set(
+            get_document_queryset(request.user)
+            .filter(id__in=document_ids)
+            .values_list("id", flat=True)
+        )
+        missing_ids = [i for i in document_ids if i not in visible_ids]
+        if missing_ids:
+            return Response(
+                {"error": f"Documents with ids {missing_ids} not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        renditions = document.find_renditions_by_page(document_ids)
+        results = {
+            str(document_id): {
+                str(page): DocumentSerializer(rendition).data
+                for page, rendition in sorted(pages.items())
+            }
+            for document_id, pages in renditions.items()
+        }
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        logger.exception("Failed to get renditions by page")
+        return Response(
+            {"error": f"Failed to get renditions by page: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
 def _find_rendition_by_page(document_id: int, page: int):
     """Find rendition document by document_id and page number"""
-    renditions = document.Document.objects.filter(
-        parent_document=document_id
-    ).filter(tags__contains=["rendition"])
-
-    for rend in renditions:
-        if rend.metadata and rend.metadata.get("page") == page:
-            return rend
-    return None
+    return document.find_rendition(document_id, page)
 
 
 @swagger_auto_schema(
@@ -608,7 +1000,8 @@ def get_document_dzi(request: Request, document_id: int) -> Response:
 
             page = dzi_doc.metadata.get("page")
             document_name = document_.name or f"document_{document_id}"
-            dzi_url = f"/badgerdoc/document/{document_id}/dzi/page/{page}/{document_name}/{document_name}.dzi"
+            dzi_name = _manifest_dzi_name(dzi_doc) or document_name
+            dzi_url = f"/badgerdoc/document/{document_id}/dzi/page/{page}/{document_name}/{dzi_name}.dzi"
             dzi_urls.append(dzi_url)
 
         return Response(dzi_urls, status=status.HTTP_200_OK)
@@ -621,6 +1014,32 @@ def get_document_dzi(request: Request, document_id: int) -> Response:
         )
 
 
+def _manifest_dzi_name(dzi_document: document.Document) -> str | None:
+    match = MANIFEST_TILES_PREFIX_RE.match(
+        (dzi_document.metadata or {}).get("tiles_prefix") or ""
+    )
+    if match is None:
+        return None
+    return f"{match['rendition_id']}-{match['run_id']}"
+
+
+def _storage_redirect(key: str) -> HttpResponse:
+    """Send the client to an object storage file without proxying it."""
+    url = default_storage.url(key)
+    if settings.BADGERDOC_STORAGE_REDIRECT != "accel":
+        return HttpResponseRedirect(url)
+
+    # nginx serves the file from an internal location, which is needed when
+    # the object storage is not reachable from the browser.
+    parsed = urllib.parse.urlsplit(url)
+    location = STORAGE_ACCEL_REDIRECT_PREFIX + parsed.path.lstrip("/")
+    if parsed.query:
+        location = f"{location}?{parsed.query}"
+    response = HttpResponse()
+    response["X-Accel-Redirect"] = location
+    return response
+
+
 @swagger_auto_schema(
     method="get",
     operation_description="Get DZI XML content for a specific page of a document.",
@@ -728,7 +1147,11 @@ def get_document_dzi_content(
 
 @swagger_auto_schema(
     method="get",
-    operation_description="Get DZI PNG tile content for a specific layer and position.",
+    operation_description=(
+        "Get DZI PNG tile content for a specific layer and position. Tiles of "
+        "a DZI stored in manifest layout are answered with a redirect to "
+        "object storage instead of the content."
+    ),
     operation_summary="Get DZI PNG Tile",
     tags=["Document"],
     manual_parameters=[
@@ -782,6 +1205,7 @@ def get_document_dzi_content(
                 type=openapi.TYPE_STRING, format=openapi.FORMAT_BINARY
             ),
         ),
+        302: "Found - Redirect to the tile in object storage",
         404: "Not Found - Tile not found",
         401: "Unauthorized - Authentication required",
         500: "Internal Server Error - Failed to retrieve tile",
@@ -794,11 +1218,22 @@ def get_document_dzi_tile(
     document_id: int,
     page: int,
     name: str,  # pylint: disable=unused-argument
-    dzi_name: str,  # pylint: disable=unused-argument
+    dzi_name: str,
     layer: int,
     position: str,
 ) -> HttpResponse:
     try:
+        manifest_match = MANIFEST_DZI_NAME_RE.match(dzi_name)
+        if manifest_match:
+            if not DZI_TILE_POSITION_RE.match(position):
+                return HttpResponse(
+                    "Tile not found", status=404, content_type="text/plain"
+                )
+            return _storage_redirect(
+                f"{BULK_STORAGE_PREFIX}/{manifest_match['rendition_id']}"
+                f"/{manifest_match['run_id']}/{layer}/{position}.png"
+            )
+
         rendition = _find_rendition_by_page(document_id, page)
         if not rendition:
             return HttpResponse(
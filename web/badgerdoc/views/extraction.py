@@ -294,7 +294,7 @@ def list_extractions(request: Request) -> Response:
 
         return Response(
             {
-                "count": page_obj.paginator.count,
+                "count": _pagination.badgerdoc_page_count(page_obj),
                 "next": next_url,
                 "previous": previous_url,
                 "results": serializer.data,
@@ -1,8 +1,11 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import django_filters
-from django.db.models import Max, Q
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -18,7 +21,7 @@ from rest_framework.views import APIView
 
 from badgerdoc import permissions
 from badgerdoc.models import document, extraction, extraction_page
-from badgerdoc.views import _pagination
+from badgerdoc.views import _pagination, _projection
 from badgerdoc.views.extraction import (
     ExtractionFilter,
     get_extraction_queryset,
@@ -26,6 +29,14 @@ from badgerdoc.views.extraction import (
 
 logger = logging.getLogger(__name__)
 
+BULK_CREATE_MAX_PAGES = 100
+# Pages can reference hOCR stored by workflows (see build_perm_path of
+# badgerdoc_common.storage) instead of carrying the content. Only hOCR
+# stored under the prefix of the extraction's document can be referenced.
+BULK_STORAGE_PREFIX = "data/workflows/documents/{document_id}/"
+
+_validation_pool: ThreadPoolExecutor | None = None
+
 
 class ExtractionPageFilter(django_filters.FilterSet):
     extraction_id = django_filters.NumberFilter(field_name="extraction_id")
@@ -82,14 +93,26 @@ def validate_probable_hocr(content: str):
             raise ValueError(report.format("text"))
 
 
+def _validate_storage_key(value: str, document_id: int) -> None:
+    prefix = BULK_STORAGE_PREFIX.format(document_id=document_id)
+    if not value.startswith(prefix) or ".." in value.split("/"):
+        raise serializers.ValidationError(
+            f"Storage key must be under '{prefix}'"
+        )
+
+
 class CreateExtractionPageSerializer(serializers.ModelSerializer):
     extraction_id = serializers.PrimaryKeyRelatedField(
         source="extraction", queryset=extraction.Extraction.objects.all()
     )
+    storage_key = serializers.CharField(
+        required=False, write_only=True, max_length=1024
+    )
 
     class Meta:
         model = extraction_page.ExtractionPage
-        fields = ["extraction_id", "page_number", "content"]
+        fields = ["extraction_id", "page_number", "content", "storage_key"]
+        extra_kwargs = {"content": {"required": False}}
 
     def validate(self, attrs: dict) -> dict:
         request = self.context.get("request")
@@ -105,13 +128,23 @@ class CreateExtractionPageSerializer(serializers.ModelSerializer):
                 "Extraction has been stopped, no new modifications are allowed."
             )
 
-        try:
-            validate_probable_hocr(attrs["content"])
-        except ValueError as e:
+        if ("content" in attrs) == ("storage_key" in attrs):
             raise serializers.ValidationError(
-                f"Extraction page HTML content does not align with hOCR spec: {e}"
+                "Exactly one of 'content' and 'storage_key' is required"
+            )
+        if "storage_key" in attrs:
+            _validate_storage_key(
+                attrs["storage_key"], extraction_.document_id
             )
 
+        # hOCR referenced by a storage key is read here, close to the
+        # data, instead of travelling through the worker and the request
+        try:
+            attrs["content"] = _load_and_validate_page(attrs)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        attrs.pop("storage_key", None)
+
         return attrs
 
 
@@ -151,6 +184,162 @@ class UpdateExtractionPageSerializer(serializers.Serializer):
         return attrs
 
 
+def _get_validation_pool() -> ThreadPoolExecutor:
+    global _validation_pool  # pylint: disable=global-statement
+    if _validation_pool is None:
+        _validation_pool = ThreadPoolExecutor(
+            max_workers=settings.BADGERDOC_HOCR_VALIDATION_WORKERS,
+            thread_name_prefix="hocr-validation",
+        )
+    return _validation_pool
+
+
+def _load_and_validate_page(page: dict[str, Any]) -> str:
+    content = page.get("content")
+    if content is None:
+        try:
+            with default_storage.open(page["storage_key"], "rb") as file:
+                content = file.read().decode("utf-8")
+        except Exception as e:
+            raise ValueError(
+                f"Failed to read {page['storage_key']}: {e}"
+            ) from e
+    else:
+        content = str(content)
+
+    try:
+        validate_probable_hocr(content)
+    except ValueError as e:
+        raise ValueError(
+            f"Extraction page HTML content does not align with hOCR spec: {e}"
+        ) from e
+    return content
+
+
+class BulkExtractionPageItemSerializer(serializers.Serializer):
+    page_number = serializers.IntegerField(min_value=1)
+    content = serializers.CharField(
+        required=False, allow_blank=True, trim_whitespace=False
+    )
+    storage_key = serializers.CharField(required=False, max_length=1024)
+
+    def validate(self, attrs: dict) -> dict:
+        if ("content" in attrs) == ("storage_key" in attrs):
+            raise serializers.ValidationError(
+                "Exactly one of 'content' and 'storage_key' is required"
+            )
+        return attrs
+
+
+class BulkCreateExtractionPageSerializer(serializers.Serializer):
+    extraction_id = serializers.PrimaryKeyRelatedField(
+        source="extraction", queryset=extraction.Extraction.objects.all()
+    )
+    pages = BulkExtractionPageItemSerializer(
+        many=True, allow_empty=False, max_length=BULK_CREATE_MAX_PAGES
+    )
+
+    def validate(self, attrs: dict) -> dict:
+        request = self.context.get("request")
+        extraction_: extraction.Extraction = attrs["extraction"]
+
+        if request and extraction_.created_by != request.user:
+            raise PermissionDenied(
+                "Only the extraction creator can create pages for this extraction"
+            )
+
+        if not extraction_.is_in_progress():
+            raise serializers.ValidationError(
+                "Extraction has been stopped, no new modifications are allowed."
+            )
+
+        pages = attrs["pages"]
+        page_numbers = [page["page_number"] for page in pages]
+        if len(set(page_numbers)) != len(page_numbers):
+            raise serializers.ValidationError(
+                "Page numbers must be unique within the request"
+            )
+        errors = {}
+        for page in pages:
+            if "storage_key" not in page:
+                continue
+            try:
+                _validate_storage_key(
+                    page["storage_key"], extraction_.document_id
+                )
+            except serializers.ValidationError as e:
+                errors[str(page["page_number"])] = e.detail
+        if errors:
+            raise serializers.ValidationError({"pages": errors})
+
+        # Pages that already exist are kept as they are and returned with
+        # the created ones, so a retried request does not fail on the pages
+        # its previous attempt created
+        existing = set(
+            extraction_page.ExtractionPage.objects.filter(
+                extraction=extraction_, page_number__in=page_numbers
+            ).values_list("page_number", flat=True)
+        )
+        pages = [page for page in pages if page["page_number"] not in existing]
+        attrs["pages"] = pages
+        attrs["page_numbers"] = page_numbers
+
+        # Reading from object storage and the hOCR spec check dominate the
+        # request, pages are processed concurrently
+        pool = _get_validation_pool()
+        futures = [
+            pool.submit(_load_and_validate_page, page) for page in pages
+        ]
+        for page, future in zip(pages, futures):
+            try:
+                page["content"] = future.result()
+            except ValueError as e:
+                errors[str(page["page_number"])] = str(e)
+        if errors:
+            raise serializers.ValidationError({"pages": errors})
+
+        return attrs
+
+    def create(self, validated_data: dict) -> list[Any]:
+        extraction_ = validated_data["extraction"]
+        with transaction.atomic():
+            created = extraction_page.ExtractionPage.objects.bulk_create(
+                [
+                    extraction_page.ExtractionPage(
+                        extraction=extraction_,
+                        page_number=page["page_number"],
+                        content=page["content"],
+                    )
+                    for page in validated_data["pages"]
+                ]
+            )
+            # bulk_create sends no post_save signals
+            extraction_page.refresh_current_pages(
+                extraction_.document_id,
+                [page.page_number for page in created],
+            )
+        return list(
+            extraction_page.ExtractionPage.objects.filter(
+                extraction=extraction_,
+                page_number__in=validated_data["page_numbers"],
+            )
+            .defer("content", "content_compressed")
+            .order_by("page_number")
+        )
+
+
+class BulkExtractionPageResultSerializer(ExtractionPageSerializer):
+    class Meta(ExtractionPageSerializer.Meta):
+        ref_name = "extraction_page.BulkExtractionPageResultSerializer"
+        fields = [
+            "id",
+            "extraction_id",
+            "page_number",
+            "created_at",
+            "updated_at",
+        ]
+
+
 PaginatedExtractionPageSerializer = _pagination.build_paginated_serializer(
     ExtractionPageSerializer
 )
@@ -160,10 +349,16 @@ class ExtractionPageView(APIView):
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
-        operation_description="Create a new extraction page for an extraction",
+        operation_description=(
+            "Create a new extraction page for an extraction. The hOCR is "
+            "given as 'content' or as a 'storage_key' of hOCR stored by a "
+            f"workflow under '{BULK_STORAGE_PREFIX}' of the extraction's "
+            "document, which is read by the API. Pages created from a storage key are returned without "
+            "their content."
+        ),
         operation_summary="Create Extraction Page",
         tags=["Extraction Page"],
-        request_body=ExtractionPageSerializer,
+        request_body=CreateExtractionPageSerializer,
         responses={
             201: openapi.Response(
                 description="Extraction page created successfully",
@@ -183,8 +378,13 @@ class ExtractionPageView(APIView):
             serializer.is_valid(raise_exception=True)
             page_obj = serializer.save()
 
+            result_serializer = (
+                BulkExtractionPageResultSerializer
+                if "storage_key" in serializer.initial_data
+                else ExtractionPageSerializer
+            )
             return Response(
-                ExtractionPageSerializer(page_obj).data,
+                result_serializer(page_obj).data,
                 status=status.HTTP_201_CREATED,
             )
         except PermissionDenied:
@@ -250,6 +450,92 @@ class ExtractionPageView(APIView):
             )
 
 
+@swagger_auto_schema(
+    method="post",
+    operation_description=(
+        "Create many pages of an extraction in one request. Every page "
+        "carries its hOCR 'content' or a 'storage_key' of hOCR stored by a "
+        f"workflow under '{BULK_STORAGE_PREFIX}' of the extraction's "
+        "document. Pages are validated concurrently and created in one "
+        "transaction: either all pages are created or none. Pages that "
+        "already exist are kept and returned with the created ones, so "
+        "a request can be retried. At most "
+        f"{BULK_CREATE_MAX_PAGES} pages."
+    ),
+    operation_summary="Bulk Create Extraction Pages",
+    tags=["Extraction Page"],
+    request_body=BulkCreateExtractionPageSerializer,
+    responses={
+        201: openapi.Response(
+            description="Extraction pages created successfully",
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "results": openapi.Schema(
+                        type=openapi.TYPE_ARRAY,
+                        items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                    )
+                },
+            ),
+        ),
+        400: "Bad Request - Invalid pages or stopped extraction",
+        401: "Unauthorized - Authentication required",
+        403: "Forbidden - Only the extraction creator can create pages for this extraction",
+    },
+)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def bulk_create_extraction_pages(request: Request) -> Response:
+    try:
+        serializer = BulkCreateExtractionPageSerializer(
+            data=request.data, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+        pages = serializer.save()
+
+        return Response(
+            {
+                "results": BulkExtractionPageResultSerializer(
+                    pages, many=True
+                ).data
+            },
+            status=status.HTTP_201_CREATED,
+        )
+    except PermissionDenied:
+        raise
+    except serializers.ValidationError as e:
+        logger.exception("Validation error creating extraction pages")
+        return Response(
+            {"error": f"Validation error: {str(e)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    except IntegrityError as e:
+        return Response(
+            {"error": f"Extraction pages already exist: {str(e)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    except Exception as e:
+        logger.exception("Failed to create extraction pages")
+        return Response(
+            {"error": f"Failed to create extraction pages: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+def _current_pages_apply(request: Request) -> bool:
+    """Whether the current pages of a document answer the request.
+
+    They are the latest pages across all extractions, so they only serve
+    users who see every extraction and requests without extraction
+    filters.
+    """
+    return permissions.can_view_other_users_extractions(
+        request.user
+    ) and not any(
+        request.GET.get(name) for name in ExtractionFilter.base_filters
+    )
+
+
 def get_extraction_page_queryset(user: Any) -> Any:
     """Get queryset filtered by user permissions."""
     queryset = extraction_page.ExtractionPage.objects.select_related(
@@ -315,38 +601,50 @@ def get_extraction_page_queryset(user: Any) -> Any:
             type=openapi.TYPE_INTEGER,
             required=False,
         ),
+        _projection.FIELDS_PARAMETER,
+        _projection.EXCLUDE_PARAMETER,
     ],
     responses={
         200: openapi.Response(
             description="List of extraction pages",
             schema=PaginatedExtractionPageSerializer,
         ),
+        400: "Bad Request - Unknown fields in 'fields' or 'exclude'",
         401: "Unauthorized - Authentication required",
     },
 )
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def list_extraction_pages(request: Request) -> Response:
+    try:
+        projection = _projection.badgerdoc_projection(
+            request, ExtractionPageSerializer
+        )
+    except _projection.InvalidProjection as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
     try:
         queryset = get_extraction_page_queryset(request.user)
 
         filterset = ExtractionPageFilter(request.GET, queryset=queryset)
-        queryset = filterset.qs
+        queryset = _projection.badgerdoc_project_queryset(
+            filterset.qs, ExtractionPageSerializer, projection
+        )
 
         page_obj = _pagination.badgerdoc_form_pagination(request, queryset)
 
-        serializer = ExtractionPageSerializer(page_obj, many=True)
-
         next_url, previous_url = _pagination.badgerdoc_paginate(
             request, page_obj
         )
 
         return Response(
             {
-                "count": page_obj.paginator.count,
+                "count": _pagination.badgerdoc_page_count(page_obj),
                 "next": next_url,
                 "previous": previous_url,
-                "results": serializer.data,
+                "results": _projection.badgerdoc_projected_data(
+                    ExtractionPageSerializer, page_obj, projection
+                ),
             },
             status=status.HTTP_200_OK,
         )
@@ -429,12 +727,15 @@ def list_extraction_pages(request: Request) -> Response:
             format=openapi.FORMAT_DATETIME,
             required=False,
         ),
+        _projection.FIELDS_PARAMETER,
+        _projection.EXCLUDE_PARAMETER,
     ],
     responses={
         200: openapi.Response(
             description="Latest extraction pages retrieved successfully",
             schema=PaginatedExtractionPageSerializer,
         ),
+        400: "Bad Request - Unknown fields in 'fields' or 'exclude'",
         403: "Forbidden - No read permission",
         404: "Not Found - Document does not exist",
         401: "Unauthorized - Authentication required",
@@ -458,58 +759,50 @@ def get_latest_extraction_pages(
         )
 
     try:
-        extraction_queryset = get_extraction_queryset(request.user).filter(
-            document=doc
+        projection = _projection.badgerdoc_projection(
+            request, ExtractionPageSerializer
         )
-        filterset = ExtractionFilter(request.GET, queryset=extraction_queryset)
-        filtered_extractions = filterset.qs
+    except _projection.InvalidProjection as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        extraction_ids = list(
-            filtered_extractions.values_list("id", flat=True)
-        )
-
-        logger.info("Extraction ids: %s", extraction_ids)
-
-        if not extraction_ids:
-            return Response(
-                {"count": 0, "next": None, "previous": None, "results": []},
-                status=status.HTTP_200_OK,
+    try:
+        if _current_pages_apply(request):
+            latest_pages = extraction_page.ExtractionPage.objects.filter(
+                current_for__document=doc
             )
-
-        all_pages = extraction_page.ExtractionPage.objects.filter(
-            extraction_id__in=extraction_ids
-        ).select_related("extraction", "extraction__document")
-
-        latest_created_at_by_page = (
-            all_pages.values("page_number")
-            .annotate(latest_created_at=Max("created_at"))
-            .values_list("page_number", "latest_created_at")
-        )
-
-        latest_page_filters = Q()
-        for page_number, latest_created_at in latest_created_at_by_page:
-            latest_page_filters |= Q(
-                page_number=page_number, created_at=latest_created_at
+        else:
+            extraction_queryset = get_extraction_queryset(request.user).filter(
+                document=doc
+            )
+            filterset = ExtractionFilter(
+                request.GET, queryset=extraction_queryset
+            )
+            latest_pages = extraction_page.latest_per_page(
+                extraction_page.ExtractionPage.objects.filter(
+                    extraction__in=filterset.qs.values("id")
+                )
             )
 
-        latest_pages = all_pages.filter(latest_page_filters).order_by(
-            "page_number"
+        latest_pages = _projection.badgerdoc_project_queryset(
+            latest_pages.order_by("page_number"),
+            ExtractionPageSerializer,
+            projection,
         )
 
         page_obj = _pagination.badgerdoc_form_pagination(request, latest_pages)
 
-        serializer = ExtractionPageSerializer(page_obj, many=True)
-
         next_url, previous_url = _pagination.badgerdoc_paginate(
             request, page_obj
         )
 
         return Response(
             {
-                "count": page_obj.paginator.count,
+                "count": _pagination.badgerdoc_page_count(page_obj),
                 "next": next_url,
                 "previous": previous_url,
-                "results": serializer.data,
+                "results": _projection.badgerdoc_projected_data(
+                    ExtractionPageSerializer, page_obj, projection
+                ),
             },
             status=status.HTTP_200_OK,
         )
@@ -603,33 +896,36 @@ def get_latest_extraction_page(
         )
 
     try:
-        extraction_queryset = get_extraction_queryset(request.user).filter(
-            document=doc
-        )
-        filterset = ExtractionFilter(request.GET, queryset=extraction_queryset)
-        filtered_extractions = filterset.qs
-
-        extraction_ids = list(
-            filtered_extractions.values_list("id", flat=True)
-        )
-
-        if not extraction_ids:
-            return Response(
-                {
-                    "error": f"No extraction found with the specified filters for document {document_id}"
-                },
-                status=status.HTTP_404_NOT_FOUND,
+        if _current_pages_apply(request):
+            latest_page = extraction_page.ExtractionPage.objects.filter(
+                current_for__document=doc, current_for__page_number=page_num
+            ).first()
+        else:
+            extraction_queryset = get_extraction_queryset(request.user).filter(
+                document=doc
             )
-
-        latest_page = (
-            extraction_page.ExtractionPage.objects.filter(
-                extraction_id__in=extraction_ids,
-                page_number=page_num,
+            filterset = ExtractionFilter(
+                request.GET, queryset=extraction_queryset
+            )
+            extraction_ids = list(filterset.qs.values_list("id", flat=True))
+
+            if not extraction_ids:
+                return Response(
+                    {
+                        "error": f"No extraction found with the specified filters for document {document_id}"
+                    },
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+            latest_page = (
+                extraction_page.ExtractionPage.objects.filter(
+                    extraction_id__in=extraction_ids,
+                    page_number=page_num,
+                )
+                .select_related("extraction", "extraction__document")
+                .order_by("-created_at", "-id")
+                .first()
             )
-            .select_related("extraction", "extraction__document")
-            .order_by("-created_at")
-            .first()
-        )
 
         if not latest_page:
             return Response(
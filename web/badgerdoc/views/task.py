@@ -479,7 +479,7 @@ def list_tasks(request: Request) -> Response:
 
         return Response(
             {
-                "count": page_obj.paginator.count,
+                "count": _pagination.badgerdoc_page_count(page_obj),
                 "next": next_url,
                 "previous": previous_url,
                 "results": serializer.data,
@@ -234,7 +234,8 @@ class WorkflowRegistrySerializer(serializers.ModelSerializer):
 
 class WorkflowEventCommonFields(serializers.Serializer):
     event_type = serializers.ChoiceField(
-        choices=["on_create", "on_update"], required=False
+        choices=["on_create", "on_update", "on_renditions_ready"],
+        required=False,
     )
     event_entity = serializers.ChoiceField(
         choices=[
@@ -0,0 +1,269 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from temporalio.common import WorkflowIDConflictPolicy, WorkflowIDReusePolicy
+
+from badgerdoc import temporal_client
+from badgerdoc.models import document
+from badgerdoc.models.workflow_trigger_outbox import WorkflowTriggerOutbox
+
+logger = logging.getLogger(__name__)
+
+# Triggers failing this many times are given up, with the last error kept
+MAX_ATTEMPTS = 5
+
+
+def enqueue(
+    workflow_type: str,
+    task_queue: str,
+    coalesce_key: str,
+    payload: dict,
+) -> None:
+    """Record a lifecycle workflow start in the current transaction."""
+    # A savepoint, so a failed insert does not break the saving transaction
+    with transaction.atomic():
+        WorkflowTriggerOutbox.objects.create(
+            workflow_type=workflow_type,
+            task_queue=task_queue,
+            coalesce_key=coalesce_key,
+            payload=payload,
+        )
+    transaction.on_commit(_dispatcher.wake)
+
+
+def lifecycle_workflow_id(row: WorkflowTriggerOutbox, file: str | None) -> str:
+    """Workflow ID derived from what the started workflow works on.
+
+    Triggers with the same entity and event, the same versions of the
+    matched registries and the same document file get the same ID, so
+    repeated saves of a document join its running pipeline instead of
+    starting it again.
+    """
+    payload = row.payload
+    content = {
+        "workflow_type": row.workflow_type,
+        "event_entity": payload.get("event_entity"),
+        "event_type": payload.get("event_type"),
+        "document_id": payload.get("document_id"),
+        "task_id": payload.get("task_id"),
+        "extraction_id": payload.get("extraction_id"),
+        "registries": sorted(
+            [registry.get("id"), registry.get("updated_at")]
+            for registry in payload.get("supported_workflows") or []
+        ),
+        "file": file,
+    }
+    digest = hashlib.sha256(
+        json.dumps(content, sort_keys=True).encode()
+    ).hexdigest()
+    return f"badgerdoc-lifecycle-{row.coalesce_key}-{digest[:16]}"
+
+
+async def _start_all(
+    starts: list[tuple[str, WorkflowTriggerOutbox]],
+) -> list[str | BaseException]:
+    # A start with the ID of a running workflow returns that workflow. One
+    # of a closed workflow starts a new run: the ID does not change with
+    # the state of extractions and tasks, so their later updates must run.
+    return await asyncio.gather(
+        *(
+            temporal_client.a_start_workflow(
+                workflow_type=row.workflow_type,
+                task_queue=row.task_queue,
+                workflow_id=workflow_id,
+                args=[row.payload],
+                id_reuse_policy=WorkflowIDReusePolicy.ALLOW_DUPLICATE,
+                id_conflict_policy=WorkflowIDConflictPolicy.USE_EXISTING,
+            )
+            for workflow_id, row in starts
+        ),
+        return_exceptions=True,
+    )
+
+
+def _claim(batch_size: int) -> list[WorkflowTriggerOutbox]:
+    """Lease a batch of pending rows to this dispatcher.
+
+    Rows are locked with SKIP LOCKED only while they are claimed, so
+    several dispatchers never claim the same row. Rows whose lease ran out,
+    e.g. after the dispatcher died, are claimed again.
+    """
+    now = timezone.now()
+    lease = timedelta(seconds=settings.BADGERDOC_WORKFLOW_TRIGGER_LEASE)
+    with transaction.atomic():
+        rows = list(
+            WorkflowTriggerOutbox.objects.filter(dispatched_at__isnull=True)
+            .filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - lease))
+            .select_for_update(skip_locked=True)
+            .order_by("id")[:batch_size]
+        )
+        for row in rows:
+            row.claimed_at = now
+        WorkflowTriggerOutbox.objects.bulk_update(rows, ["claimed_at"])
+    return rows
+
+
+def dispatch_pending(batch_size: int | None = None) -> int:
+    """Start one batch of pending triggers.
+
+    Pending rows with the same workflow and coalesce key start a single
+    workflow with the payload of the latest row. Rows are claimed in one
+    transaction and their results recorded in another, Temporal is called
+    in between without holding locks. Returns the number of rows
+    dispatched, failed rows stay pending until MAX_ATTEMPTS.
+    """
+    batch_size = batch_size or settings.BADGERDOC_WORKFLOW_TRIGGER_BATCH_SIZE
+    rows = _claim(batch_size)
+    if not rows:
+        return 0
+
+    groups: dict[tuple[str, str, str], list[WorkflowTriggerOutbox]] = {}
+    for row in rows:
+        key = (row.workflow_type, row.task_queue, row.coalesce_key)
+        groups.setdefault(key, []).append(row)
+    files = dict(
+        document.Document.objects.filter(
+            pk__in={
+                group[-1].payload.get("document_id")
+                for group in groups.values()
+            }
+        ).values_list("pk", "file")
+    )
+    starts = [
+        (
+            lifecycle_workflow_id(
+                group[-1], files.get(group[-1].payload.get("document_id"))
+            ),
+            group[-1],
+        )
+        for group in groups.values()
+    ]
+
+    try:
+        results = temporal_client.run(_start_all(starts))
+    except concurrent.futures.TimeoutError as e:
+        # The starts may still have happened, retrying them is safe as the
+        # workflow IDs are derived from the triggers
+        results = [e] * len(starts)
+
+    now = timezone.now()
+    dispatched = 0
+    for (workflow_id, _), result, group in zip(
+        starts, results, groups.values()
+    ):
+        for row in group:
+            row.claimed_at = None
+        if isinstance(result, BaseException):
+            logger.error(
+                "Failed to start lifecycle workflow for %s: %r",
+                group[-1].coalesce_key,
+                result,
+            )
+            for row in group:
+                row.attempts += 1
+                row.error = repr(result)
+                if row.attempts >= MAX_ATTEMPTS:
+                    row.dispatched_at = now
+            continue
+
+        logger.info(
+            "Lifecycle workflow triggered successfully for %s "
+            "(%d event(s)). Workflow ID: %s",
+            group[-1].coalesce_key,
+            len(group),
+            workflow_id,
+        )
+        dispatched += len(group)
+        for row in group:
+            row.workflow_id = workflow_id
+            row.dispatched_at = now
+            row.error = ""
+
+    with transaction.atomic():
+        WorkflowTriggerOutbox.objects.bulk_update(
+            rows,
+            [
+                "claimed_at",
+                "dispatched_at",
+                "workflow_id",
+                "attempts",
+                "error",
+            ],
+        )
+    return dispatched
+
+
+def dispatch_all() -> None:
+    """Dispatch full batches until the outbox is drained or a start fails."""
+    batch_size = settings.BADGERDOC_WORKFLOW_TRIGGER_BATCH_SIZE
+    while dispatch_pending(batch_size) >= batch_size:
+        pass
+
+
+class _Dispatcher:
+    """Thread starting committed triggers of this web process.
+
+    Woken after each commit recording a trigger, it also sweeps the outbox
+    every BADGERDOC_WORKFLOW_TRIGGER_SWEEP_INTERVAL seconds for rows left
+    by failed starts or other processes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pid: int | None = None
+        self._event = threading.Event()
+
+    def start(self) -> bool:
+        """Start the thread of this process, once; False if disabled."""
+        if settings.BADGERDOC_WORKFLOW_TRIGGER_DISPATCHER != "thread":
+            return False
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._event = threading.Event()
+                threading.Thread(
+                    target=self._run,
+                    args=(self._event,),
+                    name="workflow-trigger-outbox",
+                    daemon=True,
+                ).start()
+        return True
+
+    def wake(self) -> None:
+        if self.start():
+            self._event.set()
+
+    def _run(self, event: threading.Event) -> None:
+        while True:
+            event.wait(settings.BADGERDOC_WORKFLOW_TRIGGER_SWEEP_INTERVAL)
+            event.clear()
+            close_old_connections()
+            try:
+                dispatch_all()
+            except Exception:
+                logger.exception("Failed to dispatch workflow triggers")
+            finally:
+                close_old_connections()
+
+
+_dispatcher = _Dispatcher()
+
+
+def start_dispatcher() -> None:
+    """Start sweeping the outbox in this web process.
+
+    Called when the WSGI application is loaded, so pending triggers are
+    started without waiting for a new one. Management commands and tests
+    do not load it.
+    """
+    _dispatcher.start()
@@ -5,3 +5,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "badgerdoc.settings")
 
 application = get_wsgi_application()
+
+# Imported after the application is set up, it needs the Django settings
+from badgerdoc import workflow_outbox  # noqa: E402
+
+workflow_outbox.start_dispatcher()
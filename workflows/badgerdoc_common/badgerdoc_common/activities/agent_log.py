@@ -1,5 +1,9 @@
+import asyncio
 import logging
-from typing import Any
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
 
 from temporalio import activity
 
@@ -7,6 +11,28 @@ from badgerdoc_common import badgerdoc_http
 
 logger = logging.getLogger(__name__)
 
+# Lines are sent once this many are queued, or this many seconds after the
+# first queued line, whichever comes first
+AGENT_LOG_BATCH_SIZE = int(os.getenv("BADGERDOC_AGENT_LOG_BATCH_SIZE", "50"))
+AGENT_LOG_FLUSH_SECONDS = float(
+    os.getenv("BADGERDOC_AGENT_LOG_FLUSH_SECONDS", "2")
+)
+
+
+@dataclass
+class AgentLogEntry:
+    document: int
+    task: int | None
+    level: str
+    source: str
+    log: dict[str, Any]
+    # ISO 8601 time the line was logged at, batches are sent later
+    created_at: str | None = None
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
 
 @activity.defn
 async def write_agent_log(
@@ -27,3 +53,89 @@ async def write_agent_log(
         await badgerdoc_http.badgerdoc_post("/badgerdoc/agent-log/", payload)
     except Exception:
         logger.exception("Failed to write agent log to Badgerdoc")
+
+
+async def post_agent_logs(entries: list[AgentLogEntry]) -> None:
+    try:
+        await badgerdoc_http.badgerdoc_post(
+            "/badgerdoc/agent-log/bulk/",
+            {"logs": [asdict(entry) for entry in entries]},
+        )
+    except Exception:
+        logger.exception(
+            "Failed to write %s agent logs to Badgerdoc", len(entries)
+        )
+
+
+@activity.defn
+async def write_agent_logs(entries: list[AgentLogEntry]) -> None:
+    await post_agent_logs(entries)
+
+
+class AgentLogBuffer:
+    """Queue of agent log lines sent to Badgerdoc in batches.
+
+    Works in activities and, as it only relies on asyncio tasks and
+    sleeps, in workflows too. Use it as an async context manager, or call
+    ``flush`` at the end, so the last lines are not lost. Lines are stamped
+    with ``now`` when written, workflows pass ``workflow.now``.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[list[AgentLogEntry]], Awaitable[None]],
+        batch_size: int = AGENT_LOG_BATCH_SIZE,
+        flush_seconds: float = AGENT_LOG_FLUSH_SECONDS,
+        now: Callable[[], datetime] = _now,
+    ) -> None:
+        self._send = send
+        self._now = now
+        self._batch_size = batch_size
+        self._flush_seconds = flush_seconds
+        self._entries: list[AgentLogEntry] = []
+        self._timer: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "AgentLogBuffer":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.flush()
+
+    async def write(
+        self,
+        document_id: int,
+        task_id: int | None,
+        level: str,
+        source: str,
+        log: dict[str, Any],
+    ) -> None:
+        self._entries.append(
+            AgentLogEntry(
+                document=document_id,
+                task=task_id,
+                level=level,
+                source=source,
+                log=log,
+                created_at=self._now().isoformat(),
+            )
+        )
+        if len(self._entries) >= self._batch_size:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._flush_seconds)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        # Batches are sent one at a time to keep the lines in order
+        async with self._lock:
+            entries, self._entries = self._entries, []
+            if entries:
+                await self._send(entries)
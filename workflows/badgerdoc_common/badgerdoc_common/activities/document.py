@@ -12,6 +12,13 @@ from badgerdoc_common import badgerdoc_http
 
 logger = logging.getLogger(__name__)
 
+# Keep in sync with BULK_CREATE_MAX_DOCUMENTS of the document API
+BULK_CREATE_MAX_DOCUMENTS = 1000
+# Keep in sync with RENDITIONS_BY_PAGE_MAX_DOCUMENTS of the document API
+RENDITIONS_BY_PAGE_MAX_DOCUMENTS = 100
+# Max page size of the document list API
+LIST_PAGE_SIZE = 100
+
 
 @dataclass
 class BadgerdocDocument:
@@ -104,45 +111,68 @@ async def badgerdoc_create_document(
         raise
 
 
+async def _export_child_documents(
+    parent_document_id: int, params: dict[str, str]
+) -> list[BadgerdocDocument]:
+    endpoint = f"/badgerdoc/document/{parent_document_id}/tree/"
+    try:
+        return [
+            _parse_document(item)
+            async for item in badgerdoc_http.badgerdoc_get_ndjson(
+                endpoint, params={**params, "depth": "1"}
+            )
+        ]
+    except badgerdoc_http.BadgerdocDoesNotExist:
+        return []
+
+
+async def _walk_documents(params: dict[str, str]) -> list[BadgerdocDocument]:
+    documents: list[BadgerdocDocument] = []
+    payload = {**params, "cursor": "", "page_size": str(LIST_PAGE_SIZE)}
+    endpoint = "/badgerdoc/documents/"
+    while True:
+        response_data = await badgerdoc_http.badgerdoc_get(
+            endpoint, params=payload
+        )
+        documents.extend(
+            _parse_document(item) for item in response_data["results"]
+        )
+        next_url = response_data.get("next")
+        if not next_url:
+            return documents
+        query = urllib.parse.urlsplit(next_url).query
+        payload = dict(urllib.parse.parse_qsl(query, keep_blank_values=True))
+
+
 @activity.defn
 async def badgerdoc_list_documents(
     filters: ListDocumentsRequest,
 ) -> ListDocumentsResponse:
+    """List documents matching the filters.
+
+    Children of a document are read from the tree export in one request,
+    other listings follow the keyset-paginated document list.
+    """
     if isinstance(filters, dict):
         filters = ListDocumentsRequest(**filters)
-    all_documents: list[BadgerdocDocument] = []
-    page = 1
-    has_next = True
 
     payload: dict[str, str] = {}
     if filters.tags is not None:
         payload["tags"] = ",".join(filters.tags)
 
-    if filters.parent_document_id is not None:
-        payload["parent_document_id"] = str(filters.parent_document_id)
-
     if filters.metadata_field is not None:
         payload["metadata"] = json.dumps(filters.metadata_field)
 
-    while has_next:
-        payload["page"] = str(page)
-
-        endpoint = "/badgerdoc/documents/"
-        try:
-            response_data = await badgerdoc_http.badgerdoc_get(
-                endpoint, params=payload
+    try:
+        if filters.parent_document_id is not None:
+            all_documents = await _export_child_documents(
+                filters.parent_document_id, payload
             )
-            page_documents = [
-                _parse_document(item) for item in response_data["results"]
-            ]
-            all_documents.extend(page_documents)
-
-            has_next = bool(response_data.get("next"))
-            if has_next:
-                page += 1
-        except Exception as e:
-            logger.warning("Failed to request documents: %s", str(e))
-            raise
+        else:
+            all_documents = await _walk_documents(payload)
+    except Exception as e:
+        logger.warning("Failed to request documents: %s", str(e))
+        raise
 
     return ListDocumentsResponse(
         documents=all_documents, count=len(all_documents)
@@ -204,6 +234,52 @@ async def badgerdoc_upload_document(
         raise
 
 
+async def badgerdoc_create_documents(
+    parent_document_id: int, documents: list[BadgerdocDocument]
+) -> list[BadgerdocDocument]:
+    """Register files already in object storage as children of a document.
+
+    `file` of every document is the storage key, which must start with
+    `derived/<parent_document_id>/`.
+    """
+    created: list[BadgerdocDocument] = []
+    for start in range(0, len(documents), BULK_CREATE_MAX_DOCUMENTS):
+        batch = documents[start : start + BULK_CREATE_MAX_DOCUMENTS]
+        payload = {
+            "parent_document_id": parent_document_id,
+            "documents": [
+                {
+                    key: value
+                    for key, value in asdict(document).items()
+                    if value is not None
+                    and key
+                    in ("name", "file", "extension", "metadata", "tags")
+                }
+                for document in batch
+            ],
+        }
+        try:
+            response_data = await badgerdoc_http.badgerdoc_post(
+                "/badgerdoc/document/bulk/", payload
+            )
+        except Exception as e:
+            logger.warning(
+                "Failed to register %d documents for %s: %s",
+                len(batch),
+                parent_document_id,
+                str(e),
+            )
+            raise
+        created.extend(
+            _parse_document(item) for item in response_data["results"]
+        )
+
+    logger.info(
+        "Registered %d documents for %s", len(created), parent_document_id
+    )
+    return created
+
+
 async def badgerdoc_upload_file(
     document: BadgerdocDocument, file: BinaryIO
 ) -> BadgerdocDocument:
@@ -282,6 +358,37 @@ async def badgerdoc_get_rendition(
     return _parse_document(document_data)
 
 
+@activity.defn
+async def badgerdoc_get_renditions_by_page(
+    document_ids: list[int],
+) -> dict[int, dict[int, BadgerdocDocument]]:
+    """Renditions of all pages of the documents, by document and page."""
+    logger.info("Getting renditions by page for documents %s", document_ids)
+
+    renditions: dict[int, dict[int, BadgerdocDocument]] = {}
+    for start in range(0, len(document_ids), RENDITIONS_BY_PAGE_MAX_DOCUMENTS):
+        batch = document_ids[start : start + RENDITIONS_BY_PAGE_MAX_DOCUMENTS]
+        response_data = await badgerdoc_http.badgerdoc_get(
+            "/badgerdoc/documents/renditions/",
+            params={"document_ids": ",".join(str(i) for i in batch)},
+        )
+        if not isinstance(response_data, dict):
+            raise ValueError(
+                f"Expected response to be a dict, got {type(response_data)} instead"
+            )
+        for document_id, pages in response_data["results"].items():
+            renditions[int(document_id)] = {
+                int(page): _parse_document(rendition)
+                for page, rendition in pages.items()
+            }
+
+    logger.info(
+        "Renditions retrieved: %d pages",
+        sum(len(pages) for pages in renditions.values()),
+    )
+    return renditions
+
+
 @activity.defn
 async def badgerdoc_delete_document(document_id: int) -> None:
     """Delete a document by id."""
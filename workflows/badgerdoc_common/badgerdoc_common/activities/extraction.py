@@ -9,6 +9,9 @@ from badgerdoc_common.activities import task
 
 logger = logging.getLogger(__name__)
 
+# Keep in sync with BULK_CREATE_MAX_PAGES of the extraction page API
+BULK_CREATE_MAX_PAGES = 100
+
 
 @dataclass
 class BadgerdocExtraction:
@@ -284,6 +287,23 @@ class CreateExtractionPageRequest:
     extraction_id: int
     page_number: int
     content: dict | None = None
+    # Key of hOCR in object storage, read by the API instead of content
+    storage_key: str | None = None
+
+
+@dataclass
+class ExtractionPageContent:
+    """Page of a bulk request, with inline content or a storage key."""
+
+    page_number: int
+    content: str | None = None
+    storage_key: str | None = None
+
+
+@dataclass
+class CreateExtractionPagesRequest:
+    extraction_id: int
+    pages: list[ExtractionPageContent]
 
 
 @dataclass
@@ -294,6 +314,11 @@ class ListExtractionPagesRequest:
     created_at__lte: str | None = None
     page: int = 1
     page_size: int = 10
+    # Fields to return or to leave out, e.g. exclude=["content"] lists
+    # pages without reading their content. Responses must keep id,
+    # extraction_id and page_number
+    fields: list[str] | None = None
+    exclude: list[str] | None = None
 
 
 @dataclass
@@ -352,6 +377,49 @@ async def badgerdoc_create_extraction_page(
     return extraction_page
 
 
+@activity.defn
+async def badgerdoc_create_extraction_pages(
+    pages_request: CreateExtractionPagesRequest,
+) -> list[BadgerdocExtractionPage]:
+    """Create up to BULK_CREATE_MAX_PAGES pages in one transaction."""
+    logger.info(
+        "Creating %d pages for extraction %s",
+        len(pages_request.pages),
+        pages_request.extraction_id,
+    )
+
+    payload = {
+        "extraction_id": pages_request.extraction_id,
+        "pages": [
+            {
+                key: value
+                for key, value in asdict(page).items()
+                if value is not None
+            }
+            for page in pages_request.pages
+        ],
+    }
+
+    endpoint = "/badgerdoc/extraction-page/bulk/"
+
+    response_data = await badgerdoc_http.badgerdoc_post(endpoint, payload)
+
+    try:
+        return [
+            BadgerdocExtractionPage(
+                id=item["id"],
+                extraction_id=item["extraction_id"],
+                page_number=item["page_number"],
+            )
+            for item in response_data["results"]
+        ]
+    except KeyError:
+        logger.warning(
+            "Missing key in bulk extraction page response: %s", response_data
+        )
+        raise
+
+
 @activity.defn
 async def badgerdoc_list_extraction_pages(
     filters: ListExtractionPagesRequest,
@@ -361,6 +429,10 @@ async def badgerdoc_list_extraction_pages(
         for key, value in asdict(filters).items()
         if value is not None
     }
+    if filters.fields:
+        payload["fields"] = ",".join(filters.fields)
+    if filters.exclude:
+        payload["exclude"] = ",".join(filters.exclude)
 
     endpoint = "/badgerdoc/extraction-pages/"
 
@@ -10,9 +10,17 @@ from badgerdoc_common.activities import agent_log
 
 _ACTIVITY_TIMEOUT = timedelta(seconds=10)
 _NO_RETRY = common.RetryPolicy(maximum_attempts=1)
+# Workflows started before batching keep writing one activity per line
+# when they are replayed
+_BUFFERED_PATCH_ID = "buffered-agent-log"
 
 
 class AgentLogger:
+    """Agent log of a workflow, written in batches by one activity each.
+
+    Use it as an async context manager, or call ``flush`` before the
+    workflow returns, so the last lines are not lost.
+    """
 
     def __init__(
         self,
@@ -29,6 +37,27 @@ class AgentLogger:
             else f"badgerdoc_agent.{document_id}"
         )
         self.default_logger = logging.getLogger(name)
+        self._buffer = agent_log.AgentLogBuffer(self._send, now=workflow.now)
+
+    async def __aenter__(self) -> "AgentLogger":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.flush()
+
+    async def flush(self) -> None:
+        await self._buffer.flush()
+
+    async def _send(self, entries: list[agent_log.AgentLogEntry]) -> None:
+        try:
+            await workflow.execute_activity(
+                agent_log.write_agent_logs,
+                entries,
+                start_to_close_timeout=_ACTIVITY_TIMEOUT,
+                retry_policy=_NO_RETRY,
+            )
+        except Exception:
+            self.default_logger.exception("Unable to log into agent_logger")
 
     async def _log(
         self,
@@ -65,6 +94,16 @@ class AgentLogger:
         if workflow_params is not None:
             log["workflow_params"] = workflow_params
 
+        if workflow.patched(_BUFFERED_PATCH_ID):
+            await self._buffer.write(
+                self._document_id,
+                self._task_id,
+                level_name,
+                self._source,
+                log,
+            )
+            return
+
         try:
             await workflow.execute_activity(
                 agent_log.write_agent_log,
@@ -1,14 +1,39 @@
+import asyncio
+import json
 import logging
 import os
+from collections.abc import AsyncIterator
 from typing import Any, BinaryIO
+from urllib.parse import urlsplit
 
 import aiohttp
 
+from badgerdoc_common import download_cache
+
 logger = logging.getLogger(__name__)
 
 TEMPORAL_BADGERDOC_ADDRESS = os.environ.get("TEMPORAL_BADGERDOC_ADDRESS", "")
 BADGERDOC_TOKEN = os.environ.get("BADGERDOC_TOKEN", "")
 
+# Shared connection pool used by every request of the worker process
+HTTP_CONNECTION_LIMIT = int(
+    os.getenv("BADGERDOC_HTTP_CONNECTION_LIMIT", "100")
+)
+HTTP_CONNECTION_LIMIT_PER_HOST = int(
+    os.getenv("BADGERDOC_HTTP_CONNECTION_LIMIT_PER_HOST", "20")
+)
+HTTP_KEEPALIVE_TIMEOUT = float(
+    os.getenv("BADGERDOC_HTTP_KEEPALIVE_TIMEOUT", "30")
+)
+HTTP_DNS_CACHE_TTL = int(os.getenv("BADGERDOC_HTTP_DNS_CACHE_TTL", "300"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("BADGERDOC_HTTP_CONNECT_TIMEOUT", "10"))
+# aiohttp's own default, so a stalled response cannot hang an activity;
+# 0 disables the timeout
+HTTP_TOTAL_TIMEOUT = float(os.getenv("BADGERDOC_HTTP_TOTAL_TIMEOUT", "300"))
+
+_session: aiohttp.ClientSession | None = None
+_session_loop: asyncio.AbstractEventLoop | None = None
+
 
 class BadgerdocAPIError(aiohttp.ClientResponseError):
     """Base class for Badgerdoc API response errors."""
@@ -26,6 +51,35 @@ class BadgerdocInternalError(BadgerdocAPIError):
     """Raised for server-side errors (HTTP 500)."""
 
 
+def get_session() -> aiohttp.ClientSession:
+    """Return the process-wide session, creating it on first use."""
+    global _session, _session_loop  # pylint: disable=global-statement
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=HTTP_CONNECTION_LIMIT,
+                limit_per_host=HTTP_CONNECTION_LIMIT_PER_HOST,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            ),
+            timeout=aiohttp.ClientTimeout(
+                total=HTTP_TOTAL_TIMEOUT or None,
+                connect=HTTP_CONNECT_TIMEOUT or None,
+            ),
+        )
+        _session_loop = loop
+    return _session
+
+
+async def close_session() -> None:
+    global _session, _session_loop  # pylint: disable=global-statement
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
+
+
 def _raise_mapped_response_error(
     response: aiohttp.ClientResponse,
     response_text: str,
@@ -84,38 +138,38 @@ async def _make_json_request(
     if not url.startswith("/"):
         raise ValueError("URL must start with '/'")
 
-    async with aiohttp.ClientSession() as session:
-        headers = {
-            "Authorization": f"Token {BADGERDOC_TOKEN}",
-            "Content-Type": "application/json",
-        }
-
-        async with session.request(
-            method,
-            f"{TEMPORAL_BADGERDOC_ADDRESS}{url}",
-            json=payload,
-            headers=headers,
-            params=params,
-            allow_redirects=True,
-        ) as response:
-            logger.info("%s response status: %s", method, response.status)
-            logger.debug("%s response headers: %s", method, response.headers)
-
-            response_text = await response.text()
-            logger.debug("%s response body: %s", method, response_text)
-
-            if response.status >= 400:
-                logger.error(
-                    "%s request failed. Status: %s, Response: %s",
-                    method,
-                    response.status,
-                    response_text,
-                )
-                _raise_mapped_response_error(
-                    response, response_text, action=method
-                )
-
-            return await response.json()
+    session = get_session()
+    headers = {
+        "Authorization": f"Token {BADGERDOC_TOKEN}",
+        "Content-Type": "application/json",
+    }
+
+    async with session.request(
+        method,
+        f"{TEMPORAL_BADGERDOC_ADDRESS}{url}",
+        json=payload,
+        headers=headers,
+        params=params,
+        allow_redirects=True,
+    ) as response:
+        logger.info("%s response status: %s", method, response.status)
+        logger.debug("%s response headers: %s", method, response.headers)
+
+        response_text = await response.text()
+        logger.debug("%s response body: %s", method, response_text)
+
+        if response.status >= 400:
+            logger.error(
+                "%s request failed. Status: %s, Response: %s",
+                method,
+                response.status,
+                response_text,
+            )
+            _raise_mapped_response_error(
+                response, response_text, action=method
+            )
+
+        return await response.json()
 
 
 async def _make_form_request(
@@ -129,33 +183,33 @@ async def _make_form_request(
     if not url.startswith("/"):
         raise ValueError("URL must start with '/'")
 
-    async with aiohttp.ClientSession() as session:
-        headers = {"Authorization": f"Token {BADGERDOC_TOKEN}"}
+    session = get_session()
+    headers = {"Authorization": f"Token {BADGERDOC_TOKEN}"}
 
-        async with session.request(
-            method,
-            f"{TEMPORAL_BADGERDOC_ADDRESS}{url}",
-            data=form,
-            headers=headers,
-        ) as response:
-            logger.info("%s response status: %s", method, response.status)
-            logger.debug("%s response headers: %s", method, response.headers)
+    async with session.request(
+        method,
+        f"{TEMPORAL_BADGERDOC_ADDRESS}{url}",
+        data=form,
+        headers=headers,
+    ) as response:
+        logger.info("%s response status: %s", method, response.status)
+        logger.debug("%s response headers: %s", method, response.headers)
 
-            response_text = await response.text()
-            logger.debug("%s response body: %s", method, response_text)
+        response_text = await response.text()
+        logger.debug("%s response body: %s", method, response_text)
 
-            if response.status >= 400:
-                logger.error(
-                    "%s form request failed. Status: %s, Response: %s",
-                    method,
-                    response.status,
-                    response_text,
-                )
-                _raise_mapped_response_error(
-                    response, response_text, action=f"{method} form"
-                )
+        if response.status >= 400:
+            logger.error(
+                "%s form request failed. Status: %s, Response: %s",
+                method,
+                response.status,
+                response_text,
+            )
+            _raise_mapped_response_error(
+                response, response_text, action=f"{method} form"
+            )
 
-            return await response.json()
+        return await response.json()
 
 
 async def badgerdoc_post(url: str, payload: dict[str, Any]) -> dict[str, Any]:
@@ -172,6 +226,43 @@ async def badgerdoc_get(
     return await _make_json_request("GET", url, params=params)
 
 
+async def badgerdoc_get_ndjson(
+    url: str, params: dict[str, Any] | None = None
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield the objects of a newline-delimited JSON response one by one."""
+    logger.info("Making streaming GET request to Badgerdoc: %s", url)
+
+    if not BADGERDOC_TOKEN:
+        logger.warning("Badgerdoc token seems empty")
+
+    if not url.startswith("/"):
+        raise ValueError("URL must start with '/'")
+
+    session = get_session()
+    headers = {"Authorization": f"Token {BADGERDOC_TOKEN}"}
+
+    async with session.get(
+        f"{TEMPORAL_BADGERDOC_ADDRESS}{url}",
+        headers=headers,
+        params=params,
+        allow_redirects=True,
+    ) as response:
+        logger.info("GET response status: %s", response.status)
+
+        if response.status >= 400:
+            response_text = await response.text()
+            logger.error(
+                "GET request failed. Status: %s, Response: %s",
+                response.status,
+                response_text,
+            )
+            _raise_mapped_response_error(response, response_text, action="GET")
+
+        async for line in response.content:
+            if line.strip():
+                yield json.loads(line)
+
+
 async def badgerdoc_delete(
     url: str, params: dict[str, Any] | None = None
 ) -> list[dict[str, Any]] | dict[str, Any]:
@@ -190,6 +281,57 @@ async def badgerdoc_form_patch(
     return await _make_form_request("PATCH", url, form)
 
 
+async def badgerdoc_download_url(
+    buffer: BinaryIO, file_url: str, headers: dict[str, str] | None = None
+) -> None:
+    """Download ``file_url`` to ``buffer`` through the download cache."""
+    buffer.seek(0)
+    buffer.truncate(0)
+
+    # Presigned URLs differ per request, the path identifies the object
+    cache_key = urlsplit(file_url).path
+    cache = download_cache.get_download_cache()
+    headers = dict(headers or {})
+    cached_etag = await cache.read(cache_key, buffer) if cache else None
+    if cached_etag:
+        headers["If-None-Match"] = cached_etag
+
+    session = get_session()
+    async with session.get(
+        file_url, headers=headers, allow_redirects=True
+    ) as response:
+        logger.info("Download response status: %s", response.status)
+        logger.debug("Download response headers: %s", response.headers)
+
+        if cache and cached_etag and response.status == 304:
+            cache.record_hit(cache_key)
+            buffer.seek(0)
+            logger.info("File served from download cache: %s", cache_key)
+            return
+
+        if response.status >= 400:
+            response_text = await response.text()
+            logger.error(
+                "Failed to download document file. Status: %s, Response: %s",
+                response.status,
+                response_text,
+            )
+            _raise_mapped_response_error(
+                response, response_text, action="Download"
+            )
+
+        buffer.seek(0)
+        buffer.truncate(0)
+        async for chunk in response.content.iter_chunked(8192):
+            buffer.write(chunk)
+        etag = response.headers.get("ETag", "")
+
+    if cache:
+        cache.record_miss(cache_key)
+        await cache.write(cache_key, etag, buffer)
+    buffer.seek(0)
+
+
 async def badgerdoc_download(buffer: BinaryIO, document: Any) -> None:
     if not document.file:
         raise ValueError("Document file URL is required for download")
@@ -199,36 +341,13 @@ async def badgerdoc_download(buffer: BinaryIO, document: Any) -> None:
     if not BADGERDOC_TOKEN:
         logger.warning("Badgerdoc token seems empty")
 
-    buffer.seek(0)
-    buffer.truncate(0)
-
     file_url = document.file
     if not file_url.startswith("http"):
         if not file_url.startswith("/"):
             file_url = f"/{file_url}"
         file_url = f"{TEMPORAL_BADGERDOC_ADDRESS}{file_url}"
 
-    async with aiohttp.ClientSession() as session:
-        headers = {"Authorization": f"Token {BADGERDOC_TOKEN}"}
-        async with session.get(
-            file_url, headers=headers, allow_redirects=True
-        ) as response:
-            logger.info("Download response status: %s", response.status)
-            logger.debug("Download response headers: %s", response.headers)
-
-            if response.status >= 400:
-                response_text = await response.text()
-                logger.error(
-                    "Failed to download document file. Status: %s, Response: %s",
-                    response.status,
-                    response_text,
-                )
-                _raise_mapped_response_error(
-                    response, response_text, action="Download"
-                )
-
-            async for chunk in response.content.iter_chunked(8192):
-                buffer.write(chunk)
-
-    buffer.seek(0)
+    await badgerdoc_download_url(
+        buffer, file_url, {"Authorization": f"Token {BADGERDOC_TOKEN}"}
+    )
     logger.info("Document file downloaded successfully")
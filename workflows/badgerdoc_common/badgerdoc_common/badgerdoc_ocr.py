@@ -159,32 +159,22 @@ async def _collect_pages_from_documents(
     docs: list[document.BadgerdocDocument],
 ) -> dict[tuple[int, int], OCRPageRequest]:
     pages: dict[tuple[int, int], OCRPageRequest] = {}
-    for doc in docs:
-        renditions_response = await workflow.execute_activity(
-            document.badgerdoc_list_documents,
-            document.ListDocumentsRequest(
-                tags=["rendition"],
-                parent_document_id=doc.id,
-            ),
-            start_to_close_timeout=helpers.BADGERDOC_REST_API_START_TO_CLOSE_TIMEOUT,
-            retry_policy=helpers.BadgerdocRestAPIRetryPolicy,
-        )
-        for rendition_info in renditions_response.documents:
-            page_num = (rendition_info.metadata or {}).get("page")
-            if page_num is None:
-                logger.error(
-                    "Rendition document %s has no page in metadata, skipping",
-                    rendition_info.id,
-                )
-                continue
-            rendition = await workflow.execute_activity(
-                document.badgerdoc_get_rendition,
-                args=[doc, page_num],
-                start_to_close_timeout=helpers.BADGERDOC_REST_API_START_TO_CLOSE_TIMEOUT,
-                retry_policy=helpers.BadgerdocRestAPIRetryPolicy,
-            )
-            key = (page_num, doc.id)
-            pages[key] = OCRPageRequest(
+    document_ids = [doc.id for doc in docs if doc.id is not None]
+    if not document_ids:
+        return pages
+
+    renditions = await workflow.execute_activity(
+        document.badgerdoc_get_renditions_by_page,
+        document_ids,
+        start_to_close_timeout=helpers.BADGERDOC_REST_API_START_TO_CLOSE_TIMEOUT,
+        retry_policy=helpers.BadgerdocRestAPIRetryPolicy,
+    )
+    for document_id in document_ids:
+        document_renditions = renditions.get(document_id, {})
+        if not document_renditions:
+            logger.warning("Document %s has no renditions", document_id)
+        for page_num, rendition in sorted(document_renditions.items()):
+            pages[(page_num, document_id)] = OCRPageRequest(
                 badgerdoc_document=trigger.BadgerdocDocumentPage(
                     page_num=page_num,
                     document=rendition,
@@ -255,8 +245,8 @@ async def trigger_params_to_ocr_page(
     Resolves three input sources into two output collections:
 
     - ``linked_documents`` — each document is expanded into all its rendition
-      pages. Renditions are discovered via the API and fetched individually
-      with ``badgerdoc_get_rendition``. Pages are keyed by
+      pages. Renditions of all documents are fetched in one call with
+      ``badgerdoc_get_renditions_by_page``. Pages are keyed by
       ``(page_num, document_id)`` to enable duplicate detection.
 
     - ``linked_document_pages`` — explicit page references added directly.
@@ -274,10 +264,12 @@ async def trigger_params_to_ocr_page(
     pages: dict[tuple[int, int], OCRPageRequest] = {}
     blocks: list[OCRPageRequest] = []
 
-    if params.linked_documents:
-        pages.update(
-            await _collect_pages_from_documents(params.linked_documents)
-        )
+    # Renditions and block chunks do not depend on each other
+    document_pages, blocks = await asyncio.gather(
+        _collect_pages_from_documents(params.linked_documents or []),
+        _collect_blocks_from_xpaths(params.linked_extraction_xpaths or []),
+    )
+    pages.update(document_pages)
 
     if params.linked_document_pages:
         pages.update(
@@ -286,9 +278,4 @@ async def trigger_params_to_ocr_page(
             )
         )
 
-    if params.linked_extraction_xpaths:
-        blocks = await _collect_blocks_from_xpaths(
-            params.linked_extraction_xpaths
-        )
-
     return OCRPageContainer(pages=list(pages.values()), blocks=blocks)
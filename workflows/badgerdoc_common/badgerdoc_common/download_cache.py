@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO
+
+logger = logging.getLogger(__name__)
+
+# Empty disables the cache. Workers on one host may share the directory.
+DOWNLOAD_CACHE_DIR = os.getenv("BADGERDOC_DOWNLOAD_CACHE_DIR", "")
+DOWNLOAD_CACHE_MAX_BYTES = int(
+    os.getenv("BADGERDOC_DOWNLOAD_CACHE_MAX_BYTES", "2147483648")
+)
+
+_cache: "DownloadCache | None" = None
+
+
+@dataclass
+class DownloadCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class DownloadCache:
+    """Bounded on-disk cache of downloaded objects.
+
+    Every entry is a single file named after the object key, holding the
+    ETag on its first line followed by the content, so that a cached copy
+    is only served once the origin confirmed the ETag is still current.
+    Entries are replaced atomically and the least recently used ones are
+    evicted once the directory grows over ``max_bytes``.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = DownloadCacheStats()
+        os.makedirs(directory, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    async def read(self, key: str, buffer: BinaryIO) -> str | None:
+        """Write the cached content of ``key`` to ``buffer``.
+
+        Returns the ETag of the cached copy, or None if there is none.
+        """
+        return await asyncio.to_thread(self._read, key, buffer)
+
+    def _read(self, key: str, buffer: BinaryIO) -> str | None:
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as entry:
+                etag = entry.readline().rstrip(b"\n").decode()
+                buffer.seek(0)
+                buffer.truncate(0)
+                while chunk := entry.read(1024 * 1024):
+                    buffer.write(chunk)
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another worker after it was read, the copy in
+            # the buffer is still complete
+            pass
+        buffer.seek(0)
+        return etag
+
+    async def write(self, key: str, etag: str, buffer: BinaryIO) -> None:
+        await asyncio.to_thread(self._write, key, etag, buffer)
+
+    def _write(self, key: str, etag: str, buffer: BinaryIO) -> None:
+        buffer.seek(0, os.SEEK_END)
+        size = buffer.tell()
+        buffer.seek(0)
+        if not etag or "\n" in etag or size > self.max_bytes:
+            return
+
+        descriptor, temp_path = tempfile.mkstemp(
+            dir=self.directory, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as entry:
+                entry.write(etag.encode() + b"\n")
+                while chunk := buffer.read(1024 * 1024):
+                    entry.write(chunk)
+            os.replace(temp_path, self._entry_path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        finally:
+            buffer.seek(0)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".tmp"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.stats.evictions += 1
+
+    def record_hit(self, key: str) -> None:
+        self.stats.hits += 1
+        logger.debug("Download cache hit: %s", key)
+
+    def record_miss(self, key: str) -> None:
+        self.stats.misses += 1
+        logger.debug("Download cache miss: %s", key)
+
+
+def get_download_cache() -> DownloadCache | None:
+    """Return the download cache of the process, None when disabled."""
+    global _cache  # pylint: disable=global-statement
+    if not DOWNLOAD_CACHE_DIR:
+        return None
+    if _cache is None:
+        _cache = DownloadCache(DOWNLOAD_CACHE_DIR, DOWNLOAD_CACHE_MAX_BYTES)
+    return _cache
@@ -6,6 +6,8 @@ from temporalio.client import Client
 from temporalio.common import RetryPolicy
 from temporalio.worker import Worker
 
+from badgerdoc_common import badgerdoc_http, storage
+
 logger = logging.getLogger(__name__)
 
 TEMPORAL_ADDRESS = os.getenv("TEMPORAL_ADDRESS", "localhost:7233")
@@ -55,4 +57,8 @@ async def connect_to_client():
 
 async def start_worker(worker: Worker) -> None:
     logger.info("Starting new worker %s", worker)
-    await worker.run()
+    try:
+        await worker.run()
+    finally:
+        await badgerdoc_http.close_session()
+        await storage.close_s3_client()
@@ -1,24 +1,57 @@
+import asyncio
 import logging
 import os
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
 from dataclasses import dataclass
 from io import BytesIO
+from typing import Any
 
 import aioboto3
 from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from badgerdoc_common import download_cache
 
 logger = logging.getLogger(__name__)
 
+STORE_MANY_CONCURRENCY = int(
+    os.getenv("BADGERDOC_OBJECT_STORAGE_UPLOAD_CONCURRENCY", "8")
+)
+# Objects of at least this size are uploaded as multipart uploads and
+# downloaded as parallel ranged requests, in parts of PART_SIZE bytes.
+MULTIPART_THRESHOLD = int(
+    os.getenv("BADGERDOC_OBJECT_STORAGE_MULTIPART_THRESHOLD", "67108864")
+)
+PART_SIZE = int(os.getenv("BADGERDOC_OBJECT_STORAGE_PART_SIZE", "16777216"))
+PART_CONCURRENCY = int(
+    os.getenv("BADGERDOC_OBJECT_STORAGE_PART_CONCURRENCY", "4")
+)
+
+_client: Any = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+_client_stack: AsyncExitStack | None = None
+
 
 @dataclass
 class StorageWorkflowParams:
     workflow_package: str
     workflow_name: str
     workflow_id: str
+    # Results of a document are stored under its own prefix, the API only
+    # reads hOCR of an extraction from the prefix of its document
+    document_id: int | None = None
+
+
+def document_perm_prefix(document_id: int) -> str:
+    return f"data/workflows/documents/{document_id}/"
 
 
 def _build_storage_path(
     base_path: str, params: StorageWorkflowParams, file_path: str | list[str]
 ) -> str:
+    if params.document_id is not None:
+        base_path = f"{base_path}/documents/{params.document_id}"
     path = f"{base_path}/{params.workflow_package}/{params.workflow_name}/{params.workflow_id}/"
 
     file_path = (
@@ -40,7 +73,7 @@ def build_temp_path(
     return _build_storage_path("tmp/workflows", params, file_path)
 
 
-def _get_s3_client():
+def _create_s3_client():
     access_key = os.getenv("BADGERDOC_OBJECT_STORAGE_ACCESS_KEY")
     secret_key = os.getenv("BADGERDOC_OBJECT_STORAGE_SECRET_KEY")
     endpoint_url = os.getenv("BADGERDOC_OBJECT_STORAGE_URL")
@@ -49,7 +82,10 @@ def _get_s3_client():
         "BADGERDOC_OBJECT_STORAGE_ADDRESSING_STYLE", "path"
     )
 
-    config = Config(s3={"addressing_style": addressing_style})
+    config = Config(
+        s3={"addressing_style": addressing_style},
+        max_pool_connections=max(STORE_MANY_CONCURRENCY, PART_CONCURRENCY),
+    )
     session = aioboto3.Session()
     return session.client(
         "s3",
@@ -61,26 +97,116 @@ def _get_s3_client():
     )
 
 
-async def badgerdoc_download(buffer: BytesIO, path: str) -> None:
+@asynccontextmanager
+async def _get_s3_client():
+    """Yield the S3 client of the worker process, creating it on first use."""
+    global _client, _client_loop, _client_stack  # pylint: disable=global-statement
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        stack = AsyncExitStack()
+        client = await stack.enter_async_context(_create_s3_client())
+        # Another request may have created the client while this one waited
+        if _client is None or _client_loop is not loop:
+            _client, _client_loop, _client_stack = client, loop, stack
+        else:
+            await stack.aclose()
+    yield _client
+
+
+async def close_s3_client() -> None:
+    global _client, _client_loop, _client_stack  # pylint: disable=global-statement
+    if _client_stack is not None:
+        await _client_stack.aclose()
+    _client, _client_loop, _client_stack = None, None, None
+
+
+def _get_bucket_name() -> str:
     bucket_name = os.getenv("BADGERDOC_OBJECT_STORAGE_BUCKET")
     if not bucket_name:
         raise ValueError(
             "Bucket name is required. Set BADGERDOC_OBJECT_STORAGE_BUCKET "
             "environment variable"
         )
+    return bucket_name
+
+
+async def _download_ranges(
+    s3_client: Any, bucket_name: str, path: str, size: int, buffer: BytesIO
+) -> None:
+    slots = asyncio.Semaphore(PART_CONCURRENCY)
+
+    async def download_part(start: int) -> None:
+        end = min(start + PART_SIZE, size) - 1
+        async with slots:
+            response = await s3_client.get_object(
+                Bucket=bucket_name, Key=path, Range=f"bytes={start}-{end}"
+            )
+            data = await response["Body"].read()
+        buffer.seek(start)
+        buffer.write(data)
+
+    await asyncio.gather(
+        *(download_part(start) for start in range(0, size, PART_SIZE))
+    )
+
+
+def _is_not_modified(error: ClientError) -> bool:
+    metadata = error.response.get("ResponseMetadata", {})
+    return metadata.get("HTTPStatusCode") == 304
+
+
+async def badgerdoc_download(buffer: BytesIO, path: str) -> None:
+    bucket_name = _get_bucket_name()
+    cache = download_cache.get_download_cache()
 
     buffer.seek(0)
     buffer.truncate(0)
 
+    request = {"Bucket": bucket_name, "Key": path}
+    cached_etag = await cache.read(path, buffer) if cache else None
+    if cached_etag:
+        request["IfNoneMatch"] = cached_etag
+
     async with _get_s3_client() as s3_client:
-        response = await s3_client.get_object(Bucket=bucket_name, Key=path)
-        async for chunk in response["Body"]:
-            buffer.write(chunk)
+        try:
+            response = await s3_client.get_object(**request)
+        except ClientError as error:
+            if cache and cached_etag and _is_not_modified(error):
+                cache.record_hit(path)
+                buffer.seek(0)
+                return
+            raise
+
+        buffer.seek(0)
+        buffer.truncate(0)
+        size = response.get("ContentLength")
+        if size and size >= MULTIPART_THRESHOLD:
+            # Large objects are fetched as parallel ranges instead
+            response["Body"].close()
+            await _download_ranges(s3_client, bucket_name, path, size, buffer)
+        else:
+            async for chunk in response["Body"]:
+                buffer.write(chunk)
 
+    if cache:
+        cache.record_miss(path)
+        await cache.write(path, response.get("ETag", ""), buffer)
     buffer.seek(0)
     logger.info("Downloaded permanent file from: %s", path)
 
 
+async def badgerdoc_stream_download(path: str) -> AsyncIterator[bytes]:
+    """Yield the content of a stored file chunk by chunk."""
+    bucket_name = _get_bucket_name()
+
+    async with _get_s3_client() as s3_client:
+        response = await s3_client.get_object(Bucket=bucket_name, Key=path)
+        async for chunk in response["Body"]:
+            yield chunk
+
+    logger.info("Streamed file from: %s", path)
+
+
 async def badgerdoc_download_temp(
     buffer: BytesIO, params: StorageWorkflowParams, file_path: str | list[str]
 ) -> None:
@@ -93,25 +219,147 @@ async def badgerdoc_download_perm(
     return await badgerdoc_download(buffer, build_perm_path(params, file_path))
 
 
-async def badgerdoc_store(buffer: BytesIO, path: str) -> str:
-    bucket_name = os.getenv("BADGERDOC_OBJECT_STORAGE_BUCKET")
-    if not bucket_name:
-        raise ValueError(
-            "Bucket name is required. Set BADGERDOC_OBJECT_STORAGE_BUCKET "
-            "environment variable"
+async def _multipart_upload(
+    s3_client: Any, bucket_name: str, path: str, parts: AsyncIterator[bytes]
+) -> None:
+    upload = await s3_client.create_multipart_upload(
+        Bucket=bucket_name, Key=path
+    )
+    upload_id = upload["UploadId"]
+    # Bounds the number of parts held in memory while they are uploaded
+    slots = asyncio.Semaphore(PART_CONCURRENCY)
+    tasks: list[asyncio.Task] = []
+
+    async def upload_part(part_number: int, body: bytes) -> dict[str, Any]:
+        try:
+            response = await s3_client.upload_part(
+                Bucket=bucket_name,
+                Key=path,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=body,
+            )
+        finally:
+            slots.release()
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
+    try:
+        part_number = 0
+        async for body in parts:
+            await slots.acquire()
+            part_number += 1
+            tasks.append(asyncio.create_task(upload_part(part_number, body)))
+        uploaded_parts = await asyncio.gather(*tasks)
+        await s3_client.complete_multipart_upload(
+            Bucket=bucket_name,
+            Key=path,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": list(uploaded_parts)},
         )
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await s3_client.abort_multipart_upload(
+            Bucket=bucket_name, Key=path, UploadId=upload_id
+        )
+        raise
+
+    logger.info("Uploaded %d parts to: %s", part_number, path)
+
+
+async def _buffer_parts(buffer: BytesIO) -> AsyncIterator[bytes]:
+    while part := buffer.read(PART_SIZE):
+        yield part
+
 
+async def _stream_parts(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    pending = bytearray()
+    async for chunk in chunks:
+        pending += chunk
+        while len(pending) >= PART_SIZE:
+            yield bytes(pending[:PART_SIZE])
+            del pending[:PART_SIZE]
+    if pending:
+        yield bytes(pending)
+
+
+async def _put_buffer(
+    s3_client: Any, bucket_name: str, path: str, buffer: BytesIO
+) -> None:
     buffer.seek(0)
-    async with _get_s3_client() as s3_client:
-        await s3_client.put_object(
-            Bucket=bucket_name, Key=path, Body=buffer.read()
+    if buffer.getbuffer().nbytes >= MULTIPART_THRESHOLD:
+        await _multipart_upload(
+            s3_client, bucket_name, path, _buffer_parts(buffer)
         )
+    else:
+        # The buffer is passed as is, reading it would copy the payload
+        await s3_client.put_object(Bucket=bucket_name, Key=path, Body=buffer)
+
+
+async def badgerdoc_store(buffer: BytesIO, path: str) -> str:
+    bucket_name = _get_bucket_name()
+
+    async with _get_s3_client() as s3_client:
+        await _put_buffer(s3_client, bucket_name, path, buffer)
 
     logger.info("Uploaded file to: %s", path)
     logger.info("Stored temporary file at: %s", path)
     return path
 
 
+async def badgerdoc_store_stream(
+    chunks: AsyncIterable[bytes], path: str
+) -> str:
+    """Store a file from an async byte iterator without buffering it whole.
+
+    Content of up to one part is stored with a single request, larger
+    content as a multipart upload.
+    """
+    bucket_name = _get_bucket_name()
+    parts = _stream_parts(chunks)
+    first_part = await anext(parts, b"")
+    second_part = await anext(parts, None)
+
+    async with _get_s3_client() as s3_client:
+        if second_part is None:
+            await s3_client.put_object(
+                Bucket=bucket_name, Key=path, Body=first_part
+            )
+        else:
+
+            async def all_parts() -> AsyncIterator[bytes]:
+                yield first_part
+                yield second_part
+                async for part in parts:
+                    yield part
+
+            await _multipart_upload(s3_client, bucket_name, path, all_parts())
+
+    logger.info("Stored stream at: %s", path)
+    return path
+
+
+async def badgerdoc_store_many(files: dict[str, BytesIO]) -> list[str]:
+    """Upload several files through one client with bounded concurrency."""
+    bucket_name = _get_bucket_name()
+
+    slots = asyncio.Semaphore(STORE_MANY_CONCURRENCY)
+    async with _get_s3_client() as s3_client:
+
+        async def store(path: str, buffer: BytesIO) -> str:
+            async with slots:
+                await _put_buffer(s3_client, bucket_name, path, buffer)
+            return path
+
+        paths = await asyncio.gather(
+            *(store(path, buffer) for path, buffer in files.items())
+        )
+
+    logger.info("Uploaded %d files", len(paths))
+    return list(paths)
+
+
 async def badgerdoc_store_temp(
     buffer: BytesIO, params: StorageWorkflowParams, file_path: str | list[str]
 ) -> str:
@@ -31,7 +31,6 @@ class BadgerdocWorkflowParams:
     workflow_id: str
     workflow_input: Any = None
     execution_timeout: int | None = None
-    random_postfix: bool = False
 
 
 async def run_child_workflow(params: BadgerdocWorkflowParams) -> str:
@@ -0,0 +1,100 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import ANY, AsyncMock, patch
+
+import pytest
+
+os.environ.setdefault("BADGERDOC_REST_API_RETRY_POLICY", "1,2.0,30,3")
+os.environ.setdefault("TEMPORAL_BADGERDOC_ADDRESS", "http://test:8000")
+os.environ.setdefault("BADGERDOC_TOKEN", "test_token")
+
+from badgerdoc_common.activities.agent_log import (
+    AgentLogBuffer,
+    post_agent_logs,
+)
+
+
+def _messages(send: AsyncMock) -> list[list[str]]:
+    return [
+        [entry.log["message"] for entry in call.args[0]]
+        for call in send.await_args_list
+    ]
+
+
+@pytest.mark.asyncio
+async def test_buffer_sends_full_batches_and_rest_on_exit():
+    send = AsyncMock()
+
+    async with AgentLogBuffer(send, batch_size=2, flush_seconds=60) as logs:
+        for number in range(5):
+            await logs.write(1, None, "INFO", "Temporal", {"message": number})
+
+    assert _messages(send) == [[0, 1], [2, 3], [4]]
+
+
+@pytest.mark.asyncio
+async def test_buffer_sends_queued_lines_after_flush_interval():
+    send = AsyncMock()
+    logs = AgentLogBuffer(send, batch_size=10, flush_seconds=0.01)
+
+    await logs.write(1, 2, "INFO", "Temporal", {"message": "first"})
+    await logs.write(1, 2, "WARNING", "Temporal", {"message": "second"})
+    assert send.await_count == 0
+
+    await asyncio.sleep(0.05)
+
+    assert _messages(send) == [["first", "second"]]
+    entry = send.await_args.args[0][1]
+    assert (entry.document, entry.task, entry.level) == (1, 2, "WARNING")
+
+    await logs.flush()
+    assert send.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_buffer_stamps_lines_when_written():
+    send = AsyncMock()
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    times = iter([start, start + timedelta(seconds=5)])
+
+    async with AgentLogBuffer(
+        send, batch_size=10, flush_seconds=60, now=lambda: next(times)
+    ) as logs:
+        await logs.write(1, None, "INFO", "Temporal", {"message": "first"})
+        await logs.write(1, None, "INFO", "Temporal", {"message": "second"})
+
+    assert [entry.created_at for entry in send.await_args.args[0]] == [
+        "2026-01-01T00:00:00+00:00",
+        "2026-01-01T00:00:05+00:00",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_post_agent_logs_uses_bulk_endpoint():
+    with patch(
+        "badgerdoc_common.activities.agent_log.badgerdoc_http.badgerdoc_post",
+        side_effect=[ConnectionError("unavailable"), None],
+    ) as post:
+        async with AgentLogBuffer(post_agent_logs) as logs:
+            await logs.write(1, None, "INFO", "Temporal", {"message": "a"})
+        # A failed batch is dropped without failing the caller
+        async with AgentLogBuffer(post_agent_logs) as logs:
+            await logs.write(1, None, "INFO", "Temporal", {"message": "b"})
+
+    assert post.await_count == 2
+    assert post.await_args.args == (
+        "/badgerdoc/agent-log/bulk/",
+        {
+            "logs": [
+                {
+                    "document": 1,
+                    "task": None,
+                    "level": "INFO",
+                    "source": "Temporal",
+                    "log": {"message": "b"},
+                    "created_at": ANY,
+                }
+            ]
+        },
+    )
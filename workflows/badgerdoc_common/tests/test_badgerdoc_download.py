@@ -29,7 +29,7 @@ async def test_badgerdoc_download_success():
         "badgerdoc_common.badgerdoc_http.aiohttp.ClientSession"
     ) as mock_session_cls:
         mock_session = MagicMock()
-        mock_session_cls.return_value.__aenter__.return_value = mock_session
+        mock_session_cls.return_value = mock_session
 
         mock_response = MagicMock()
         mock_response.status = 200
@@ -67,7 +67,7 @@ async def test_badgerdoc_download_with_absolute_url():
         "badgerdoc_common.badgerdoc_http.aiohttp.ClientSession"
     ) as mock_session_cls:
         mock_session = MagicMock()
-        mock_session_cls.return_value.__aenter__.return_value = mock_session
+        mock_session_cls.return_value = mock_session
 
         mock_response = MagicMock()
         mock_response.status = 200
@@ -115,7 +115,7 @@ async def test_badgerdoc_download_with_relative_url():
         ),
     ):
         mock_session = MagicMock()
-        mock_session_cls.return_value.__aenter__.return_value = mock_session
+        mock_session_cls.return_value = mock_session
 
         mock_response = MagicMock()
         mock_response.status = 200
@@ -165,7 +165,7 @@ async def test_badgerdoc_download_with_relative_url_starting_with_slash():
         ),
     ):
         mock_session = MagicMock()
-        mock_session_cls.return_value.__aenter__.return_value = mock_session
+        mock_session_cls.return_value = mock_session
 
         mock_response = MagicMock()
         mock_response.status = 200
@@ -206,7 +206,7 @@ async def test_badgerdoc_download_clears_buffer():
         "badgerdoc_common.badgerdoc_http.aiohttp.ClientSession"
     ) as mock_session_cls:
         mock_session = MagicMock()
-        mock_session_cls.return_value.__aenter__.return_value = mock_session
+        mock_session_cls.return_value = mock_session
 
         mock_response = MagicMock()
         mock_response.status = 200
@@ -243,7 +243,7 @@ async def test_badgerdoc_download_resets_buffer_position():
         "badgerdoc_common.badgerdoc_http.aiohttp.ClientSession"
     ) as mock_session_cls:
         mock_session = MagicMock()
-        mock_session_cls.return_value.__aenter__.return_value = mock_session
+        mock_session_cls.return_value = mock_session
 
         mock_response = MagicMock()
         mock_response.status = 200
@@ -281,7 +281,7 @@ async def test_badgerdoc_download_large_file_chunked():
         "badgerdoc_common.badgerdoc_http.aiohttp.ClientSession"
     ) as mock_session_cls:
         mock_session = MagicMock()
-        mock_session_cls.return_value.__aenter__.return_value = mock_session
+        mock_session_cls.return_value = mock_session
 
         mock_response = MagicMock()
         mock_response.status = 200
@@ -350,7 +350,7 @@ async def test_badgerdoc_download_http_error():
         "badgerdoc_common.badgerdoc_http.aiohttp.ClientSession"
     ) as mock_session_cls:
         mock_session = MagicMock()
-        mock_session_cls.return_value.__aenter__.return_value = mock_session
+        mock_session_cls.return_value = mock_session
 
         mock_response = MagicMock()
         mock_response.status = 404
@@ -391,7 +391,7 @@ async def test_badgerdoc_download_includes_authorization_header():
         patch.object(badgerdoc_http, "BADGERDOC_TOKEN", "test_token_123"),
     ):
         mock_session = MagicMock()
-        mock_session_cls.return_value.__aenter__.return_value = mock_session
+        mock_session_cls.return_value = mock_session
 
         mock_response = MagicMock()
         mock_response.status = 200
@@ -415,3 +415,37 @@ async def test_badgerdoc_download_includes_authorization_header():
         assert (
             call_kwargs["headers"]["Authorization"] == "Token test_token_123"
         )
+
+
+@pytest.mark.asyncio
+async def test_requests_share_pooled_session():
+    from badgerdoc_common import badgerdoc_http
+
+    await badgerdoc_http.close_session()
+
+    with patch(
+        "badgerdoc_common.badgerdoc_http.aiohttp.ClientSession"
+    ) as mock_session_cls:
+        mock_session = MagicMock()
+        mock_session.closed = False
+        mock_session.close = AsyncMock()
+        mock_session_cls.return_value = mock_session
+
+        mock_response = MagicMock()
+        mock_response.status = 200
+        mock_response.text = AsyncMock(return_value="{}")
+        mock_response.json = AsyncMock(return_value={"id": 1})
+
+        mock_request_ctx = AsyncMock()
+        mock_request_ctx.__aenter__.return_value = mock_response
+        mock_request_ctx.__aexit__.return_value = None
+        mock_session.request.return_value = mock_request_ctx
+
+        assert await badgerdoc_http.badgerdoc_get("/first/") == {"id": 1}
+        assert await badgerdoc_http.badgerdoc_post("/second/", {}) == {"id": 1}
+
+        mock_session_cls.assert_called_once()
+        assert mock_session.request.call_count == 2
+
+        await badgerdoc_http.close_session()
+        mock_session.close.assert_awaited_once()
@@ -15,7 +15,6 @@ from badgerdoc_common.activities import document as doc_module
 from badgerdoc_common.activities.document import (
     BadgerdocDocument,
     DocumentChunkRequest,
-    ListDocumentsResponse,
 )
 from badgerdoc_common.activities.extraction import (
     BadgerdocExtractionPage,
@@ -96,58 +95,54 @@ async def test_empty_params_returns_empty_container():
 @pytest.mark.asyncio
 async def test_linked_documents_expanded_to_rendition_pages():
     doc = _make_document(1)
-    rendition_info_1 = _make_rendition(10, page_num=1)
-    rendition_info_2 = _make_rendition(11, page_num=2)
+    other_doc = _make_document(2)
     fetched_1 = _make_rendition(10, page_num=1)
     fetched_2 = _make_rendition(11, page_num=2)
+    fetched_3 = _make_rendition(12, page_num=1)
 
-    params = _make_params(linked_documents=[doc])
+    params = _make_params(linked_documents=[doc, other_doc])
 
     mock = _make_activity_mock(
         {
-            doc_module.badgerdoc_list_documents: ListDocumentsResponse(
-                documents=[rendition_info_1, rendition_info_2], count=2
-            ),
-            doc_module.badgerdoc_get_rendition: [fetched_1, fetched_2],
+            doc_module.badgerdoc_get_renditions_by_page: {
+                1: {1: fetched_1, 2: fetched_2},
+                2: {1: fetched_3},
+            },
         }
     )
 
     with patch(EXECUTE_ACTIVITY, new=mock):
         result = await trigger_params_to_ocr_page(params)
 
-    assert len(result.pages) == 2
+    mock.assert_awaited_once()
+    assert mock.call_args.args[1] == [1, 2]
+    assert len(result.pages) == 3
     assert len(result.blocks) == 0
-    page_nums = {r.badgerdoc_document.page_num for r in result.pages}
-    assert page_nums == {1, 2}
-    result_docs = [r.badgerdoc_document.document for r in result.pages]
-    assert fetched_1 in result_docs
-    assert fetched_2 in result_docs
+    result_docs = [
+        (r.badgerdoc_document.page_num, r.badgerdoc_document.document)
+        for r in result.pages
+    ]
+    assert result_docs == [(1, fetched_1), (2, fetched_2), (1, fetched_3)]
 
 
 @pytest.mark.asyncio
-async def test_linked_documents_rendition_missing_page_skipped(caplog):
+async def test_linked_documents_without_renditions_logged(caplog):
     doc = _make_document(1)
-    bad_rendition = BadgerdocDocument(id=99, metadata={})
-    good_rendition = _make_rendition(10, page_num=1)
-    fetched = _make_rendition(10, page_num=1)
 
     params = _make_params(linked_documents=[doc])
 
     mock = _make_activity_mock(
         {
-            doc_module.badgerdoc_list_documents: ListDocumentsResponse(
-                documents=[bad_rendition, good_rendition], count=2
-            ),
-            doc_module.badgerdoc_get_rendition: fetched,
+            doc_module.badgerdoc_get_renditions_by_page: {1: {}},
         }
     )
 
-    caplog.set_level(logging.ERROR, logger="badgerdoc_common.badgerdoc_ocr")
+    caplog.set_level(logging.WARNING, logger="badgerdoc_common.badgerdoc_ocr")
     with patch(EXECUTE_ACTIVITY, new=mock):
         result = await trigger_params_to_ocr_page(params)
 
-    assert len(result.pages) == 1
-    assert "no page in metadata" in caplog.text
+    assert len(result.pages) == 0
+    assert "has no renditions" in caplog.text
 
 
 @pytest.mark.asyncio
@@ -167,7 +162,6 @@ async def test_linked_document_pages_added():
 @pytest.mark.asyncio
 async def test_linked_document_pages_duplicate_skipped(caplog):
     original_doc = _make_document(1)
-    rendition_info = _make_rendition(10, page_num=1)
     fetched = _make_rendition(10, page_num=1)
 
     duplicate_rendition = _make_document(10, parent_id=1)
@@ -182,10 +176,7 @@ async def test_linked_document_pages_duplicate_skipped(caplog):
 
     mock = _make_activity_mock(
         {
-            doc_module.badgerdoc_list_documents: ListDocumentsResponse(
-                documents=[rendition_info], count=1
-            ),
-            doc_module.badgerdoc_get_rendition: fetched,
+            doc_module.badgerdoc_get_renditions_by_page: {1: {1: fetched}},
         }
     )
 
@@ -200,7 +191,6 @@ async def test_linked_document_pages_duplicate_skipped(caplog):
 @pytest.mark.asyncio
 async def test_linked_document_pages_non_duplicate_added():
     original_doc = _make_document(1)
-    rendition_info = _make_rendition(10, page_num=1)
     fetched = _make_rendition(10, page_num=1)
 
     other_rendition = _make_document(20, parent_id=2)
@@ -215,10 +205,7 @@ async def test_linked_document_pages_non_duplicate_added():
 
     mock = _make_activity_mock(
         {
-            doc_module.badgerdoc_list_documents: ListDocumentsResponse(
-                documents=[rendition_info], count=1
-            ),
-            doc_module.badgerdoc_get_rendition: fetched,
+            doc_module.badgerdoc_get_renditions_by_page: {1: {1: fetched}},
         }
     )
 
@@ -294,7 +281,6 @@ async def test_linked_extraction_xpaths_chunk_request_args():
 @pytest.mark.asyncio
 async def test_all_sources_combined():
     doc = _make_document(1)
-    rendition_info = _make_rendition(10, page_num=1)
     fetched = _make_rendition(10, page_num=1)
 
     other_rendition = _make_document(20, parent_id=2)
@@ -318,10 +304,7 @@ async def test_all_sources_combined():
 
     mock = _make_activity_mock(
         {
-            doc_module.badgerdoc_list_documents: ListDocumentsResponse(
-                documents=[rendition_info], count=1
-            ),
-            doc_module.badgerdoc_get_rendition: fetched,
+            doc_module.badgerdoc_get_renditions_by_page: {1: {1: fetched}},
             doc_module.badgerdoc_get_document_chunk: chunk_doc,
         }
     )
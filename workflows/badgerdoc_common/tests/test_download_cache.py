@@ -0,0 +1,158 @@
+import os
+from io import BytesIO
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+os.environ.setdefault("BADGERDOC_REST_API_RETRY_POLICY", "1,2.0,30,3")
+os.environ.setdefault("TEMPORAL_BADGERDOC_ADDRESS", "http://test:8000")
+os.environ.setdefault("BADGERDOC_TOKEN", "test_token")
+os.environ.setdefault("TEMPORAL_ADDRESS", "localhost:7233")
+os.environ.setdefault("BADGERDOC_REST_API_START_TO_CLOSE_TIMEOUT", "5")
+os.environ.setdefault("BADGERDOC_OBJECT_STORAGE_BUCKET", "test-bucket")
+
+from badgerdoc_common.badgerdoc_http import badgerdoc_download_url
+from badgerdoc_common.download_cache import DownloadCache
+from badgerdoc_common.storage import badgerdoc_download
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = DownloadCache(str(tmp_path), max_bytes=1024)
+    with patch(
+        "badgerdoc_common.download_cache.get_download_cache",
+        return_value=cache,
+    ):
+        yield cache
+
+
+@pytest.mark.asyncio
+async def test_download_cache_round_trip(cache):
+    await cache.write("renditions/1.png", '"etag-1"', BytesIO(b"image"))
+
+    buffer = BytesIO(b"stale")
+    etag = await cache.read("renditions/1.png", buffer)
+
+    assert etag == '"etag-1"'
+    assert buffer.getvalue() == b"image"
+    assert buffer.tell() == 0
+    assert await cache.read("renditions/2.png", BytesIO()) is None
+
+
+@pytest.mark.asyncio
+async def test_download_cache_read_survives_concurrent_eviction(cache):
+    await cache.write("a", "etag-a", BytesIO(b"content"))
+
+    buffer = BytesIO()
+    with patch(
+        "badgerdoc_common.download_cache.os.utime",
+        side_effect=FileNotFoundError,
+    ):
+        etag = await cache.read("a", buffer)
+
+    assert etag == "etag-a"
+    assert buffer.getvalue() == b"content"
+
+
+@pytest.mark.asyncio
+async def test_download_cache_evicts_least_recently_used(cache):
+    await cache.write("a", "etag-a", BytesIO(b"a" * 400))
+    await cache.write("b", "etag-b", BytesIO(b"b" * 400))
+    os.utime(cache._entry_path("a"), (1, 1))
+    os.utime(cache._entry_path("b"), (2, 2))
+
+    await cache.read("a", BytesIO())
+    await cache.write("c", "etag-c", BytesIO(b"c" * 400))
+
+    assert await cache.read("a", BytesIO()) == "etag-a"
+    assert await cache.read("b", BytesIO()) is None
+    assert await cache.read("c", BytesIO()) == "etag-c"
+    assert cache.stats.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_download_cache_skips_entries_over_budget(cache):
+    await cache.write("big", "etag", BytesIO(b"x" * 2048))
+
+    assert await cache.read("big", BytesIO()) is None
+
+
+@pytest.mark.asyncio
+async def test_storage_download_is_served_from_cache_when_not_modified(
+    cache,
+):
+    await cache.write("hocr/1.html", '"etag-1"', BytesIO(b"<html/>"))
+    not_modified = ClientError(
+        {
+            "Error": {"Code": "304"},
+            "ResponseMetadata": {"HTTPStatusCode": 304},
+        },
+        "GetObject",
+    )
+
+    with patch("badgerdoc_common.storage._get_s3_client") as mock_get_client:
+        mock_s3_client = AsyncMock()
+        mock_get_client.return_value.__aenter__.return_value = mock_s3_client
+        mock_get_client.return_value.__aexit__.return_value = None
+        mock_s3_client.get_object.side_effect = not_modified
+
+        buffer = BytesIO()
+        await badgerdoc_download(buffer, "hocr/1.html")
+
+    assert buffer.getvalue() == b"<html/>"
+    mock_s3_client.get_object.assert_awaited_once_with(
+        Bucket="test-bucket", Key="hocr/1.html", IfNoneMatch='"etag-1"'
+    )
+    assert cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_storage_download_refreshes_changed_object(cache):
+    await cache.write("hocr/1.html", '"etag-1"', BytesIO(b"old"))
+
+    async def mock_chunks():
+        yield b"new"
+
+    with patch("badgerdoc_common.storage._get_s3_client") as mock_get_client:
+        mock_s3_client = AsyncMock()
+        mock_get_client.return_value.__aenter__.return_value = mock_s3_client
+        mock_get_client.return_value.__aexit__.return_value = None
+        mock_s3_client.get_object.return_value = {
+            "Body": mock_chunks(),
+            "ETag": '"etag-2"',
+        }
+
+        buffer = BytesIO()
+        await badgerdoc_download(buffer, "hocr/1.html")
+
+    assert buffer.getvalue() == b"new"
+    assert cache.stats.misses == 1
+    assert await cache.read("hocr/1.html", BytesIO()) == '"etag-2"'
+
+
+@pytest.mark.asyncio
+async def test_http_download_keys_cache_by_url_path(cache):
+    await cache.write("/bucket/page-1.png", '"etag-1"', BytesIO(b"png"))
+
+    with patch(
+        "badgerdoc_common.badgerdoc_http.aiohttp.ClientSession"
+    ) as mock_session_cls:
+        mock_session = MagicMock()
+        mock_session_cls.return_value = mock_session
+        mock_response = MagicMock()
+        mock_response.status = 304
+        mock_get_ctx = AsyncMock()
+        mock_get_ctx.__aenter__.return_value = mock_response
+        mock_get_ctx.__aexit__.return_value = None
+        mock_session.get.return_value = mock_get_ctx
+
+        buffer = BytesIO()
+        await badgerdoc_download_url(
+            buffer, "http://minio:9000/bucket/page-1.png?X-Amz-Signature=abc"
+        )
+
+    assert buffer.getvalue() == b"png"
+    headers = mock_session.get.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == '"etag-1"'
+    assert cache.stats.hits == 1
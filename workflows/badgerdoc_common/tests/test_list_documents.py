@@ -0,0 +1,101 @@
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+os.environ.setdefault("BADGERDOC_REST_API_RETRY_POLICY", "1,2.0,30,3")
+os.environ.setdefault("TEMPORAL_BADGERDOC_ADDRESS", "http://test:8000")
+os.environ.setdefault("BADGERDOC_TOKEN", "test_token")
+os.environ.setdefault("TEMPORAL_ADDRESS", "localhost:7233")
+os.environ.setdefault("BADGERDOC_REST_API_START_TO_CLOSE_TIMEOUT", "5")
+
+from badgerdoc_common import badgerdoc_http
+from badgerdoc_common.activities import document as document_module
+from badgerdoc_common.activities.document import (
+    ListDocumentsRequest,
+    badgerdoc_get_renditions_by_page,
+    badgerdoc_list_documents,
+)
+
+
+@pytest.mark.asyncio
+async def test_list_children_reads_tree_export_once():
+    async def export(url, params=None):
+        assert url == "/badgerdoc/document/7/tree/"
+        assert params == {"tags": "rendition", "metadata": "{}", "depth": "1"}
+        for document_id in (8, 9):
+            yield {"id": document_id, "parent_document_id": 7}
+
+    with patch.object(
+        badgerdoc_http, "badgerdoc_get_ndjson", side_effect=export
+    ) as mock_export:
+        response = await badgerdoc_list_documents(
+            ListDocumentsRequest(tags=["rendition"], parent_document_id=7)
+        )
+
+    mock_export.assert_called_once()
+    assert [d.id for d in response.documents] == [8, 9]
+    assert response.count == 2
+
+
+@pytest.mark.asyncio
+async def test_list_children_of_missing_document_is_empty():
+    async def export(url, params=None):
+        raise badgerdoc_http.BadgerdocDoesNotExist(MagicMock(), (), status=404)
+        yield  # pragma: no cover
+
+    with patch.object(
+        badgerdoc_http, "badgerdoc_get_ndjson", side_effect=export
+    ):
+        response = await badgerdoc_list_documents(
+            ListDocumentsRequest(parent_document_id=7)
+        )
+
+    assert response.documents == []
+
+
+@pytest.mark.asyncio
+async def test_list_root_documents_follows_cursor():
+    pages = [
+        {"results": [{"id": 3}], "next": "?metadata=%7B%7D&cursor=abc"},
+        {"results": [{"id": 2}], "next": None},
+    ]
+
+    with patch.object(
+        badgerdoc_http, "badgerdoc_get", AsyncMock(side_effect=pages)
+    ) as mock_get:
+        response = await badgerdoc_list_documents(ListDocumentsRequest())
+
+    assert [d.id for d in response.documents] == [3, 2]
+    assert mock_get.call_args_list[0].kwargs["params"] == {
+        "metadata": "{}",
+        "cursor": "",
+        "page_size": "100",
+    }
+    assert mock_get.call_args_list[1].kwargs["params"] == {
+        "metadata": "{}",
+        "cursor": "abc",
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_renditions_by_page_batches_documents():
+    responses = [
+        {"results": {"1": {"2": {"id": 10}, "1": {"id": 11}}, "2": {}}},
+        {"results": {"3": {"1": {"id": 12}}}},
+    ]
+
+    with patch.object(document_module, "RENDITIONS_BY_PAGE_MAX_DOCUMENTS", 2):
+        with patch.object(
+            badgerdoc_http, "badgerdoc_get", AsyncMock(side_effect=responses)
+        ) as mock_get:
+            renditions = await badgerdoc_get_renditions_by_page([1, 2, 3])
+
+    assert [c.kwargs["params"] for c in mock_get.call_args_list] == [
+        {"document_ids": "1,2"},
+        {"document_ids": "3"},
+    ]
+    assert {
+        document_id: {page: r.id for page, r in pages.items()}
+        for document_id, pages in renditions.items()
+    } == {1: {2: 10, 1: 11}, 2: {}, 3: {1: 12}}
@@ -1,6 +1,6 @@
 import os
 from io import BytesIO
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -16,12 +16,18 @@ os.environ.setdefault("BADGERDOC_OBJECT_STORAGE_URL", "http://localhost:9000")
 os.environ.setdefault("BADGERDOC_OBJECT_STORAGE_REGION", "us-east-1")
 os.environ.setdefault("BADGERDOC_OBJECT_STORAGE_ADDRESSING_STYLE", "path")
 
+from badgerdoc_common import storage
 from badgerdoc_common.storage import (
     StorageWorkflowParams,
+    badgerdoc_download,
     badgerdoc_download_perm,
     badgerdoc_download_temp,
+    badgerdoc_store,
+    badgerdoc_store_many,
     badgerdoc_store_perm,
+    badgerdoc_store_stream,
     badgerdoc_store_temp,
+    badgerdoc_stream_download,
 )
 
 
@@ -117,6 +123,27 @@ async def test_badgerdoc_store_perm_with_filename():
         assert call_args[0][1] == expected_path
 
 
+@pytest.mark.asyncio
+async def test_badgerdoc_store_perm_under_document_prefix():
+    params = StorageWorkflowParams(
+        workflow_package="test_workflow",
+        workflow_name="TestWorkflow",
+        workflow_id="workflow-123",
+        document_id=7,
+    )
+
+    with patch("badgerdoc_common.storage.badgerdoc_store"):
+        result = await badgerdoc_store_perm(
+            BytesIO(b"<html/>"), params, "page_1.hocr"
+        )
+
+    assert result == (
+        "data/workflows/documents/7/test_workflow/TestWorkflow/"
+        "workflow-123/page_1.hocr"
+    )
+    assert result.startswith(storage.document_perm_prefix(7))
+
+
 @pytest.mark.asyncio
 async def test_badgerdoc_store_perm_without_filename():
     params = StorageWorkflowParams(
@@ -361,3 +388,209 @@ async def test_badgerdoc_download_perm_missing_bucket():
         os.environ.pop("BADGERDOC_OBJECT_STORAGE_BUCKET", None)
         with pytest.raises(ValueError, match="Bucket name is required"):
             await badgerdoc_download_perm(buffer, params, path)
+
+
+@pytest.mark.asyncio
+async def test_badgerdoc_store_many_uses_one_client():
+    buffers = {
+        "derived/1/run/0/0_0.png": BytesIO(b"tile-0"),
+        "derived/1/run/1/0_0.png": BytesIO(b"tile-1"),
+    }
+    buffers["derived/1/run/1/0_0.png"].seek(3)
+
+    with patch("badgerdoc_common.storage._get_s3_client") as mock_get_client:
+        mock_s3_client = AsyncMock()
+        mock_get_client.return_value.__aenter__.return_value = mock_s3_client
+        mock_get_client.return_value.__aexit__.return_value = None
+
+        result = await badgerdoc_store_many(buffers)
+
+    assert result == list(buffers)
+    mock_get_client.assert_called_once()
+    assert sorted(
+        (c.kwargs["Key"], c.kwargs["Body"].getvalue())
+        for c in mock_s3_client.put_object.call_args_list
+    ) == [
+        ("derived/1/run/0/0_0.png", b"tile-0"),
+        ("derived/1/run/1/0_0.png", b"tile-1"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_s3_client_is_created_once_per_process():
+    client_cm = MagicMock()
+    client_cm.__aenter__ = AsyncMock(return_value="client")
+    client_cm.__aexit__ = AsyncMock(return_value=None)
+
+    with patch(
+        "badgerdoc_common.storage._create_s3_client", return_value=client_cm
+    ) as mock_create:
+        try:
+            async with storage._get_s3_client() as first:
+                pass
+            async with storage._get_s3_client() as second:
+                pass
+        finally:
+            await storage.close_s3_client()
+
+    assert first == second == "client"
+    mock_create.assert_called_once()
+    client_cm.__aexit__.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_badgerdoc_store_uses_multipart_above_threshold():
+    content = b"0123456789"
+
+    with patch("badgerdoc_common.storage._get_s3_client") as mock_get_client:
+        mock_s3_client = AsyncMock()
+        mock_get_client.return_value.__aenter__.return_value = mock_s3_client
+        mock_get_client.return_value.__aexit__.return_value = None
+        mock_s3_client.create_multipart_upload.return_value = {
+            "UploadId": "upload-1"
+        }
+        mock_s3_client.upload_part.side_effect = [
+            {"ETag": f"etag-{i}"} for i in range(3)
+        ]
+
+        with (
+            patch.object(storage, "MULTIPART_THRESHOLD", 8),
+            patch.object(storage, "PART_SIZE", 4),
+        ):
+            await badgerdoc_store(BytesIO(content), "big.bin")
+
+    mock_s3_client.put_object.assert_not_called()
+    assert [
+        c.kwargs["Body"] for c in mock_s3_client.upload_part.call_args_list
+    ] == [b"0123", b"4567", b"89"]
+    mock_s3_client.complete_multipart_upload.assert_awaited_once_with(
+        Bucket="test-bucket",
+        Key="big.bin",
+        UploadId="upload-1",
+        MultipartUpload={
+            "Parts": [
+                {"ETag": "etag-0", "PartNumber": 1},
+                {"ETag": "etag-1", "PartNumber": 2},
+                {"ETag": "etag-2", "PartNumber": 3},
+            ]
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_badgerdoc_store_aborts_failed_multipart_upload():
+    with patch("badgerdoc_common.storage._get_s3_client") as mock_get_client:
+        mock_s3_client = AsyncMock()
+        mock_get_client.return_value.__aenter__.return_value = mock_s3_client
+        mock_get_client.return_value.__aexit__.return_value = None
+        mock_s3_client.create_multipart_upload.return_value = {
+            "UploadId": "upload-1"
+        }
+        mock_s3_client.upload_part.side_effect = RuntimeError("boom")
+
+        with (
+            patch.object(storage, "MULTIPART_THRESHOLD", 8),
+            patch.object(storage, "PART_SIZE", 4),
+        ):
+            with pytest.raises(RuntimeError, match="boom"):
+                await badgerdoc_store(BytesIO(b"0123456789"), "big.bin")
+
+    mock_s3_client.complete_multipart_upload.assert_not_called()
+    mock_s3_client.abort_multipart_upload.assert_awaited_once_with(
+        Bucket="test-bucket", Key="big.bin", UploadId="upload-1"
+    )
+
+
+@pytest.mark.asyncio
+async def test_badgerdoc_download_fetches_large_objects_by_range():
+    content = b"0123456789"
+
+    async def get_object(Bucket, Key, Range=None):
+        if Range is None:
+            return {"Body": MagicMock(), "ContentLength": len(content)}
+        start, end = map(int, Range.removeprefix("bytes=").split("-"))
+        body = AsyncMock()
+        body.read.return_value = content[start : end + 1]
+        return {"Body": body}
+
+    buffer = BytesIO()
+    with patch("badgerdoc_common.storage._get_s3_client") as mock_get_client:
+        mock_s3_client = AsyncMock()
+        mock_get_client.return_value.__aenter__.return_value = mock_s3_client
+        mock_get_client.return_value.__aexit__.return_value = None
+        mock_s3_client.get_object.side_effect = get_object
+
+        with (
+            patch.object(storage, "MULTIPART_THRESHOLD", 8),
+            patch.object(storage, "PART_SIZE", 4),
+        ):
+            await badgerdoc_download(buffer, "big.bin")
+
+    assert buffer.getvalue() == content
+    assert buffer.tell() == 0
+    assert [
+        c.kwargs.get("Range") for c in mock_s3_client.get_object.call_args_list
+    ] == [None, "bytes=0-3", "bytes=4-7", "bytes=8-9"]
+
+
+@pytest.mark.asyncio
+async def test_badgerdoc_stream_download_yields_chunks():
+    with patch("badgerdoc_common.storage._get_s3_client") as mock_get_client:
+        mock_s3_client = AsyncMock()
+        mock_get_client.return_value.__aenter__.return_value = mock_s3_client
+        mock_get_client.return_value.__aexit__.return_value = None
+
+        async def mock_chunks():
+            yield b"first"
+            yield b"second"
+
+        mock_s3_client.get_object.return_value = {"Body": mock_chunks()}
+
+        chunks = [chunk async for chunk in badgerdoc_stream_download("a")]
+
+    assert chunks == [b"first", b"second"]
+
+
+@pytest.mark.asyncio
+async def test_badgerdoc_store_stream_small_content_uses_put_object():
+    async def chunks():
+        yield b"ab"
+        yield b"c"
+
+    with patch("badgerdoc_common.storage._get_s3_client") as mock_get_client:
+        mock_s3_client = AsyncMock()
+        mock_get_client.return_value.__aenter__.return_value = mock_s3_client
+        mock_get_client.return_value.__aexit__.return_value = None
+
+        result = await badgerdoc_store_stream(chunks(), "small.bin")
+
+    assert result == "small.bin"
+    mock_s3_client.put_object.assert_awaited_once_with(
+        Bucket="test-bucket", Key="small.bin", Body=b"abc"
+    )
+    mock_s3_client.create_multipart_upload.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_badgerdoc_store_stream_regroups_chunks_into_parts():
+    async def chunks():
+        yield b"012"
+        yield b"3456"
+        yield b"789"
+
+    with patch("badgerdoc_common.storage._get_s3_client") as mock_get_client:
+        mock_s3_client = AsyncMock()
+        mock_get_client.return_value.__aenter__.return_value = mock_s3_client
+        mock_get_client.return_value.__aexit__.return_value = None
+        mock_s3_client.create_multipart_upload.return_value = {
+            "UploadId": "upload-1"
+        }
+        mock_s3_client.upload_part.return_value = {"ETag": "etag"}
+
+        with patch.object(storage, "PART_SIZE", 4):
+            await badgerdoc_store_stream(chunks(), "big.bin")
+
+    mock_s3_client.put_object.assert_not_called()
+    assert [
+        c.kwargs["Body"] for c in mock_s3_client.upload_part.call_args_list
+    ] == [b"0123", b"4567", b"89"]
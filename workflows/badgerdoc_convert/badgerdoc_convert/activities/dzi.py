@@ -1,17 +1,29 @@
 import logging
 import math
+import os
 import xml.etree.ElementTree as ET  # nosec B405
 from dataclasses import dataclass
 from io import BytesIO
+from uuid import uuid4
 
 from PIL import Image
 from temporalio import activity
 
-from badgerdoc_common import badgerdoc_http
+from badgerdoc_common import badgerdoc_http, storage
 from badgerdoc_common.activities import document
 
 MAX_TILE_WIDTH = 2048
 TILE_SIZE = 2048
+# Levels with at least this many pixels are downsampled one strip at a time
+# to bound the memory used by the resampling buffers.
+STRIP_MODE_MIN_PIXELS = int(
+    os.getenv("BADGERDOC_DZI_STRIP_MODE_MIN_PIXELS", "50000000")
+)
+# "document" uploads every tile through the document API, "bulk" writes the
+# tiles of a level to object storage and registers them in one API call.
+# "manifest" only writes the tiles to object storage: the DZI xml document
+# of the page records their prefix and no document is created per tile.
+TILE_UPLOAD_MODE = os.getenv("BADGERDOC_DZI_TILE_UPLOAD_MODE", "document")
 
 
 logger = logging.getLogger(__name__)
@@ -20,7 +32,8 @@ logger = logging.getLogger(__name__)
 @dataclass
 class TileData:
     path: str
-    document_id: int
+    # None when the tile is not registered as a document ("manifest" mode)
+    document_id: int | None
     tags: list[str]
 
 
@@ -42,6 +55,8 @@ class DZIConvertResult:
 class DZIConverter:
     def __init__(self, tile_size=TILE_SIZE):
         self.tile_size = tile_size
+        # Keeps the storage keys of a re-run apart from the previous tiles
+        self.run_id = uuid4().hex
 
     def calculate_tile_dimensions(
         self, image_width: int, image_height: int
@@ -59,30 +74,53 @@ class DZIConverter:
         max_dim = max(image_width, image_height)
         return math.ceil(math.log2(max_dim)) + 1
 
-    async def create_pyramid_level(
+    def level_size(
+        self, image_width: int, image_height: int, level: int, max_level: int
+    ) -> tuple[int, int]:
+        scale = 2 ** (max_level - level)
+        return (
+            max(1, math.ceil(image_width / scale)),
+            max(1, math.ceil(image_height / scale)),
+        )
+
+    def downsample(
+        self, image: Image.Image, size: tuple[int, int]
+    ) -> Image.Image:
+        if image.width * image.height < STRIP_MODE_MIN_PIXELS:
+            return image.resize(size, Image.Resampling.LANCZOS)
+
+        # Strip mode: resample horizontal bands of the target level. The
+        # box keeps neighbouring source rows in the filter support, so the
+        # bands join without seams.
+        width, height = size
+        scale_y = image.height / height
+        scaled_image = Image.new(image.mode, size)
+        for top in range(0, height, self.tile_size):
+            bottom = min(top + self.tile_size, height)
+            strip = image.resize(
+                (width, bottom - top),
+                Image.Resampling.LANCZOS,
+                box=(0, top * scale_y, image.width, bottom * scale_y),
+            )
+            scaled_image.paste(strip, (0, top))
+            del strip
+        return scaled_image
+
+    async def tile_level(
         self,
-        image: Image.Image,
+        scaled_image: Image.Image,
         level: int,
-        max_level: int,
         source_document: document.BadgerdocDocument,
     ) -> PyramidLevelResult:
-
-        scale = 2 ** (max_level - level)
-
-        scaled_width = max(1, math.ceil(image.width / scale))
-        scaled_height = max(1, math.ceil(image.height / scale))
-
+        scaled_width, scaled_height = scaled_image.size
         tile_width = self.tile_size
 
-        scaled_image = image.resize(
-            (scaled_width, scaled_height), Image.Resampling.LANCZOS
-        )
-
         cols = math.ceil(scaled_width / tile_width)
         rows = math.ceil(scaled_height / tile_width)
 
         tiles_created = 0
         tile_data: list[TileData] = []
+        pending_tiles: dict[str, BytesIO] = {}
 
         for row in range(rows):
             for col in range(cols):
@@ -109,6 +147,10 @@ class DZIConverter:
                         logger.warning("Setting default page")
                         page = 1
 
+                    if TILE_UPLOAD_MODE in ("bulk", "manifest"):
+                        pending_tiles[tile_path] = tile_buffer
+                        continue
+
                     uploaded_doc = await document.badgerdoc_upload_document(
                         document.BadgerdocDocument(
                             name=f"{level}_{col}_{row}.png",
@@ -132,12 +174,64 @@ class DZIConverter:
 
                     tiles_created += 1
 
+        if pending_tiles:
+            tile_data = await self.store_tiles(
+                pending_tiles, level, page, source_document
+            )
+            tiles_created = len(tile_data)
+
         return PyramidLevelResult(
             tiles_created=tiles_created,
             grid_size=(cols, rows),
             tile_data=tile_data,
         )
 
+    def tiles_prefix(self, source_document: document.BadgerdocDocument) -> str:
+        return f"derived/{source_document.id}/{self.run_id}"
+
+    async def store_tiles(
+        self,
+        tiles: dict[str, BytesIO],
+        level: int,
+        page: int,
+        source_document: document.BadgerdocDocument,
+    ) -> list[TileData]:
+        prefix = self.tiles_prefix(source_document)
+        keys = {tile_path: f"{prefix}/{tile_path}" for tile_path in tiles}
+        await storage.badgerdoc_store_many(
+            {keys[tile_path]: buffer for tile_path, buffer in tiles.items()}
+        )
+
+        if TILE_UPLOAD_MODE == "manifest":
+            return [
+                TileData(path=tile_path, document_id=None, tags=[])
+                for tile_path in tiles
+            ]
+
+        registered = await document.badgerdoc_create_documents(
+            source_document.id,  # type: ignore
+            [
+                document.BadgerdocDocument(
+                    name=tile_path.replace("/", "_"),
+                    file=keys[tile_path],
+                    metadata={"page": page},
+                    tags=["dzi", tile_path],
+                    extension="png",
+                )
+                for tile_path in tiles
+            ],
+        )
+        logger.info("Registered %d tiles of level %s", len(registered), level)
+
+        return [
+            TileData(
+                path=tile_path,
+                document_id=registered_doc.id,  # type: ignore
+                tags=["dzi", tile_path],
+            )
+            for tile_path, registered_doc in zip(tiles, registered)
+        ]
+
     def create_dzi_xml(self, image_width, image_height):
         root = ET.Element("Image")
         root.set("xmlns", "http://schemas.microsoft.com/deepzoom/2008")
@@ -180,6 +274,9 @@ class DZIConverter:
         logger.info("Creating tiles for document: %s", source_document.id)
 
         image_ = Image.open(image_)  # type: ignore
+        if image_.mode not in ("RGB", "RGBA", "L", "LA"):
+            # Palette and bilevel images can not be resampled with LANCZOS
+            image_ = image_.convert("RGBA")
         image_width, image_height = image_.size
 
         logger.info("Image size: %sx%s", image_width, image_height)
@@ -196,37 +293,66 @@ class DZIConverter:
             logger.warning("Setting default page")
             page = 1
 
-        dzi_upload_result = await document.badgerdoc_upload_document(
-            document.BadgerdocDocument(
-                name=dzi_filename,
-                metadata={"page": page},
-                tags=["dzi", "xml"],
-                parent_document_id=source_document.id,
-                extension="xml",
-            ),
-            dzi_buffer,
+        dzi_document = document.BadgerdocDocument(
+            name=dzi_filename,
+            metadata={"page": page},
+            tags=["dzi", "xml"],
+            parent_document_id=source_document.id,
+            extension="xml",
         )
-
         levels = self.calculate_pyramid_levels(image_width, image_height)
 
-        logger.info("Count of levels: %s", levels)
+        if TILE_UPLOAD_MODE == "manifest":
+            # The xml document is the manifest of the page, it is uploaded
+            # after the tiles so it never points to an incomplete pyramid.
+            dzi_document.metadata = {
+                "page": page,
+                "tiles_prefix": self.tiles_prefix(source_document),
+                "levels": levels,
+                "tile_size": self.tile_size,
+            }
+        else:
+            dzi_upload_result = await document.badgerdoc_upload_document(
+                dzi_document, dzi_buffer
+            )
 
-        all_tiles: list[TileData] = []
-        total_tiles_created = 0
+        logger.info("Count of levels: %s", levels)
 
-        for level in range(levels):
-            result = await self.create_pyramid_level(
-                image_, level, levels - 1, source_document  # type: ignore
-            )
+        # Single pass from the full resolution level down: every level is
+        # downsampled from the one above it, which is freed once tiled.
+        level_results: list[PyramidLevelResult] = []
+        level_image: Image.Image = image_  # type: ignore
+        for level in range(levels - 1, -1, -1):
+            result = await self.tile_level(level_image, level, source_document)
 
             logger.info(
                 f"Level {level}: {result.tiles_created} tiles "
                 f"({result.grid_size[0]}x{result.grid_size[1]} grid)"
             )
+            level_results.append(result)
+
+            if level > 0:
+                next_image = self.downsample(
+                    level_image,
+                    self.level_size(
+                        image_width, image_height, level - 1, levels - 1
+                    ),
+                )
+                level_image.close()
+                level_image = next_image
+        level_image.close()
 
+        all_tiles: list[TileData] = []
+        total_tiles_created = 0
+        for result in reversed(level_results):
             all_tiles.extend(result.tile_data)
             total_tiles_created += result.tiles_created
 
+        if TILE_UPLOAD_MODE == "manifest":
+            dzi_upload_result = await document.badgerdoc_upload_document(
+                dzi_document, dzi_buffer
+            )
+
         return DZIConvertResult(
             dzi_document_id=dzi_upload_result.id,
             dzi_tags=["dzi", "xml"],
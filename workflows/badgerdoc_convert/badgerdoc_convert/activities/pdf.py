@@ -1,8 +1,15 @@
+import asyncio
 import logging
+import math
+import multiprocessing
+import os
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from io import BytesIO
 
 import pdfplumber
+from PIL import Image
 from temporalio import activity
 
 from badgerdoc_common import badgerdoc_http
@@ -18,7 +25,28 @@ from badgerdoc_common.activities.document import (
 
 logger = logging.getLogger(__name__)
 
-IMAGE_RESOLUTION_DPI = 750  # TODO: add to the configutation
+# Pages are rendered at the highest DPI within [min, max] that keeps the
+# rendition under the pixel budget. A budget of 0 renders every page at the
+# maximum DPI.
+IMAGE_RESOLUTION_DPI = int(os.getenv("BADGERDOC_CONVERT_MAX_DPI", "750"))
+IMAGE_MIN_RESOLUTION_DPI = int(os.getenv("BADGERDOC_CONVERT_MIN_DPI", "72"))
+IMAGE_PIXEL_BUDGET = int(os.getenv("BADGERDOC_CONVERT_PIXEL_BUDGET", "0"))
+# Low resolution copy of every page tagged "rendition_preview", 0 disables it
+PREVIEW_RESOLUTION_DPI = int(os.getenv("BADGERDOC_CONVERT_PREVIEW_DPI", "0"))
+
+POINTS_PER_INCH = 72
+RENDITION_TAGS = ["rendition", "rendition_preview"]
+
+# "sequential" renders, encodes and uploads one page at a time.
+# "pipelined" renders and encodes pages in a process pool and uploads them
+# concurrently.
+CONVERT_MODE = os.getenv("BADGERDOC_CONVERT_MODE", "sequential")
+CONVERT_RENDER_WORKERS = int(
+    os.getenv("BADGERDOC_CONVERT_RENDER_WORKERS", str(os.cpu_count() or 1))
+)
+CONVERT_UPLOAD_CONCURRENCY = int(
+    os.getenv("BADGERDOC_CONVERT_UPLOAD_CONCURRENCY", "4")
+)
 
 
 class BadgerdocPNGUtilsError(Exception):
@@ -31,10 +59,53 @@ class PDFConvertResult:
     pages_statuses: list[bool]
 
 
+@dataclass
+class PDFPageRange:
+    document_id: int
+    first_page: int
+    last_page: int
+
+
+@dataclass
+class RenderPolicy:
+    max_dpi: int
+    min_dpi: int
+    pixel_budget: int
+    preview_dpi: int
+
+    def select_dpi(self, width_pt: float, height_pt: float) -> int:
+        """Pick the DPI for a page of the given size in PDF points."""
+        area_sq_inch = (width_pt / POINTS_PER_INCH) * (
+            height_pt / POINTS_PER_INCH
+        )
+        if self.pixel_budget <= 0 or area_sq_inch <= 0:
+            return self.max_dpi
+        dpi = math.floor(math.sqrt(self.pixel_budget / area_sq_inch))
+        return max(self.min_dpi, min(self.max_dpi, dpi))
+
+
+@dataclass
+class EncodedPage:
+    data: bytes
+    width: int
+    height: int
+    dpi: int
+    preview: "EncodedPage | None" = None
+
+
+def get_render_policy() -> RenderPolicy:
+    return RenderPolicy(
+        max_dpi=IMAGE_RESOLUTION_DPI,
+        min_dpi=IMAGE_MIN_RESOLUTION_DPI,
+        pixel_budget=IMAGE_PIXEL_BUDGET,
+        preview_dpi=PREVIEW_RESOLUTION_DPI,
+    )
+
+
 async def clear_existing_renditions(document_id: int) -> None:
     logger.info("Deleting renditions for document: %s", document_id)
     list_request = ListDocumentsRequest(
-        tags=["rendition"], parent_document_id=document_id
+        tags=RENDITION_TAGS, parent_document_id=document_id
     )
     existing_docs = await badgerdoc_list_documents(list_request)
     logger.info("Found %d rendition documents to delete", existing_docs.count)
@@ -46,6 +117,161 @@ async def clear_existing_renditions(document_id: int) -> None:
         await badgerdoc_delete_document(existing_doc.id)
 
 
+def _encode_png(image: Image.Image) -> bytes:
+    imbuffer = BytesIO()
+    image.save(imbuffer, format="PNG")
+    return imbuffer.getvalue()
+
+
+def _render_page_image(
+    page: pdfplumber.page.Page, policy: RenderPolicy
+) -> tuple[Image.Image, int]:
+    dpi = policy.select_dpi(float(page.width), float(page.height))
+    return page.to_image(resolution=dpi).original, dpi
+
+
+def _encode_page(
+    image: Image.Image, dpi: int, policy: RenderPolicy
+) -> EncodedPage:
+    width, height = image.size
+    encoded = EncodedPage(_encode_png(image), width, height, dpi)
+    if 0 < policy.preview_dpi < dpi:
+        # Downscaling the rendered page is much cheaper than rendering twice
+        scale = policy.preview_dpi / dpi
+        preview = image.resize(
+            (max(1, round(width * scale)), max(1, round(height * scale))),
+            Image.Resampling.LANCZOS,
+        )
+        encoded.preview = EncodedPage(
+            _encode_png(preview),
+            preview.width,
+            preview.height,
+            policy.preview_dpi,
+        )
+    return encoded
+
+
+def _source_key(document: BadgerdocDocument) -> str:
+    # Storage URLs may be presigned, only the object path identifies the file
+    return urllib.parse.urlsplit(document.file or "").path
+
+
+def _rendition_metadata(
+    page_num: int, encoded: EncodedPage, source: str | None
+) -> dict:
+    metadata: dict = {
+        "page": page_num,
+        "size": {"width": encoded.width, "height": encoded.height},
+        "dpi": encoded.dpi,
+    }
+    if source is not None:
+        metadata["source"] = source
+    return metadata
+
+
+async def _upload_rendition(
+    document_id: int,
+    page_num: int,
+    encoded: EncodedPage,
+    source: str | None = None,
+) -> BadgerdocDocument:
+    # The preview goes first: a page counts as converted once its full
+    # resolution rendition exists.
+    if encoded.preview is not None:
+        await badgerdoc_upload_document(
+            BadgerdocDocument(
+                name=f"{document_id}_page_{page_num}_preview.png",
+                metadata=_rendition_metadata(
+                    page_num, encoded.preview, source
+                ),
+                tags=["rendition_preview"],
+                parent_document_id=document_id,
+                extension="png",
+            ),
+            BytesIO(encoded.preview.data),
+        )
+    new_document = await badgerdoc_upload_document(
+        BadgerdocDocument(
+            name=f"{document_id}_page_{page_num}.png",
+            metadata=_rendition_metadata(page_num, encoded, source),
+            tags=["rendition"],
+            parent_document_id=document_id,
+            extension="png",
+        ),
+        BytesIO(encoded.data),
+    )
+    logger.info(
+        "Image of page %s uploaded successfully: %s",
+        page_num,
+        new_document.id,
+    )
+    return new_document
+
+
+_render_worker_pdf: pdfplumber.PDF | None = None
+
+
+def _init_render_worker(pdf_bytes: bytes) -> None:
+    # Every worker process opens the PDF once and keeps it for all the pages
+    # it renders, so the document bytes cross the process boundary only once.
+    global _render_worker_pdf  # pylint: disable=global-statement
+    _render_worker_pdf = pdfplumber.open(BytesIO(pdf_bytes))
+
+
+def _render_page(page_num: int, policy: RenderPolicy) -> EncodedPage:
+    # The page is encoded here as well, only the PNG bytes are sent back to
+    # the parent instead of the full resolution image.
+    if _render_worker_pdf is None:
+        raise BadgerdocPNGUtilsError("Render worker is not initialized")
+    page = _render_worker_pdf.pages[page_num - 1]
+    image, dpi = _render_page_image(page, policy)
+    page.close()
+    return _encode_page(image, dpi, policy)
+
+
+async def _convert_pages_pipelined(
+    document_id: int, pdf_bytes: bytes, total_pages: int
+) -> list[bool]:
+    loop = asyncio.get_running_loop()
+    # Worker processes are spawned, so the policy is passed explicitly
+    # instead of being read from their own module globals.
+    policy = get_render_policy()
+    upload_slots = asyncio.Semaphore(CONVERT_UPLOAD_CONCURRENCY)
+    # Bounds the number of encoded pages held in memory while they wait
+    # for the upload stage.
+    pages_in_flight = asyncio.Semaphore(
+        CONVERT_RENDER_WORKERS + CONVERT_UPLOAD_CONCURRENCY
+    )
+
+    with ProcessPoolExecutor(
+        max_workers=min(CONVERT_RENDER_WORKERS, total_pages),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_render_worker,
+        initargs=(pdf_bytes,),
+    ) as pool:
+
+        async def convert_page(page_num: int) -> bool:
+            async with pages_in_flight:
+                encoded = await loop.run_in_executor(
+                    pool, _render_page, page_num, policy
+                )
+
+                async with upload_slots:
+                    await _upload_rendition(document_id, page_num, encoded)
+
+            activity.heartbeat(page_num)
+            return True
+
+        return list(
+            await asyncio.gather(
+                *(
+                    convert_page(page_num)
+                    for page_num in range(1, total_pages + 1)
+                )
+            )
+        )
+
+
 @activity.defn
 async def download_and_convert_document(document_id: int) -> PDFConvertResult:
     await clear_existing_renditions(document_id)
@@ -61,39 +287,133 @@ async def download_and_convert_document(document_id: int) -> PDFConvertResult:
     pages_statuses = []
     page_num = 0
     with pdfplumber.open(buffer) as pdf:
+        total_pages = len(pdf.pages)
         await badgerdoc_update_document(
             document_id,
             BadgerdocDocument(
-                metadata=metadata | {"total_pages": len(pdf.pages)}
+                metadata=metadata | {"total_pages": total_pages}
             ),
         )
-        for page_num, page in enumerate(pdf.pages, start=1):
-            image = page.to_image(resolution=IMAGE_RESOLUTION_DPI).original
-            width, height = image.size
-            filename = f"{document_id}_page_{page_num}.png"
-            imbuffer = BytesIO()
-            image.save(imbuffer, format="PNG")
-            imbuffer.seek(0)
-            new_document = await badgerdoc_upload_document(
-                BadgerdocDocument(
-                    name=filename,
-                    metadata={
-                        "page": page_num,
-                        "size": {"width": width, "height": height},
-                    },
-                    tags=["rendition"],
-                    parent_document_id=document_id,
-                    extension="png",
-                ),
-                imbuffer,
-            )
-            imbuffer.truncate(0)
+
+        if CONVERT_MODE == "pipelined" and total_pages:
             logger.info(
-                "Image of page %s uploaded successfully: %s",
-                page_num,
-                new_document.id,
+                "Converting %d pages with %d render workers",
+                total_pages,
+                CONVERT_RENDER_WORKERS,
+            )
+            pages_statuses = await _convert_pages_pipelined(
+                document_id, buffer.getvalue(), total_pages
+            )
+            return PDFConvertResult(
+                pages_converted=total_pages, pages_statuses=pages_statuses
             )
+
+        policy = get_render_policy()
+        for page_num, page in enumerate(pdf.pages, start=1):
+            image, dpi = _render_page_image(page, policy)
+            encoded = _encode_page(image, dpi, policy)
+            del image
+            await _upload_rendition(document_id, page_num, encoded)
             pages_statuses.append(True)
         return PDFConvertResult(
             pages_converted=page_num, pages_statuses=pages_statuses
         )
+
+
+async def _list_renditions(document_id: int) -> list[BadgerdocDocument]:
+    existing_docs = await badgerdoc_list_documents(
+        ListDocumentsRequest(
+            tags=RENDITION_TAGS, parent_document_id=document_id
+        )
+    )
+    return existing_docs.documents
+
+
+@activity.defn
+async def prepare_sharded_conversion(document_id: int) -> int:
+    """Read the page count once and drop renditions of a previous file.
+
+    Renditions created from the current file are kept, so a re-run of the
+    sharded conversion only renders the pages that are still missing.
+    """
+    document = await badgerdoc_get_document(document_id)
+    metadata = document.metadata or {}
+    buffer = BytesIO()
+    await badgerdoc_http.badgerdoc_download(buffer, document)
+
+    with pdfplumber.open(buffer) as pdf:
+        total_pages = len(pdf.pages)
+
+    await badgerdoc_update_document(
+        document_id,
+        BadgerdocDocument(metadata=metadata | {"total_pages": total_pages}),
+    )
+
+    source = _source_key(document)
+    for rendition in await _list_renditions(document_id):
+        rendition_metadata = rendition.metadata or {}
+        page = rendition_metadata.get("page")
+        if (
+            rendition_metadata.get("source") == source
+            and isinstance(page, int)
+            and 1 <= page <= total_pages
+        ):
+            continue
+        logger.info("Deleting stale rendition document: %s", rendition.id)
+        await badgerdoc_delete_document(rendition.id)
+
+    return total_pages
+
+
+@activity.defn
+async def convert_document_page_range(
+    page_range: PDFPageRange,
+) -> PDFConvertResult:
+    """Render one shard of a PDF, skipping pages that are already converted."""
+    document_id = page_range.document_id
+    pages = range(page_range.first_page, page_range.last_page + 1)
+
+    document = await badgerdoc_get_document(document_id)
+    source = _source_key(document)
+
+    renditions = await _list_renditions(document_id)
+    converted_pages = {
+        (rendition.metadata or {}).get("page")
+        for rendition in renditions
+        if "rendition" in (rendition.tags or [])
+        and (rendition.metadata or {}).get("source") == source
+    }
+    missing_pages = [page for page in pages if page not in converted_pages]
+    # A preview left by an interrupted attempt is uploaded again below
+    for rendition in renditions:
+        if (
+            "rendition_preview" in (rendition.tags or [])
+            and (rendition.metadata or {}).get("page") in missing_pages
+        ):
+            await badgerdoc_delete_document(rendition.id)
+    logger.info(
+        "Pages %s-%s of document %s: %d already converted, %d to render",
+        page_range.first_page,
+        page_range.last_page,
+        document_id,
+        len(pages) - len(missing_pages),
+        len(missing_pages),
+    )
+
+    if missing_pages:
+        buffer = BytesIO()
+        await badgerdoc_http.badgerdoc_download(buffer, document)
+        policy = get_render_policy()
+        with pdfplumber.open(buffer) as pdf:
+            for page_num in missing_pages:
+                page = pdf.pages[page_num - 1]
+                image, dpi = _render_page_image(page, policy)
+                encoded = _encode_page(image, dpi, policy)
+                del image
+                page.close()
+                await _upload_rendition(document_id, page_num, encoded, source)
+                activity.heartbeat(page_num)
+
+    return PDFConvertResult(
+        pages_converted=len(pages), pages_statuses=[True for _ in pages]
+    )
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from datetime import timedelta
 from typing import Any
@@ -13,6 +14,8 @@ from badgerdoc_convert.activities import dzi, pdf
 logger = logging.getLogger(__name__)
 
 MAXIMUM_CONVERT_TIMEOUT_SECONDS = 900
+PAGES_PER_SHARD = 10
+SHARD_HEARTBEAT_TIMEOUT_SECONDS = 300
 
 
 class BadgerdocPNGConvertError(Exception):
@@ -50,13 +53,16 @@ class BadgerdocPNGConvertWorkflow:
 
 
 @workflow.defn
-class BadgerdocDZIConvertWorkflow:
+class BadgerdocPNGShardedConvertWorkflow:
+    """Convert a PDF to PNG renditions as independent page-range activities.
+
+    Each shard retries on its own and skips pages rendered by a previous
+    attempt, so the shards can be spread over any number of workers.
+    """
 
     @workflow.run
     async def run(self, request_data: BadgerdocEvent) -> Any:
-        log = agent_logger.get_logger(document_id=request_data.document_id)
-
-        await log.info("Starting BadgerDoc PNG -> DZI convert")
+        logger.info("Starting BadgerDoc sharded document preproccesing")
 
         retry_policy = RetryPolicy(
             initial_interval=timedelta(seconds=1),
@@ -65,39 +71,126 @@ class BadgerdocDZIConvertWorkflow:
             maximum_attempts=3,
         )
         document_id = request_data.document_id
-        current_document: document.BadgerdocDocument
-        current_document = await workflow.execute_activity(
-            document.badgerdoc_get_document,
-            document_id,
-            start_to_close_timeout=timedelta(
-                seconds=MAXIMUM_CONVERT_TIMEOUT_SECONDS
-            ),
-            retry_policy=retry_policy,
-        )
-        logger.info("Got document: %s:", current_document)
-        logger.info(
-            "Checking if tag rendition present in tags: %s",
-            current_document.tags,
+
+        try:
+            total_pages = await workflow.execute_activity(
+                pdf.prepare_sharded_conversion,
+                document_id,
+                start_to_close_timeout=timedelta(
+                    seconds=MAXIMUM_CONVERT_TIMEOUT_SECONDS
+                ),
+                retry_policy=retry_policy,
+            )
+        except Exception as e:
+            raise BadgerdocPNGConvertError("Failed to process document") from e
+
+        shards = [
+            pdf.PDFPageRange(
+                document_id=document_id,
+                first_page=first_page,
+                last_page=min(first_page + PAGES_PER_SHARD - 1, total_pages),
+            )
+            for first_page in range(1, total_pages + 1, PAGES_PER_SHARD)
+        ]
+        results = await asyncio.gather(
+            *[
+                workflow.execute_activity(
+                    pdf.convert_document_page_range,
+                    shard,
+                    start_to_close_timeout=timedelta(
+                        seconds=MAXIMUM_CONVERT_TIMEOUT_SECONDS
+                    ),
+                    heartbeat_timeout=timedelta(
+                        seconds=SHARD_HEARTBEAT_TIMEOUT_SECONDS
+                    ),
+                    retry_policy=retry_policy,
+                )
+                for shard in shards
+            ],
+            return_exceptions=True,
         )
 
-        if (
-            not current_document.tags
-            or "rendition" not in current_document.tags
-        ):
-            logger.info("Not renditions convert is not supported by workflow")
-            return
-        if current_document.parent_document_id is None:
-            logger.info("No parent_document_id detected, can't convet to DZI")
-            return
-
-        logger.info("Converting...")
-        conversion_result = await workflow.execute_activity(
-            dzi.convert_to_dzi,
-            current_document,
-            start_to_close_timeout=timedelta(
-                seconds=MAXIMUM_CONVERT_TIMEOUT_SECONDS
-            ),
-            retry_policy=retry_policy,
+        pages_statuses: list[bool] = []
+        failed_shards = []
+        for shard, result in zip(shards, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Failed to convert pages %s-%s: %s",
+                    shard.first_page,
+                    shard.last_page,
+                    result,
+                )
+                failed_shards.append(shard)
+                shard_size = shard.last_page - shard.first_page + 1
+                pages_statuses.extend(False for _ in range(shard_size))
+            else:
+                pages_statuses.extend(result.pages_statuses)
+
+        if failed_shards:
+            raise BadgerdocPNGConvertError(
+                f"Failed to convert {len(failed_shards)} of "
+                f"{len(shards)} page ranges"
+            )
+
+        return pdf.PDFConvertResult(
+            pages_converted=total_pages, pages_statuses=pages_statuses
         )
-        await log.info("BadgerDoc PNG -> DZI convert completed")
-        return conversion_result
+
+
+@workflow.defn
+class BadgerdocDZIConvertWorkflow:
+
+    @workflow.run
+    async def run(self, request_data: BadgerdocEvent) -> Any:
+        async with agent_logger.get_logger(
+            document_id=request_data.document_id
+        ) as log:
+            await log.info("Starting BadgerDoc PNG -> DZI convert")
+
+            retry_policy = RetryPolicy(
+                initial_interval=timedelta(seconds=1),
+                backoff_coefficient=2.0,
+                maximum_interval=timedelta(seconds=100),
+                maximum_attempts=3,
+            )
+            document_id = request_data.document_id
+            current_document: document.BadgerdocDocument
+            current_document = await workflow.execute_activity(
+                document.badgerdoc_get_document,
+                document_id,
+                start_to_close_timeout=timedelta(
+                    seconds=MAXIMUM_CONVERT_TIMEOUT_SECONDS
+                ),
+                retry_policy=retry_policy,
+            )
+            logger.info("Got document: %s:", current_document)
+            logger.info(
+                "Checking if tag rendition present in tags: %s",
+                current_document.tags,
+            )
+
+            if (
+                not current_document.tags
+                or "rendition" not in current_document.tags
+            ):
+                logger.info(
+                    "Not renditions convert is not supported by workflow"
+                )
+                return
+            if current_document.parent_document_id is None:
+                logger.info(
+                    "No parent_document_id detected, can't convet to DZI"
+                )
+                return
+
+            logger.info("Converting...")
+            conversion_result = await workflow.execute_activity(
+                dzi.convert_to_dzi,
+                current_document,
+                start_to_close_timeout=timedelta(
+                    seconds=MAXIMUM_CONVERT_TIMEOUT_SECONDS
+                ),
+                retry_policy=retry_policy,
+            )
+            await log.info("BadgerDoc PNG -> DZI convert completed")
+            return conversion_result
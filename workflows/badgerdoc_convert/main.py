@@ -19,13 +19,17 @@ async def worker():
             task_queue="badgerdoc_convert",
             workflows=[
                 converters.BadgerdocPNGConvertWorkflow,
+                converters.BadgerdocPNGShardedConvertWorkflow,
                 converters.BadgerdocDZIConvertWorkflow,
             ],
             activities=[
                 pdf.download_and_convert_document,
+                pdf.prepare_sharded_conversion,
+                pdf.convert_document_page_range,
                 dzi.convert_to_dzi,
                 document.badgerdoc_get_document,
                 agent_log.write_agent_log,
+                agent_log.write_agent_logs,
             ],
             **sentry_config,
         )
@@ -3,7 +3,12 @@ from unittest.mock import AsyncMock, MagicMock, call, patch
 import pytest
 
 from badgerdoc_common.activities.document import BadgerdocDocument
-from badgerdoc_convert.activities.pdf import download_and_convert_document
+from badgerdoc_convert.activities.pdf import (
+    PDFPageRange,
+    RenderPolicy,
+    convert_document_page_range,
+    download_and_convert_document,
+)
 
 
 @pytest.mark.asyncio
@@ -67,7 +72,437 @@ async def test_download_and_convert_document():
         assert uploaded_doc_arg.metadata == {
             "page": 1,
             "size": {"width": 1275, "height": 1650},
+            "dpi": 750,
         }
 
         assert result.pages_converted == 1
         assert result.pages_statuses == [True]
+
+
+@pytest.mark.asyncio
+async def test_download_and_convert_document_pipelined():
+    from io import BytesIO
+
+    from PIL import Image
+    from temporalio.testing import ActivityEnvironment
+
+    document_id = 123
+    fake_document = BadgerdocDocument(
+        id=document_id, metadata={"author": "test"}, file="/doc.pdf"
+    )
+
+    pages = [
+        Image.new("RGB", (100 + 10 * i, 200), color="white") for i in range(3)
+    ]
+    pdf_buffer = BytesIO()
+    pages[0].save(
+        pdf_buffer,
+        "PDF",
+        resolution=72,
+        save_all=True,
+        append_images=pages[1:],
+    )
+
+    async def fake_download(buffer, _document):
+        buffer.write(pdf_buffer.getvalue())
+        buffer.seek(0)
+
+    uploaded_ids = iter(range(1000, 1010))
+
+    async def fake_upload(document, _file):
+        return BadgerdocDocument(id=next(uploaded_ids), name=document.name)
+
+    heartbeats = []
+    env = ActivityEnvironment()
+    env.on_heartbeat = heartbeats.append
+
+    with (
+        patch("badgerdoc_convert.activities.pdf.CONVERT_MODE", "pipelined"),
+        patch("badgerdoc_convert.activities.pdf.CONVERT_RENDER_WORKERS", 2),
+        patch("badgerdoc_convert.activities.pdf.IMAGE_RESOLUTION_DPI", 72),
+        patch(
+            "badgerdoc_convert.activities.pdf.badgerdoc_get_document",
+            new=AsyncMock(return_value=fake_document),
+        ),
+        patch(
+            "badgerdoc_convert.activities.pdf.badgerdoc_http.badgerdoc_download",
+            new=fake_download,
+        ),
+        patch(
+            "badgerdoc_convert.activities.pdf.badgerdoc_upload_document",
+            new=AsyncMock(side_effect=fake_upload),
+        ) as mock_upload,
+        patch(
+            "badgerdoc_convert.activities.pdf.badgerdoc_list_documents",
+            new=AsyncMock(return_value=MagicMock(documents=[])),
+        ),
+        patch(
+            "badgerdoc_convert.activities.pdf.badgerdoc_update_document",
+            new=AsyncMock(return_value=fake_document),
+        ) as mock_update,
+    ):
+        result = await env.run(download_and_convert_document, document_id)
+
+    assert result.pages_converted == 3
+    assert result.pages_statuses == [True, True, True]
+    assert sorted(heartbeats) == [1, 2, 3]
+    assert mock_update.call_args[0][1].metadata == {
+        "author": "test",
+        "total_pages": 3,
+    }
+
+    uploaded = sorted(
+        (call_.args[0] for call_ in mock_upload.call_args_list),
+        key=lambda doc: doc.metadata["page"],
+    )
+    assert [doc.metadata["page"] for doc in uploaded] == [1, 2, 3]
+    assert [doc.metadata["size"]["width"] for doc in uploaded] == [
+        100,
+        110,
+        120,
+    ]
+    assert all(doc.tags == ["rendition"] for doc in uploaded)
+
+
+@pytest.mark.asyncio
+async def test_convert_document_page_range_skips_converted_pages():
+    from io import BytesIO
+
+    from PIL import Image
+    from temporalio.testing import ActivityEnvironment
+
+    document_id = 123
+    fake_document = BadgerdocDocument(
+        id=document_id, file="/documents/abc/doc.pdf?X-Amz-Signature=1"
+    )
+
+    pages = [Image.new("RGB", (100 + 10 * i, 200)) for i in range(4)]
+    pdf_buffer = BytesIO()
+    pages[0].save(
+        pdf_buffer,
+        "PDF",
+        resolution=72,
+        save_all=True,
+        append_images=pages[1:],
+    )
+
+    async def fake_download(buffer, _document):
+        buffer.write(pdf_buffer.getvalue())
+        buffer.seek(0)
+
+    existing_renditions = [
+        BadgerdocDocument(
+            id=1,
+            tags=["rendition"],
+            metadata={"page": 2, "source": "/documents/abc/doc.pdf"},
+        ),
+        # Rendered from a previous version of the file
+        BadgerdocDocument(
+            id=2,
+            tags=["rendition"],
+            metadata={"page": 3, "source": "/documents/old/doc.pdf"},
+        ),
+    ]
+
+    heartbeats = []
+    env = ActivityEnvironment()
+    env.on_heartbeat = heartbeats.append
+
+    with (
+        patch("badgerdoc_convert.activities.pdf.IMAGE_RESOLUTION_DPI", 72),
+        patch(
+            "badgerdoc_convert.activities.pdf.badgerdoc_get_document",
+            new=AsyncMock(return_value=fake_document),
+        ),
+        patch(
+            "badgerdoc_convert.activities.pdf.badgerdoc_http.badgerdoc_download",
+            new=fake_download,
+        ),
+        patch(
+            "badgerdoc_convert.activities.pdf.badgerdoc_upload_document",
+            new=AsyncMock(return_value=BadgerdocDocument(id=999)),
+        ) as mock_upload,
+        patch(
+            "badgerdoc_convert.activities.pdf.badgerdoc_list_documents",
+            new=AsyncMock(
+                return_value=MagicMock(documents=existing_renditions)
+            ),
+        ),
+    ):
+        result = await env.run(
+            convert_document_page_range,
+            PDFPageRange(document_id=document_id, first_page=2, last_page=4),
+        )
+
+    assert result.pages_converted == 3
+    assert result.pages_statuses == [True, True, True]
+    assert heartbeats == [3, 4]
+
+    uploaded = [call_.args[0] for call_ in mock_upload.call_args_list]
+    assert [doc.metadata["page"] for doc in uploaded] == [3, 4]
+    assert [doc.metadata["size"]["width"] for doc in uploaded] == [120, 130]
+    assert all(
+        doc.metadata["source"] == "/documents/abc/doc.pdf" for doc in uploaded
+    )
+
+
+def test_render_policy_select_dpi():
+    policy = RenderPolicy(
+        max_dpi=750, min_dpi=72, pixel_budget=10_000_000, preview_dpi=0
+    )
+    # A4 in points: 8.27 x 11.69 inches
+    a4_dpi = policy.select_dpi(595, 842)
+    assert a4_dpi == 321
+    assert (595 / 72 * a4_dpi) * (842 / 72 * a4_dpi) <= 10_000_000
+    # Small pages are capped by the maximum DPI
+    assert policy.select_dpi(72, 72) == 750
+    # Huge pages never go below the minimum DPI
+    assert policy.select_dpi(72 * 100, 72 * 100) == 72
+
+    unlimited = RenderPolicy(
+        max_dpi=750, min_dpi=72, pixel_budget=0, preview_dpi=0
+    )
+    assert unlimited.select_dpi(595, 842) == 750
+
+
+@pytest.mark.asyncio
+async def test_download_and_convert_document_adaptive_dpi_with_preview():
+    from io import BytesIO
+
+    from PIL import Image
+
+    document_id = 123
+    fake_document = BadgerdocDocument(id=document_id, file="/doc.pdf")
+
+    # 2 x 4 inch page
+    pdf_buffer = BytesIO()
+    Image.new("RGB", (144, 288)).save(pdf_buffer, "PDF", resolution=72)
+
+    async def fake_download(buffer, _document):
+        buffer.write(pdf_buffer.getvalue())
+        buffer.seek(0)
+
+    with (
+        patch("badgerdoc_convert.activities.pdf.IMAGE_RESOLUTION_DPI", 300),
+        patch("badgerdoc_convert.activities.pdf.IMAGE_PIXEL_BUDGET", 80_000),
+        patch("badgerdoc_convert.activities.pdf.PREVIEW_RESOLUTION_DPI", 50),
+        patch(
+            "badgerdoc_convert.activities.pdf.badgerdoc_get_document",
+            new=AsyncMock(return_value=fake_document),
+        ),
+        patch(
+            "badgerdoc_convert.activities.pdf.badgerdoc_http.badgerdoc_download",
+            new=fake_download,
+        ),
+        patch(
+            "badgerdoc_convert.activities.pdf.badgerdoc_upload_document",
+            new=AsyncMock(return_value=BadgerdocDocument(id=999)),
+        ) as mock_upload,
+        patch(
+            "badgerdoc_convert.activities.pdf.badgerdoc_list_documents",
+            new=AsyncMock(return_value=MagicMock(documents=[])),
+        ),
+        patch(
+            "badgerdoc_convert.activities.pdf.badgerdoc_update_document",
+            new=AsyncMock(return_value=fake_document),
+        ),
+    ):
+        await download_and_convert_document(document_id)
+
+    preview, rendition = [c.args[0] for c in mock_upload.call_args_list]
+    assert rendition.tags == ["rendition"]
+    assert rendition.metadata == {
+        "page": 1,
+        "size": {"width": 200, "height": 400},
+        "dpi": 100,
+    }
+    assert preview.tags == ["rendition_preview"]
+    assert preview.metadata == {
+        "page": 1,
+        "size": {"width": 100, "height": 200},
+        "dpi": 50,
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_tiles_builds_pyramid_from_previous_level():
+    from io import BytesIO
+
+    from PIL import Image
+
+    from badgerdoc_convert.activities.dzi import DZIConverter
+
+    source_document = BadgerdocDocument(id=5, metadata={"page": 2})
+    image_buffer = BytesIO()
+    Image.new("RGB", (200, 130), color="red").save(image_buffer, "PNG")
+    image_buffer.seek(0)
+
+    uploaded = []
+
+    async def fake_upload(new_document, file):
+        image = None
+        if new_document.extension == "png":
+            image = Image.open(file)
+            image.load()
+        uploaded.append((new_document, image))
+        return BadgerdocDocument(id=len(uploaded))
+
+    with patch(
+        "badgerdoc_convert.activities.dzi.document.badgerdoc_upload_document",
+        new=AsyncMock(side_effect=fake_upload),
+    ):
+        result = await DZIConverter(tile_size=64).create_tiles(
+            source_document, image_buffer
+        )
+
+    tiles = {doc.tags[1]: image.size for doc, image in uploaded[1:]}
+    # 9 levels: 1x1 ... 100x65, 200x130
+    assert tiles["0/0_0.png"] == (1, 1)
+    assert tiles["7/0_0.png"] == (64, 64)
+    assert tiles["7/1_1.png"] == (36, 1)
+    assert tiles["8/3_2.png"] == (8, 2)
+    assert result.total_tiles_created == len(tiles) == 7 + 4 + 12
+    assert [tile.path for tile in result.tiles][:2] == [
+        "0/0_0.png",
+        "1/0_0.png",
+    ]
+    assert all(doc.metadata == {"page": 2} for doc, _ in uploaded)
+
+
+def test_dzi_downsample_strip_mode_matches_full_resize():
+    from PIL import Image, ImageChops
+
+    from badgerdoc_convert.activities.dzi import DZIConverter
+
+    image = Image.linear_gradient("L").resize((301, 257)).convert("RGB")
+    converter = DZIConverter(tile_size=16)
+
+    with patch("badgerdoc_convert.activities.dzi.STRIP_MODE_MIN_PIXELS", 0):
+        strips = converter.downsample(image, (151, 129))
+    full = image.resize((151, 129), Image.Resampling.LANCZOS)
+
+    assert strips.size == full.size
+    extrema = ImageChops.difference(strips, full).getextrema()
+    assert max(channel_max for _, channel_max in extrema) <= 1
+
+
+@pytest.mark.asyncio
+async def test_create_tiles_bulk_upload_mode():
+    from io import BytesIO
+
+    from PIL import Image
+
+    from badgerdoc_convert.activities.dzi import DZIConverter
+
+    source_document = BadgerdocDocument(id=5, metadata={"page": 2})
+    image_buffer = BytesIO()
+    Image.new("RGB", (100, 60)).save(image_buffer, "PNG")
+    image_buffer.seek(0)
+
+    registered_ids = iter(range(100, 200))
+
+    async def fake_create_documents(_parent_id, documents):
+        return [
+            BadgerdocDocument(id=next(registered_ids), file=doc.file)
+            for doc in documents
+        ]
+
+    converter = DZIConverter(tile_size=64)
+    with (
+        patch("badgerdoc_convert.activities.dzi.TILE_UPLOAD_MODE", "bulk"),
+        patch(
+            "badgerdoc_convert.activities.dzi.document.badgerdoc_upload_document",
+            new=AsyncMock(return_value=BadgerdocDocument(id=1)),
+        ) as mock_upload,
+        patch(
+            "badgerdoc_convert.activities.dzi.storage.badgerdoc_store_many",
+            new=AsyncMock(),
+        ) as mock_store_many,
+        patch(
+            "badgerdoc_convert.activities.dzi.document.badgerdoc_create_documents",
+            new=AsyncMock(side_effect=fake_create_documents),
+        ) as mock_create_documents,
+    ):
+        result = await converter.create_tiles(source_document, image_buffer)
+
+    # Only the DZI xml goes through the document upload
+    mock_upload.assert_awaited_once()
+    # One storage batch and one registration call per level
+    assert mock_store_many.await_count == 8
+    assert mock_create_documents.await_count == 8
+
+    top_level_files = mock_store_many.await_args_list[0].args[0]
+    assert sorted(top_level_files) == [
+        f"derived/5/{converter.run_id}/7/0_0.png",
+        f"derived/5/{converter.run_id}/7/1_0.png",
+    ]
+    parent_id, top_level_docs = mock_create_documents.await_args_list[0].args
+    assert parent_id == 5
+    assert [doc.name for doc in top_level_docs] == ["7_0_0.png", "7_1_0.png"]
+    assert all(doc.metadata == {"page": 2} for doc in top_level_docs)
+    assert top_level_docs[0].tags == ["dzi", "7/0_0.png"]
+
+    assert result.total_tiles_created == 9
+    assert result.tiles[-1].path == "7/1_0.png"
+    assert result.tiles[-1].document_id == 101
+
+
+@pytest.mark.asyncio
+async def test_create_tiles_manifest_mode():
+    from io import BytesIO
+
+    from PIL import Image
+
+    from badgerdoc_convert.activities.dzi import DZIConverter
+
+    source_document = BadgerdocDocument(id=5, metadata={"page": 2})
+    image_buffer = BytesIO()
+    Image.new("RGB", (100, 60)).save(image_buffer, "PNG")
+    image_buffer.seek(0)
+
+    events = []
+
+    async def fake_store_many(files):
+        events.append(("store", sorted(files)))
+        return list(files)
+
+    async def fake_upload(new_document, _file):
+        events.append(("upload", new_document))
+        return BadgerdocDocument(id=42)
+
+    converter = DZIConverter(tile_size=64)
+    with (
+        patch("badgerdoc_convert.activities.dzi.TILE_UPLOAD_MODE", "manifest"),
+        patch(
+            "badgerdoc_convert.activities.dzi.document.badgerdoc_upload_document",
+            new=AsyncMock(side_effect=fake_upload),
+        ),
+        patch(
+            "badgerdoc_convert.activities.dzi.storage.badgerdoc_store_many",
+            new=AsyncMock(side_effect=fake_store_many),
+        ),
+        patch(
+            "badgerdoc_convert.activities.dzi.document.badgerdoc_create_documents",
+            new=AsyncMock(),
+        ) as mock_create_documents,
+    ):
+        result = await converter.create_tiles(source_document, image_buffer)
+
+    mock_create_documents.assert_not_awaited()
+    # Every level is stored before the manifest is uploaded
+    assert [kind for kind, _ in events] == ["store"] * 8 + ["upload"]
+    assert events[0][1] == [
+        f"derived/5/{converter.run_id}/7/0_0.png",
+        f"derived/5/{converter.run_id}/7/1_0.png",
+    ]
+    manifest = events[-1][1]
+    assert manifest.tags == ["dzi", "xml"]
+    assert manifest.metadata == {
+        "page": 2,
+        "tiles_prefix": f"derived/5/{converter.run_id}",
+        "levels": 8,
+        "tile_size": 64,
+    }
+    assert result.dzi_document_id == 42
+    assert result.total_tiles_created == 9
+    assert all(tile.document_id is None for tile in result.tiles)
@@ -1,5 +1,4 @@
 import logging
-from io import BytesIO
 
 from temporalio import activity
 
@@ -9,49 +8,63 @@ from badgerdoc_common.hocr import BadgerdocHOCRPageResult
 logger = logging.getLogger(__name__)
 
 
+def _collect_page_references(
+    hocr_results: list[BadgerdocHOCRPageResult],
+) -> list[extraction.ExtractionPageContent]:
+    pages: dict[int, str] = {}
+    for hocr_result in hocr_results:
+        for key, hocr_path in hocr_result.h_ocr.items():
+            # Key is "<page>" for page-level OCR or "<page>_<block_id>" for block OCR
+            page_number = int(key.split("_")[0])
+            if page_number in pages:
+                logger.warning(
+                    "Page %s already has hOCR %s, skipping %s",
+                    page_number,
+                    pages[page_number],
+                    hocr_path,
+                )
+                continue
+            pages[page_number] = hocr_path
+
+    # The API reads the hOCR from object storage, it is not downloaded here
+    return [
+        extraction.ExtractionPageContent(
+            page_number=page_number, storage_key=hocr_path
+        )
+        for page_number, hocr_path in sorted(pages.items())
+    ]
+
+
 @activity.defn
-async def create_extraction_page(
+async def create_extraction_pages(
     extraction_id: int,
-    hocr_result: BadgerdocHOCRPageResult,
+    hocr_results: list[BadgerdocHOCRPageResult],
 ) -> list[extraction.BadgerdocExtractionPage]:
-    from badgerdoc_common import storage
+    """Create the extraction pages of OCR results in bulk requests.
 
+    Every chunk of pages is created in one transaction. The API returns
+    pages that already exist instead of failing on them, so a retried
+    attempt sends all chunks again and still returns every page.
+    """
     logger.info(
-        "Executing create_extraction_page activity for extraction_id=%s",
+        "Executing create_extraction_pages activity for extraction_id=%s",
         extraction_id,
     )
 
-    created_pages = []
-
-    for key, hocr_path in hocr_result.h_ocr.items():
-        # Key is "<page>" for page-level OCR or "<page>_<block_id>" for block OCR
-        page_number = int(key.split("_")[0])
-
-        logger.info(
-            "Processing page %s with hOCR path: %s", page_number, hocr_path
-        )
-
-        hocr_buffer = BytesIO()
-        await storage.badgerdoc_download(hocr_buffer, hocr_path)
-        hocr_buffer.seek(0)
-        hocr_content = hocr_buffer.read().decode("utf-8")
+    pages = _collect_page_references(hocr_results)
+    chunk_size = extraction.BULK_CREATE_MAX_PAGES
 
-        page_request = extraction.CreateExtractionPageRequest(
-            extraction_id=extraction_id,
-            page_number=page_number,
-            content=hocr_content,
-        )
-
-        extraction_page = await extraction.badgerdoc_create_extraction_page(
-            page_request
-        )
-
-        logger.info(
-            "Created extraction page %s for page number %s",
-            extraction_page.id,
-            page_number,
+    created_pages = []
+    for start in range(0, len(pages), chunk_size):
+        created_pages.extend(
+            await extraction.badgerdoc_create_extraction_pages(
+                extraction.CreateExtractionPagesRequest(
+                    extraction_id=extraction_id,
+                    pages=pages[start : start + chunk_size],
+                )
+            )
         )
-        created_pages.append(extraction_page)
+        activity.heartbeat(len(created_pages))
 
     logger.info(
         "Successfully created %d extraction pages for extraction_id=%s",
@@ -60,3 +73,11 @@ async def create_extraction_page(
     )
 
     return created_pages
+
+
+@activity.defn
+async def create_extraction_page(
+    extraction_id: int,
+    hocr_result: BadgerdocHOCRPageResult,
+) -> list[extraction.BadgerdocExtractionPage]:
+    return await create_extraction_pages(extraction_id, [hocr_result])
@@ -3,7 +3,11 @@ from dataclasses import dataclass
 from temporalio import workflow
 
 from badgerdoc_common import agent_logger, workflow_execution
-from badgerdoc_common.badgerdoc_event import BadgerdocEvent
+from badgerdoc_common.badgerdoc_event import BadgerdocEvent, BadgerdocWorkflow
+
+# Workflows started before child IDs carried the registry keep the shared
+# ID when they are replayed
+_CHILD_ID_PATCH_ID = "registry-child-workflow-id"
 
 
 @dataclass
@@ -26,49 +30,62 @@ class BadgerdocLifecycleWorkflow:
 
         return f"badgerdoc-lifecycle-document-{request_data.document_id}-{request_data.event_entity}-{request_data.event_type}-triggered-{event_entity_id}"
 
+    def child_workflow_id(
+        self, request_data: BadgerdocEvent, workflow_data: BadgerdocWorkflow
+    ) -> str:
+        if workflow.patched(_CHILD_ID_PATCH_ID):
+            # The lifecycle workflow ID is derived from the event content,
+            # so its children are named after it: a duplicate event joins
+            # the running lifecycle and starts no children of its own
+            return f"{workflow.info().workflow_id}-{workflow_data.id}"
+        return self.generate_workflow_id(request_data)
+
     @workflow.run
     async def run(
         self,
         request_data: BadgerdocEvent,
     ) -> BadgerdocLifecycleDocumentWorkflowResult:
-        logger = agent_logger.get_logger(
+        async with agent_logger.get_logger(
             document_id=request_data.document_id,
             task_id=request_data.task_id,
-        )
-
-        await logger.info(
-            "Starting BadgerDoc %s lifecycle workflow",
-            request_data.event_entity,
-        )
-
-        started_workflow_ids = []
-        for workflow_data in request_data.supported_workflows:
-            await logger.debug(
-                "Trying to start workflow %s",
-                workflow_data.temporal_workflow_type,
+        ) as logger:
+
+            await logger.info(
+                "Starting BadgerDoc %s lifecycle workflow",
+                request_data.event_entity,
             )
 
-            workflow_id = self.generate_workflow_id(request_data)
-            params = workflow_execution.BadgerdocWorkflowParams(
-                workflow_type=workflow_data.temporal_workflow_type,
-                task_queue=workflow_data.temporal_queue,
-                workflow_id=workflow_id,
-                workflow_input=request_data,
-                random_postfix=True,
+            started_workflow_ids = []
+            for workflow_data in request_data.supported_workflows:
+                await logger.debug(
+                    "Trying to start workflow %s",
+                    workflow_data.temporal_workflow_type,
+                )
+
+                workflow_id = self.child_workflow_id(
+                    request_data, workflow_data
+                )
+                params = workflow_execution.BadgerdocWorkflowParams(
+                    workflow_type=workflow_data.temporal_workflow_type,
+                    task_queue=workflow_data.temporal_queue,
+                    workflow_id=workflow_id,
+                    workflow_input=request_data,
+                )
+                workflow_id = await workflow_execution.run_child_workflow(
+                    params
+                )
+                await logger.debug("Adding workflow to started_workflow_ids")
+                started_workflow_ids.append(workflow_id)
+
+            workflow_results = (
+                await workflow_execution.wait_for_workflows_concurrent(
+                    started_workflow_ids
+                )
             )
-            workflow_id = await workflow_execution.run_child_workflow(params)
-            await logger.debug("Adding workflow to started_workflow_ids")
-            started_workflow_ids.append(workflow_id)
 
-        workflow_results = (
-            await workflow_execution.wait_for_workflows_concurrent(
-                started_workflow_ids
+            await logger.info("All workflows completed: %s", workflow_results)
+            await logger.info(
+                "BadgerDoc %s lifecycle workflow completed successfully",
+                request_data.event_entity,
             )
-        )
-
-        await logger.info("All workflows completed: %s", workflow_results)
-        await logger.info(
-            "BadgerDoc %s lifecycle workflow completed successfully",
-            request_data.event_entity,
-        )
-        return BadgerdocLifecycleDocumentWorkflowResult()
+            return BadgerdocLifecycleDocumentWorkflowResult()
@@ -1,4 +1,3 @@
-import asyncio
 import hashlib
 import json
 import logging
@@ -52,7 +51,6 @@ class DocumentTriggerWorkflow:
                 task_queue=request_data.workflow.temporal_queue,
                 workflow_id=f"trigger-workflow-{request_data.workflow.id}-document-{request_data.original_document.id}-{hashlib.md5(json.dumps(asdict(request_data), sort_keys=True).encode()).hexdigest()}",  # nosec B324 - MD5 used for non-cryptographic hash for unique workflow ID
                 workflow_input=request_data,
-                random_postfix=True,
             )
             child_workflow_id = await workflow_execution.run_child_workflow(
                 workflow_params
@@ -359,19 +357,21 @@ class DocumentTriggerWorkflow:
         workflow_results: list[hocr.BadgerdocHOCRPageResult],
         new_extraction: extraction.BadgerdocExtraction,
     ) -> None:
-        async def create_page(h_ocr):
-            try:
-                await workflow.execute_activity(
-                    hocr_extraction.create_extraction_page,
-                    args=[new_extraction.id, h_ocr],
-                    start_to_close_timeout=helpers.BADGERDOC_REST_API_START_TO_CLOSE_TIMEOUT,
-                    retry_policy=helpers.BadgerdocRestAPIRetryPolicy,
-                )
-            except Exception:
-                logger.exception(
-                    "Unable to create extraction %s", new_extraction.id
-                )
+        """Create the extraction pages of the OCR results.
 
-        await asyncio.gather(
-            *[create_page(h_ocr) for h_ocr in workflow_results]
-        )
+        Pages are created in bulk, all or none per chunk, and retried by
+        the activity. A failure left after the retries fails the workflow
+        instead of being logged: the extraction would otherwise be
+        finished with pages silently missing.
+        """
+        try:
+            await workflow.execute_activity(
+                hocr_extraction.create_extraction_pages,
+                args=[new_extraction.id, workflow_results],
+                start_to_close_timeout=helpers.BADGERDOC_REST_API_START_TO_CLOSE_TIMEOUT,
+                retry_policy=helpers.BadgerdocRestAPIRetryPolicy,
+            )
+        except Exception as err:
+            raise DocumentTriggerError(
+                f"Failed to create pages of extraction {new_extraction.id}"
+            ) from err
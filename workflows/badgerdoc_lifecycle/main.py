@@ -9,7 +9,10 @@ from badgerdoc_common.activities import (
     task,
     workflow_registry,
 )
-from badgerdoc_common.activities.agent_log import write_agent_log
+from badgerdoc_common.activities.agent_log import (
+    write_agent_log,
+    write_agent_logs,
+)
 from badgerdoc_lifecycle import (
     document_lifecycle,
     document_trigger,
@@ -40,6 +43,7 @@ async def worker():
             ],
             activities=[
                 write_agent_log,
+                write_agent_logs,
                 workflow_registry.badgerdoc_get_workflow_by_id,
                 document.badgerdoc_get_document,
                 document.badgerdoc_list_documents,
@@ -48,10 +52,12 @@ async def worker():
                 document_upload_example.upload_example,
                 extraction.badgerdoc_create_extraction,
                 extraction.badgerdoc_create_extraction_page,
+                extraction.badgerdoc_create_extraction_pages,
                 extraction.badgerdoc_finish_extraction,
                 extraction.badgerdoc_get_extraction,
                 extraction.badgerdoc_get_latest_extraction_page,
                 hocr_extraction.create_extraction_page,
+                hocr_extraction.create_extraction_pages,
             ],
             **sentry_config,
         )
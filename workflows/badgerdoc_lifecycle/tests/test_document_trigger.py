@@ -0,0 +1,41 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+os.environ.setdefault("BADGERDOC_REST_API_RETRY_POLICY", "1,2.0,30,3")
+os.environ.setdefault("TEMPORAL_BADGERDOC_ADDRESS", "http://test:8000")
+os.environ.setdefault("BADGERDOC_TOKEN", "test_token")
+
+from badgerdoc_common.activities import extraction
+from badgerdoc_common.hocr import BadgerdocHOCRPageResult
+from badgerdoc_lifecycle import document_trigger
+
+
+def test_failed_page_creation_fails_the_workflow():
+    extraction_obj = extraction.BadgerdocExtraction(
+        id=7,
+        document_id=1,
+        created_by="worker",
+        status="Started",
+        temporal_job_id=None,
+        comment=None,
+        tags=[],
+    )
+
+    with patch.object(
+        document_trigger.workflow,
+        "execute_activity",
+        AsyncMock(side_effect=RuntimeError("page 2 is not valid hOCR")),
+    ):
+        with pytest.raises(
+            document_trigger.DocumentTriggerError,
+            match="Failed to create pages of extraction 7",
+        ):
+            asyncio.run(
+                document_trigger.DocumentTriggerWorkflow().process_hocr_results(
+                    [BadgerdocHOCRPageResult(h_ocr={"1": "data/1.html"})],
+                    extraction_obj,
+                )
+            )
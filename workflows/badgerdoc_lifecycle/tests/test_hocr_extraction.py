@@ -0,0 +1,88 @@
+import asyncio
+import dataclasses
+import os
+from unittest.mock import AsyncMock, patch
+
+from temporalio.testing import ActivityEnvironment
+
+os.environ.setdefault("BADGERDOC_REST_API_RETRY_POLICY", "1,2.0,30,3")
+os.environ.setdefault("TEMPORAL_BADGERDOC_ADDRESS", "http://test:8000")
+os.environ.setdefault("BADGERDOC_TOKEN", "test_token")
+
+from badgerdoc_common.activities import extraction
+from badgerdoc_common.hocr import BadgerdocHOCRPageResult
+from badgerdoc_lifecycle.activities import hocr_extraction
+
+
+def _created(request):
+    return [
+        extraction.BadgerdocExtractionPage(
+            id=page.page_number * 10,
+            extraction_id=request.extraction_id,
+            page_number=page.page_number,
+        )
+        for page in request.pages
+    ]
+
+
+def test_create_extraction_pages_sends_storage_keys_in_chunks():
+    results = [
+        BadgerdocHOCRPageResult(
+            h_ocr={"2": "data/2.html", "1": "data/1.html"}
+        ),
+        BadgerdocHOCRPageResult(
+            h_ocr={"3": "data/3.html", "1_b": "data/b.html"}
+        ),
+    ]
+    env = ActivityEnvironment()
+    heartbeats = []
+    env.on_heartbeat = heartbeats.append
+
+    with (
+        patch.object(extraction, "BULK_CREATE_MAX_PAGES", 2),
+        patch.object(
+            extraction,
+            "badgerdoc_create_extraction_pages",
+            AsyncMock(side_effect=_created),
+        ) as mock_create,
+    ):
+        pages = asyncio.run(
+            env.run(hocr_extraction.create_extraction_pages, 7, results)
+        )
+
+    requests = [c.args[0] for c in mock_create.call_args_list]
+    assert [[p.page_number for p in r.pages] for r in requests] == [
+        [1, 2],
+        [3],
+    ]
+    assert requests[0].pages[0] == extraction.ExtractionPageContent(
+        page_number=1, storage_key="data/1.html"
+    )
+    assert [page.id for page in pages] == [10, 20, 30]
+    assert heartbeats == [2, 3]
+
+
+def test_create_extraction_pages_retry_returns_existing_pages():
+    results = [
+        BadgerdocHOCRPageResult(
+            h_ocr={"1": "data/1.html", "2": "data/2.html", "3": "data/3.html"}
+        )
+    ]
+    # A previous attempt created the first chunk before failing
+    env = ActivityEnvironment()
+    env.info = dataclasses.replace(env.info, heartbeat_details=[2])
+
+    with (
+        patch.object(extraction, "BULK_CREATE_MAX_PAGES", 2),
+        patch.object(
+            extraction,
+            "badgerdoc_create_extraction_pages",
+            AsyncMock(side_effect=_created),
+        ) as mock_create,
+    ):
+        pages = asyncio.run(
+            env.run(hocr_extraction.create_extraction_pages, 7, results)
+        )
+
+    assert mock_create.call_count == 2
+    assert [page.page_number for page in pages] == [1, 2, 3]
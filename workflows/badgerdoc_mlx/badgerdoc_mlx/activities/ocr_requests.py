@@ -3,6 +3,8 @@ import os
 
 from temporalio import activity
 
+from badgerdoc_common import badgerdoc_http
+
 logger = logging.getLogger(__name__)
 
 HOST = os.environ.get("HOST_ADDRESS_FOR_MLX", "localhost")
@@ -61,7 +63,6 @@ async def do_mlx_ocr_mineru(
     """
     from io import BytesIO  # pylint: disable=import-outside-toplevel
 
-    import aiohttp  # pylint: disable=import-outside-toplevel
     from mineru_vl_utils import (  # pylint: disable=import-outside-toplevel
         MinerUClient,
     )
@@ -71,11 +72,9 @@ async def do_mlx_ocr_mineru(
         "do_mlx_ocr_mineru: model=%s port=%s image=%s", model, port, image_url
     )
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(image_url) as resp:
-            image_bytes = await resp.read()
-
-    image = Image.open(BytesIO(image_bytes))
+    image_buffer = BytesIO()
+    await badgerdoc_http.badgerdoc_download_url(image_buffer, image_url)
+    image = Image.open(image_buffer)
 
     client = MinerUClient(
         backend="http-client",
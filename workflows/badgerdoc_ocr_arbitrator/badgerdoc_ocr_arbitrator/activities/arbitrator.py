@@ -37,10 +37,20 @@ async def start_arbitrator(
     params: trigger.DocumentTriggerParams,
 ) -> list[dict[str, int | str]]:
     logger.info("Starting start_arbitrator activity")
+    async with agent_log.AgentLogBuffer(
+        agent_log.post_agent_logs
+    ) as agent_logs:
+        return await _start_arbitrator(params, agent_logs)
+
+
+async def _start_arbitrator(
+    params: trigger.DocumentTriggerParams,
+    agent_logs: agent_log.AgentLogBuffer,
+) -> list[dict[str, int | str]]:
 
     document_id = params.original_document.id
     task_id = params.original_task.id if params.original_task else None
-    await agent_log.write_agent_log(
+    await agent_logs.write(
         document_id,
         task_id,
         "INFO",
@@ -67,7 +77,7 @@ async def start_arbitrator(
 
     if not workflows:
         logger.warning("No workflows selected by arbitrator agent")
-        await agent_log.write_agent_log(
+        await agent_logs.write(
             document_id,
             task_id,
             "WARNING",
@@ -85,7 +95,7 @@ async def start_arbitrator(
 
     started_extractions: list[dict[str, int | str]] = []
 
-    await agent_log.write_agent_log(
+    await agent_logs.write(
         document_id,
         task_id,
         "INFO",
@@ -115,7 +125,7 @@ async def start_arbitrator(
             response_data = await badgerdoc_http.badgerdoc_post(
                 endpoint, payload
             )
-            await agent_log.write_agent_log(
+            await agent_logs.write(
                 document_id,
                 task_id,
                 "INFO",
@@ -251,6 +251,17 @@ def lines_to_hocr(
 async def trial_process(
     params: trigger.DocumentTriggerParams,
     workflow_results: list[dict[str, int | str]],
+) -> BadgerdocHOCRPageResult:
+    async with agent_log.AgentLogBuffer(
+        agent_log.post_agent_logs
+    ) as agent_logs:
+        return await _trial_process(params, workflow_results, agent_logs)
+
+
+async def _trial_process(
+    params: trigger.DocumentTriggerParams,
+    workflow_results: list[dict[str, int | str]],
+    agent_logs: agent_log.AgentLogBuffer,
 ) -> BadgerdocHOCRPageResult:
     from openai import (  # pylint: disable=import-outside-toplevel
         AsyncAzureOpenAI,
@@ -349,10 +360,11 @@ async def trial_process(
         workflow_package="badgerdoc_ocr_arbitrator",
         workflow_name=params.workflow.temporal_workflow_type,
         workflow_id=activity.info().workflow_run_id,
+        document_id=document_id,
     )
 
     # --- Step 1: Jury evaluation of OCR results ---
-    await agent_log.write_agent_log(
+    await agent_logs.write(
         document_id,
         task_id,
         "INFO",
@@ -384,7 +396,7 @@ async def trial_process(
     page_height: int = metadata.get("height", 1000)
 
     # --- Step 2: OCR combination with judge ---
-    await agent_log.write_agent_log(
+    await agent_logs.write(
         document_id,
         task_id,
         "INFO",
@@ -429,7 +441,7 @@ async def trial_process(
     hocr_buffer.seek(0)
     hocr_buffer.truncate(0)
     # --- Step 3: Sorting and classification of hOCR content ---
-    await agent_log.write_agent_log(
+    await agent_logs.write(
         document_id,
         task_id,
         "INFO",
@@ -456,7 +468,7 @@ async def trial_process(
     hocr_path = await storage.badgerdoc_store_perm(
         hocr_buffer, storage_params, f"page_{page_number}.hocr"
     )
-    await agent_log.write_agent_log(
+    await agent_logs.write(
         document_id,
         task_id,
         "INFO",
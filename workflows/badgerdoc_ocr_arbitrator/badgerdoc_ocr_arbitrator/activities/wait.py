@@ -2,84 +2,92 @@ import asyncio
 import logging
 
 from temporalio import activity
-
-from badgerdoc_common import badgerdoc_http
+from temporalio.client import WorkflowFailureError
+from temporalio.service import RPCError, RPCStatusCode
 
 logger = logging.getLogger(__name__)
 
-_TERMINAL_STATUSES = {"Finished", "Failed", "Not Found"}
-_POLL_INTERVAL_SECONDS = 5
-_MAX_POLL_ATTEMPTS = 360  # 30 minutes at 5s intervals
+_HEARTBEAT_INTERVAL_SECONDS = 5
+_MAX_WAIT_SECONDS = 30 * 60
+
+
+async def _wait_for_workflow(workflow_id: str) -> str:
+    """Wait for a workflow to close and return its Badgerdoc status.
+
+    ``result`` long-polls the workflow history, so Temporal answers as soon
+    as the workflow closes instead of the status being polled.
+    """
+    handle = activity.client().get_workflow_handle(workflow_id)
+    try:
+        await asyncio.wait_for(
+            handle.result(follow_runs=True), _MAX_WAIT_SECONDS
+        )
+        status = "Finished"
+    except WorkflowFailureError:
+        status = "Failed"
+    except TimeoutError:
+        logger.warning(
+            "Giving up waiting for workflow %s after %d seconds",
+            workflow_id,
+            _MAX_WAIT_SECONDS,
+        )
+        status = "In Progress"
+    except RPCError as e:
+        if e.status != RPCStatusCode.NOT_FOUND:
+            logger.exception("Failed to wait for workflow %s", workflow_id)
+        status = "Not Found"
+
+    logger.info("Workflow %s status: %s", workflow_id, status)
+    return status
+
+
+async def _heartbeat_until_done(done: asyncio.Event) -> None:
+    while not done.is_set():
+        activity.heartbeat()
+        try:
+            await asyncio.wait_for(done.wait(), _HEARTBEAT_INTERVAL_SECONDS)
+        except TimeoutError:
+            pass
 
 
 @activity.defn
 async def wait_for_triggered_workflows(
     workflow_results: list[dict],
 ) -> list[dict]:
-    """Poll each triggered workflow until it reaches a terminal status.
+    """Wait for each triggered workflow to reach a terminal status.
 
     Returns the same workflow_results list, enriched with a ``final_status``
     key for each entry, so downstream activities can inspect which ones
     succeeded.
     """
-    workflow_ids = [
-        str(entry["workflow_id"])
-        for entry in workflow_results
-        if entry.get("workflow_id")
-    ]
+    workflow_ids = list(
+        dict.fromkeys(
+            str(entry["workflow_id"])
+            for entry in workflow_results
+            if entry.get("workflow_id")
+        )
+    )
 
     if not workflow_ids:
         logger.warning("No workflow_ids to wait for")
         return workflow_results
 
-    pending: dict[str, int] = {wf_id: 0 for wf_id in workflow_ids}
-
-    while pending:
-        activity.heartbeat()
-
-        for wf_id in list(pending.keys()):
-            attempt = pending[wf_id]
-            if attempt >= _MAX_POLL_ATTEMPTS:
-                logger.warning(
-                    "Giving up waiting for workflow %s after %d attempts",
-                    wf_id,
-                    attempt,
-                )
-                del pending[wf_id]
-                continue
-
-            try:
-                response = await badgerdoc_http.badgerdoc_get(
-                    f"/badgerdoc/workflow-registry/workflow/status/{wf_id}/"
-                )
-                status = (
-                    response.get("status", "Not Found")
-                    if isinstance(response, dict)
-                    else "Not Found"
-                )
-            except Exception:
-                logger.exception(
-                    "Failed to poll status for workflow %s", wf_id
-                )
-                status = "Not Found"
-
-            logger.info(
-                "Workflow %s status: %s (attempt %d)", wf_id, status, attempt
-            )
-
-            if status in _TERMINAL_STATUSES:
-                del pending[wf_id]
-            else:
-                pending[wf_id] = attempt + 1
-
-        if pending:
-            await asyncio.sleep(_POLL_INTERVAL_SECONDS)
+    done = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat_until_done(done))
+    try:
+        statuses = await asyncio.gather(
+            *(_wait_for_workflow(wf_id) for wf_id in workflow_ids)
+        )
+    finally:
+        done.set()
+        await heartbeat
 
     # Annotate results with their final status for logging/observability.
-    id_set = set(workflow_ids)
+    final_statuses = dict(zip(workflow_ids, statuses))
     for entry in workflow_results:
-        if entry.get("workflow_id") not in id_set:
-            entry.setdefault("final_status", "skipped")
+        entry["final_status"] = final_statuses.get(
+            str(entry.get("workflow_id")), "skipped"
+        )
 
-    logger.info("All triggered workflows reached terminal status")
+    logger.info("Finished waiting for triggered workflows")
     return workflow_results
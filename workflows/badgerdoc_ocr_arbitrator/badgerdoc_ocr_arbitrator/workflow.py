@@ -19,34 +19,34 @@ class BadgerdocOCRArbitratorWorkflow:
     ) -> BadgerdocHOCRPageResult:
         logger.info("Starting BadgerdocOCRArbitratorWorkflow")
         logger.info("Received params: %s", params)
-        log = agent_logger.get_logger(
+        async with agent_logger.get_logger(
             document_id=params.original_document.id,
             task_id=params.original_task.id if params.original_task else None,
-        )
-        await log.info("Starting OCR Arbitrator")
-
-        workflow_results = await workflow.execute_activity(
-            arbitrator.start_arbitrator,
-            params,
-            start_to_close_timeout=helpers.BADGERDOC_REST_API_START_TO_CLOSE_TIMEOUT,
-            retry_policy=helpers.BadgerdocRestAPIRetryPolicy,
-        )
-
-        await log.info("Waiting for all agents to be completed")
-        workflow_results = await workflow.execute_activity(
-            wait.wait_for_triggered_workflows,
-            args=[workflow_results],
-            start_to_close_timeout=timedelta(hours=2),
-            heartbeat_timeout=helpers.BADGERDOC_REST_API_START_TO_CLOSE_TIMEOUT,
-            retry_policy=helpers.BadgerdocRestAPIRetryPolicy,
-        )
-        await log.info("All agents completed. Starting arbitration.")
-        result = await workflow.execute_activity(
-            ocr.trial_process,
-            args=[params, workflow_results],
-            start_to_close_timeout=helpers.BADGERDOC_REST_API_START_TO_CLOSE_TIMEOUT,
-            retry_policy=helpers.BadgerdocRestAPIRetryPolicy,
-        )
-        await log.info("Arbitration completed")
-
-        return result
+        ) as log:
+            await log.info("Starting OCR Arbitrator")
+
+            workflow_results = await workflow.execute_activity(
+                arbitrator.start_arbitrator,
+                params,
+                start_to_close_timeout=helpers.BADGERDOC_REST_API_START_TO_CLOSE_TIMEOUT,
+                retry_policy=helpers.BadgerdocRestAPIRetryPolicy,
+            )
+
+            await log.info("Waiting for all agents to be completed")
+            workflow_results = await workflow.execute_activity(
+                wait.wait_for_triggered_workflows,
+                args=[workflow_results],
+                start_to_close_timeout=timedelta(hours=2),
+                heartbeat_timeout=helpers.BADGERDOC_REST_API_START_TO_CLOSE_TIMEOUT,
+                retry_policy=helpers.BadgerdocRestAPIRetryPolicy,
+            )
+            await log.info("All agents completed. Starting arbitration.")
+            result = await workflow.execute_activity(
+                ocr.trial_process,
+                args=[params, workflow_results],
+                start_to_close_timeout=helpers.BADGERDOC_REST_API_START_TO_CLOSE_TIMEOUT,
+                retry_policy=helpers.BadgerdocRestAPIRetryPolicy,
+            )
+            await log.info("Arbitration completed")
+
+            return result
@@ -24,6 +24,7 @@ async def worker():
                 activities.wait.wait_for_triggered_workflows,
                 activities.ocr.trial_process,
                 agent_log.write_agent_log,
+                agent_log.write_agent_logs,
             ],
             **sentry_config,
         )
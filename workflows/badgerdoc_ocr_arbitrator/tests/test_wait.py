@@ -0,0 +1,65 @@
+import os
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from temporalio.client import WorkflowFailureError
+from temporalio.service import RPCError, RPCStatusCode
+from temporalio.testing import ActivityEnvironment
+
+WORKFLOWS_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(WORKFLOWS_ROOT / "badgerdoc_common"))
+sys.path.insert(0, str(WORKFLOWS_ROOT / "badgerdoc_ocr_arbitrator"))
+
+os.environ.setdefault("BADGERDOC_REST_API_RETRY_POLICY", "1,2.0,30,3")
+os.environ.setdefault("TEMPORAL_BADGERDOC_ADDRESS", "http://test:8000")
+os.environ.setdefault("BADGERDOC_TOKEN", "test_token")
+os.environ.setdefault("TEMPORAL_ADDRESS", "localhost:7233")
+os.environ.setdefault("BADGERDOC_REST_API_START_TO_CLOSE_TIMEOUT", "5")
+
+from badgerdoc_ocr_arbitrator.activities.wait import (
+    wait_for_triggered_workflows,
+)
+
+
+def _client(outcomes: dict[str, Exception | None]) -> MagicMock:
+    """Return a mock Temporal client whose workflows close as given."""
+
+    def get_workflow_handle(workflow_id: str) -> MagicMock:
+        handle = MagicMock()
+        handle.result = AsyncMock(side_effect=outcomes[workflow_id])
+        return handle
+
+    client = MagicMock()
+    client.get_workflow_handle.side_effect = get_workflow_handle
+    return client
+
+
+@pytest.mark.asyncio
+async def test_wait_reports_final_status_of_each_workflow():
+    client = _client(
+        {
+            "wf-ok": None,
+            "wf-failed": WorkflowFailureError(cause=RuntimeError("boom")),
+            "wf-missing": RPCError("not found", RPCStatusCode.NOT_FOUND, b""),
+        }
+    )
+    results = [
+        {"extraction_id": 1, "workflow_id": "wf-ok"},
+        {"extraction_id": 2, "workflow_id": "wf-failed"},
+        {"extraction_id": 3, "workflow_id": "wf-missing"},
+        {"extraction_id": 4},
+    ]
+
+    results = await ActivityEnvironment(client=client).run(
+        wait_for_triggered_workflows, results
+    )
+
+    assert [entry["final_status"] for entry in results] == [
+        "Finished",
+        "Failed",
+        "Not Found",
+        "skipped",
+    ]
+    assert client.get_workflow_handle.call_count == 3
@@ -218,7 +218,12 @@ class Deepseek2OCR(BadgerdocOCRBase):
                 *[
                     workflow.execute_activity(
                         deepseek_ocr_2_results_to_hocr,
-                        args=[workflow_type, page_num, infos],
+                        args=[
+                            workflow_type,
+                            page_num,
+                            infos,
+                            params.original_document.id,
+                        ],
                         start_to_close_timeout=helpers.BADGERDOC_REST_API_START_TO_CLOSE_TIMEOUT,
                         retry_policy=helpers.BadgerdocRestAPIRetryPolicy,
                     )
@@ -360,6 +360,7 @@ async def deepseek_ocr_2_results_to_hocr(  # pylint: disable=too-many-locals
     workflow_type: str,
     page_num: int,
     infos: list[dict],
+    document_id: int | None = None,
 ) -> BadgerdocHOCRPageResult:
     """Convert DeepSeek OCR raw output for one page to hOCR.
 
@@ -392,6 +393,7 @@ async def deepseek_ocr_2_results_to_hocr(  # pylint: disable=too-many-locals
         workflow_package="badgerdoc_ocr_deepseek_2",
         workflow_name=workflow_type,
         workflow_id=activity.info().workflow_run_id,
+        document_id=document_id,
     )
 
     hocr_lines = [
@@ -6,6 +6,7 @@ from badgerdoc_common import helpers, sentry
 from badgerdoc_common.activities.document import (
     badgerdoc_get_document_chunk,
     badgerdoc_get_rendition,
+    badgerdoc_get_renditions_by_page,
     badgerdoc_list_documents,
 )
 from badgerdoc_ocr_deepseek_2 import activities, workflow
@@ -29,6 +30,7 @@ async def worker():
                 activities.ocr_convertors.deepseek_ocr_2_results_to_hocr,
                 badgerdoc_list_documents,
                 badgerdoc_get_rendition,
+                badgerdoc_get_renditions_by_page,
                 badgerdoc_get_document_chunk,
             ],
             **sentry_config,
@@ -106,6 +106,7 @@ async def convert_to_hocr(
     hocr_path = await _save_text(
         f"page_{page_number}.hocr",
         hocr_text,
+        document_id=params.original_document.id,
     )
     logger.info("DotsOCR hOCR result saved to: %s", hocr_path)
 
@@ -123,13 +124,20 @@ async def _load_image(
     return ocr.prepare_image(image)
 
 
-async def _save_text(file_name: str, text: str) -> str:
+async def _save_text(
+    file_name: str, text: str, document_id: int | None = None
+) -> str:
     storage_params = storage.StorageWorkflowParams(
         workflow_package="badgerdoc_ocr_dotsocr",
         workflow_name="BadgerdocOCRDotsOCRWorkflow",
         workflow_id=activity.info().workflow_id or "",
+        document_id=document_id,
     )
-    file_path = storage.build_temp_path(storage_params, file_name)
+    # hOCR of a document is read by the API from the document's prefix
+    if document_id is not None:
+        file_path = storage.build_perm_path(storage_params, file_name)
+    else:
+        file_path = storage.build_temp_path(storage_params, file_name)
 
     buffer = BytesIO(text.encode("utf-8"))
     await storage.badgerdoc_store(buffer, file_path)
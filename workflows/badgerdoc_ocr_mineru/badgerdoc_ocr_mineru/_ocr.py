@@ -224,7 +224,12 @@ class MinerUOCR(BadgerdocOCRBase):
                 *[
                     workflow.execute_activity(
                         mineru_mlx_results_to_hocr,
-                        args=[workflow_type, page_num, infos],
+                        args=[
+                            workflow_type,
+                            page_num,
+                            infos,
+                            params.original_document.id,
+                        ],
                         start_to_close_timeout=helpers.BADGERDOC_REST_API_START_TO_CLOSE_TIMEOUT,
                         retry_policy=helpers.BadgerdocRestAPIRetryPolicy,
                     )
@@ -375,6 +375,7 @@ async def mineru_mlx_results_to_hocr(
     workflow_type: str,
     page_num: int,
     infos: list[dict],
+    document_id: int | None = None,
 ) -> BadgerdocHOCRPageResult:
     """Convert MinerU MLX raw output for one page to hOCR.
 
@@ -399,6 +400,7 @@ async def mineru_mlx_results_to_hocr(
         workflow_package="badgerdoc_ocr_mineru",
         workflow_name=workflow_type,
         workflow_id=activity.info().workflow_run_id,
+        document_id=document_id,
     )
 
     all_blocks: list[dict] = []
@@ -6,6 +6,7 @@ from badgerdoc_common import helpers, sentry
 from badgerdoc_common.activities.document import (
     badgerdoc_get_document_chunk,
     badgerdoc_get_rendition,
+    badgerdoc_get_renditions_by_page,
     badgerdoc_list_documents,
 )
 from badgerdoc_ocr_mineru import activities, workflow
@@ -30,6 +31,7 @@ async def worker() -> None:
                 activities.ocr_convertors.mineru_mlx_results_to_hocr,
                 badgerdoc_list_documents,
                 badgerdoc_get_rendition,
+                badgerdoc_get_renditions_by_page,
                 badgerdoc_get_document_chunk,
             ],
             **sentry_config,
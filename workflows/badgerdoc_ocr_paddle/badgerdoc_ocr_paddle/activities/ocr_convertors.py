@@ -357,6 +357,7 @@ async def paddle_ocr_results_to_hocr(  # pylint: disable=too-many-locals
     workflow_type: str,
     page_num: int,
     infos: list[dict],
+    document_id: int | None = None,
 ) -> BadgerdocHOCRPageResult:
     """Convert Paddle OCR raw output for one page to hOCR.
 
@@ -389,6 +390,7 @@ async def paddle_ocr_results_to_hocr(  # pylint: disable=too-many-locals
         workflow_package="badgerdoc_ocr_paddle",
         workflow_name=workflow_type,
         workflow_id=activity.info().workflow_run_id,
+        document_id=document_id,
     )
 
     hocr_lines = [